@@ -106,21 +106,63 @@ True
 """
 # [[[end]]]
 
+import re
 from collections.abc import Iterable
 from pathlib import Path
-from typing import Optional, TextIO, Union
+from typing import TYPE_CHECKING, Optional, TextIO, Union
 
-from .node import OrgEnv, OrgNode, parse_lines  # todo basenode??
+from .node import OrgEnv, OrgNode, _file_stat, parse_bytes, parse_lines, parse_text  # todo basenode??
+from .profiler import Profiler
 
-__all__ = ["load", "loadi", "loads"]
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
 
+    from .aio import aload, aload_many
+    from .corpus import OrgCorpus
+    from .links import LinkGraph
+    from .stream import iter_node_records, iter_tables
 
-def load(path: Union[str, Path, TextIO], env: Optional[OrgEnv] = None) -> OrgNode:
+__all__ = ["LinkGraph", "OrgCorpus", "aload", "aload_many", "iter_node_records", "iter_tables", "load", "load_many", "loadb", "loadi", "loads"]
+
+
+# name -> module it's imported from on first access, to keep 'import orgparse' fast
+_LAZY = {
+    # asyncio is a relatively heavy import, so the async API is only imported on demand
+    'aload': 'aio',
+    'aload_many': 'aio',
+    # NOTE: depends on load_many
+    'OrgCorpus': 'corpus',
+    'LinkGraph': 'links',
+    'iter_node_records': 'stream',
+    'iter_tables': 'stream',
+}
+
+
+def __getattr__(name: str):
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    import importlib  # noqa: PLC0415
+
+    value = getattr(importlib.import_module(f'.{module}', __name__), name)
+    globals()[name] = value
+    return value
+
+
+def load(
+    path: Union[str, Path, TextIO],
+    env: Optional[OrgEnv] = None,
+    profiler: Optional[Profiler] = None,
+) -> OrgNode:
     """
     Load org-mode document from a file.
 
     :type path: str or file-like
     :arg  path: Path to org file or file-like object of an org document.
+    :arg  env: with ``OrgEnv(columnar=True)``, the document is read-only, see :class:`orgparse.node.OrgEnv`.
+    :arg  profiler:
+        Collect per-stage parsing statistics, they are available as ``root.env.parse_stats``.
+        See :class:`orgparse.profiler.Profiler`.
 
     :rtype: :class:`orgparse.node.OrgRootNode`
 
@@ -131,35 +173,128 @@ def load(path: Union[str, Path, TextIO], env: Optional[OrgEnv] = None) -> OrgNod
 
     # if it is a Path
     if isinstance(path, Path):
+        if env is not None and env._columnar:
+            # columnar store only decodes the parts of the file which are accessed
+            with path.open('rb') as f:
+                stat = _file_stat(f)
+                root = parse_bytes(f.read(), filename=str(path), env=env, profiler=profiler)
+            root.env._source_stat = stat
+            return root
         # open that Path
         with path.open('r', encoding='utf8') as orgfile:
             # try again loading
-            return load(orgfile, env)
+            return load(orgfile, env, profiler=profiler)
 
     # We assume it is a file-like object (e.g. io.StringIO)
-    all_lines = (line.rstrip('\n') for line in path)
+    # NOTE: before reading, so that OrgRootNode.save can tell whether the file was changed since
+    stat = _file_stat(path)
+    # the whole input is available, so read it at once -- it's much faster to find node boundaries this way
+    text = path.read()
 
     # get the filename
     filename = path.name if hasattr(path, 'name') else '<file-like>'
 
-    return loadi(all_lines, filename=filename, env=env)
+    root = parse_text(text, filename=filename, env=env, profiler=profiler)
+    root.env._source_stat = stat
+    return root
 
 
-def loads(string: str, filename: str = '<string>', env: Optional[OrgEnv] = None) -> OrgNode:
+def loads(
+    string: str,
+    filename: str = '<string>',
+    env: Optional[OrgEnv] = None,
+    profiler: Optional[Profiler] = None,
+) -> OrgNode:
     """
     Load org-mode document from a string.
 
     :rtype: :class:`orgparse.node.OrgRootNode`
 
     """
-    return loadi(string.splitlines(), filename=filename, env=env)
+    if '\r' in string:
+        string = string.replace('\r\n', '\n')
+    if _RE_OTHER_LINE_BREAKS.search(string):
+        # these are line boundaries for str.splitlines, so can't use the fast path
+        return loadi(string.splitlines(), filename=filename, env=env, profiler=profiler)
+    return parse_text(string, filename=filename, env=env, profiler=profiler)
+
+
+# line boundaries recognized by str.splitlines, apart from '\n' and '\r\n'
+_RE_OTHER_LINE_BREAKS = re.compile('[\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029]')
+
+
+def loadb(
+    data: Union[bytes, bytearray, memoryview],
+    filename: str = '<bytes>',
+    env: Optional[OrgEnv] = None,
+    profiler: Optional[Profiler] = None,
+) -> OrgNode:
+    """
+    Load org-mode document from UTF-8 encoded bytes, decoding only the parts which are accessed.
+
+    Headings are located on the raw bytes, and only the heading lines are decoded upfront:
+    the document is kept in a :class:`orgparse.node.NodeStore` (as with ``OrgEnv(columnar=True)``),
+    and the rest of each node is decoded when the node is first accessed.
+    This is much cheaper than :func:`loads` when only some nodes of large documents are used.
+    Note that invalid UTF-8 outside of the heading lines is only reported when the node is accessed.
+    The document is read-only (modifying or saving it raises :class:`TypeError`), use :func:`loads` to modify it.
+
+    >>> root = loadb('* TODO Hëading :tag:\\n  Bödy\\n* Other\\n'.encode('utf8'))
+    >>> store = root.env.store
+    >>> [store.heading(i) for i in range(1, len(store))]
+    ['Hëading', 'Other']
+    >>> root.children[0].body
+    '  Bödy'
+
+    :arg data: ``bytearray`` and ``memoryview`` (e.g. of an ``mmap``) are copied to ``bytes`` first.
+    :arg env: by default, a columnar env. With a non-columnar env, the whole text is decoded and parsed upfront.
+    :rtype: :class:`orgparse.node.OrgRootNode`
+    """
+    if env is None:
+        env = OrgEnv(filename=filename, columnar=True)
+    return parse_bytes(bytes(data), filename=filename, env=env, profiler=profiler)
 
 
-def loadi(lines: Iterable[str], filename: str = '<lines>', env: Optional[OrgEnv] = None) -> OrgNode:
+def loadi(
+    lines: Iterable[str],
+    filename: str = '<lines>',
+    env: Optional[OrgEnv] = None,
+    profiler: Optional[Profiler] = None,
+) -> OrgNode:
     """
     Load org-mode document from an iterative object.
 
     :rtype: :class:`orgparse.node.OrgRootNode`
 
     """
-    return parse_lines(lines, filename=filename, env=env)
+    return parse_lines(lines, filename=filename, env=env, profiler=profiler)
+
+
+def load_many(
+    paths: Iterable[Union[str, Path]],
+    *,
+    max_workers: Optional[int] = None,
+    executor: Optional['Executor'] = None,
+) -> list[OrgNode]:
+    """
+    Load multiple org-mode documents in parallel, returning the roots in the same order as ``paths``.
+
+    Files are loaded with :func:`load` in a thread pool.
+    On free-threaded Python builds (e.g. ``python3.13t``) parsing scales across cores,
+    and there is no need to pickle the trees back, as with a process pool.
+    With the GIL, only reading the files overlaps, so pass a
+    :class:`concurrent.futures.ProcessPoolExecutor` as ``executor`` to parse in parallel.
+
+    Parsing doesn't share any mutable state between documents, so this is safe as long as
+    the same :class:`orgparse.node.OrgEnv` or :class:`orgparse.profiler.Profiler` isn't used for multiple documents at once.
+
+    :arg max_workers: number of threads, by default same as for :class:`concurrent.futures.ThreadPoolExecutor`.
+    :arg executor: executor to use instead of a new thread pool.
+    :rtype: list of :class:`orgparse.node.OrgRootNode`
+    """
+    if executor is not None:
+        return list(executor.map(load, paths))
+    from concurrent.futures import ThreadPoolExecutor  # noqa: PLC0415
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        return list(pool.map(load, paths))
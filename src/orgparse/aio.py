@@ -0,0 +1,98 @@
+"""
+Asyncio API: loading org files without blocking the event loop.
+
+>>> import asyncio, tempfile
+>>> from pathlib import Path
+>>> with tempfile.TemporaryDirectory() as tmp:
+...     paths = [Path(tmp) / f'{i}.org' for i in range(3)]
+...     for i, p in enumerate(paths):
+...         _ = p.write_text(f'* Heading {i}')
+...     roots = asyncio.run(aload_many(paths, concurrency=2))
+>>> [root.children[0].heading for root in roots]
+['Heading 0', 'Heading 1', 'Heading 2']
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+from collections.abc import Iterable
+from concurrent.futures import Executor
+from pathlib import Path
+from typing import Optional, Union
+
+from .node import OrgEnv, OrgNode, _file_stat, parse_text
+from .profiler import Profiler
+
+
+def _read(path: Path) -> tuple[str, Optional[tuple[int, int, int]]]:
+    with path.open('r', encoding='utf8') as f:
+        stat = _file_stat(f)
+        return (f.read(), stat)
+
+
+async def aload(
+    path: Union[str, Path],
+    env: Optional[OrgEnv] = None,
+    *,
+    executor: Optional[Executor] = None,
+    profiler: Optional[Profiler] = None,
+) -> OrgNode:
+    """
+    Same as :func:`orgparse.load`, but doesn't block the event loop.
+
+    The file is read in a worker thread, and parsed in ``executor``.
+
+    :arg executor:
+        Executor to parse the file in (by default the event loop's default executor, i.e. a thread pool).
+        Parsing is CPU-bound, so with a :class:`concurrent.futures.ProcessPoolExecutor`
+        files are also parsed in parallel; the parsed tree is then pickled back to the calling process.
+    :rtype: :class:`orgparse.node.OrgRootNode`
+    """
+    path = Path(path)
+    loop = asyncio.get_running_loop()
+    (text, stat) = await loop.run_in_executor(None, _read, path)
+    # NOTE: same as load() does
+    parse = functools.partial(parse_text, text, filename=str(path), env=env, profiler=profiler)
+    root = await loop.run_in_executor(executor, parse)
+    root.env._source_stat = stat
+    return root
+
+
+async def aload_many(
+    paths: Iterable[Union[str, Path]],
+    *,
+    concurrency: int = 4,
+    executor: Optional[Executor] = None,
+) -> list[OrgNode]:
+    """
+    Load multiple files with :func:`aload`, returning the roots in the same order as ``paths``.
+
+    :arg concurrency:
+        Maximum number of files being read or parsed at the same time.
+        This bounds the memory used for file contents and intermediate parsing results,
+        and the share of ``executor`` taken by a single call.
+    :arg executor: see :func:`aload`.
+
+    If loading any of the files fails, the other files aren't loaded, and the exception is propagated.
+    """
+    if concurrency < 1:
+        raise ValueError(f'concurrency should be positive, got {concurrency}')
+    # NOTE: a fixed number of workers rather than a task per path, so paths are consumed lazily
+    todo = enumerate(paths)
+    results: dict[int, OrgNode] = {}
+
+    async def worker() -> None:
+        for i, path in todo:
+            results[i] = await aload(path, executor=executor)
+
+    workers = [asyncio.ensure_future(worker()) for _ in range(concurrency)]
+    try:
+        await asyncio.gather(*workers)
+    except BaseException:
+        # NOTE: asyncio.TaskGroup isn't available on older pythons
+        for w in workers:
+            w.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+        raise
+    return [results[i] for i in range(len(results))]
@@ -0,0 +1,6 @@
+"""
+Benchmarks for orgparse.
+
+Run ``python -m orgparse.benchmarks --help`` for the available options.
+The synthetic documents are generated by :mod:`orgparse.benchmarks.corpus`.
+"""
@@ -0,0 +1,156 @@
+"""
+Synthetic org-mode documents for benchmarking.
+
+>>> from orgparse import loadi
+>>> root = loadi(generate_org_lines(num_nodes=10, shape='deep', max_depth=4))
+>>> [n.level for n in root[1:]]
+[1, 2, 3, 4, 1, 2, 3, 4, 1, 2]
+"""
+
+from __future__ import annotations
+
+import random
+from collections.abc import Iterator, Sequence
+
+CUSTOM_TODOS = ('TODO', 'NEXT', 'WAITING')
+CUSTOM_DONES = ('DONE', 'CANCELLED')
+
+# presets for different kinds of documents we'd like to be fast for
+SHAPES: dict[str, dict] = {
+    'wide': {
+        'shape': 'wide',
+        'children': 50,
+    },
+    'deep': {
+        'shape': 'deep',
+        'max_depth': 30,
+    },
+    'logbook': {
+        'clocks': 50,
+        'state_changes': 5,
+    },
+    'properties': {
+        'properties': 20,
+    },
+    'tables': {
+        'table_rows': 30,
+    },
+    'links': {
+        'links': 20,
+    },
+    'todos': {
+        'custom_todos': True,
+    },
+}
+
+
+def generate_org_lines(
+    num_nodes: int,
+    *,
+    shape: str = 'wide',
+    children: int = 10,
+    max_depth: int = 10,
+    clocks: int = 0,
+    state_changes: int = 0,
+    properties: int = 0,
+    table_rows: int = 0,
+    links: int = 0,
+    body_lines: int = 2,
+    custom_todos: bool = False,
+    seed: int = 0,
+) -> Iterator[str]:
+    """
+    Generate lines of an org-mode document.
+
+    :arg num_nodes: Number of headings in the document.
+    :arg shape:
+        ``'wide'``: top level headings, each having ``children`` children.
+        ``'deep'``: chains of nested headings, ``max_depth`` levels deep.
+    :arg clocks: Number of CLOCK entries in the ``:LOGBOOK:`` drawer of each node.
+    :arg state_changes: Number of state change entries in the ``:LOGBOOK:`` drawer of each node.
+    :arg properties: Number of entries in the ``:PROPERTIES:`` drawer of each node.
+    :arg table_rows: Number of rows in a table in the body of each node.
+    :arg links: Number of links in the body of each node.
+    :arg body_lines: Number of plain text lines in the body of each node.
+    :arg custom_todos: Use TODO keywords defined via ``#+TODO:``.
+    """
+    rnd = random.Random(seed)
+    todos: Sequence[str] = ('TODO', 'DONE')
+    if custom_todos:
+        todos = CUSTOM_TODOS + CUSTOM_DONES
+        yield '#+TODO: {} | {}'.format(' '.join(CUSTOM_TODOS), ' '.join(CUSTOM_DONES))
+    yield '#+TITLE: benchmark'
+    yield ''
+    for i, level in enumerate(_levels(num_nodes, shape=shape, children=children, max_depth=max_depth)):
+        day = 1 + i % 28
+        todo = rnd.choice(todos) + ' ' if i % 3 == 0 else ''
+        priority = '[#A] ' if i % 7 == 0 else ''
+        tags = f' :tag{i % 10}:work:' if i % 2 == 0 else ''
+        yield '{} {}{}Heading {}{}'.format('*' * level, todo, priority, i, tags)
+        if i % 4 == 0:
+            yield f'  SCHEDULED: <2020-01-{day:02d} Wed> DEADLINE: <2020-02-{day:02d} Sat -3d>'
+        if properties > 0:
+            yield '  :PROPERTIES:'
+            yield f'  :ID:       id-{i}'
+            yield '  :Effort:   1:30'
+            for p in range(properties - 2):
+                yield f'  :PROP_{p}:   value {p}'
+            yield '  :END:'
+        if clocks > 0 or state_changes > 0:
+            yield '  :LOGBOOK:'
+            for c in range(state_changes):
+                yield f'  - State "DONE"       from "TODO"       [2020-01-{day:02d} Wed 1{c % 10}:00]'
+            for c in range(clocks):
+                hour = c % 24
+                yield f'  CLOCK: [2020-01-{day:02d} Wed {hour:02d}:00]--[2020-01-{day:02d} Wed {hour:02d}:30] =>  0:30'
+            yield '  :END:'
+        for b in range(body_lines):
+            yield f'  Some body text, line {b} of node {i}, mentioning <2020-03-{day:02d} Sun> once in a while.'
+        if links > 0:
+            yield '  ' + ' '.join(
+                f'[[id:id-{rnd.randrange(num_nodes)}][link {l}]] and [[https://example.com/{l}]]' for l in range(links)
+            )
+        if table_rows > 0:
+            yield ''
+            yield '  | name | count | duration | when                   |'
+            yield '  |------+-------+----------+------------------------|'
+            for r in range(table_rows):
+                yield f'  | n{r}   | {r:5d} | {r % 10}:{r % 60:02d}     | [2020-04-{1 + r % 28:02d} Wed 10:00] |'
+            yield ''
+
+
+def _levels(num_nodes: int, *, shape: str, children: int, max_depth: int) -> Iterator[int]:
+    if shape == 'wide':
+        period = children + 1
+        for i in range(num_nodes):
+            yield 1 if i % period == 0 else 2
+    elif shape == 'deep':
+        for i in range(num_nodes):
+            yield 1 + i % max_depth
+    else:
+        raise ValueError(f'Unknown shape: {shape}')
+
+
+def generate_org(num_nodes: int, preset: str, **kwargs) -> str:
+    """
+    Generate an org-mode document for one of :data:`SHAPES` presets.
+
+    >>> print(generate_org(2, 'properties', properties=3, body_lines=0))
+    #+TITLE: benchmark
+    <BLANKLINE>
+    * DONE [#A] Heading 0 :tag0:work:
+      SCHEDULED: <2020-01-01 Wed> DEADLINE: <2020-02-01 Sat -3d>
+      :PROPERTIES:
+      :ID:       id-0
+      :Effort:   1:30
+      :PROP_0:   value 0
+      :END:
+    ** Heading 1
+      :PROPERTIES:
+      :ID:       id-1
+      :Effort:   1:30
+      :PROP_0:   value 0
+      :END:
+    """
+    params = {**SHAPES[preset], **kwargs}
+    return '\n'.join(generate_org_lines(num_nodes, **params))
@@ -0,0 +1,386 @@
+"""
+Benchmark runner: measures parsing/query throughput and memory on synthetic documents.
+
+Results are printed as a table and optionally written as JSON, so they can be compared between releases.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Sequence
+from importlib.metadata import PackageNotFoundError, version
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+from .. import load, load_many, loads
+from ..node import OrgBaseNode, OrgEnv
+from .corpus import SHAPES, generate_org
+
+try:
+    import resource
+except ImportError:
+    # e.g. windows
+    resource = None  # type: ignore[assignment]
+
+
+class Context:
+    """
+    Benchmark input: generated document and (lazily) its parsed tree.
+    """
+
+    def __init__(self, preset: str, num_nodes: int, tmpdir: Path) -> None:
+        self.preset = preset
+        self.text = generate_org(num_nodes, preset)
+        self.num_lines = self.text.count('\n') + 1
+        self.path = tmpdir / f'{preset}.org'
+        self.path.write_text(self.text, encoding='utf8')
+        self._root: Optional[OrgBaseNode] = None
+
+    @property
+    def root(self) -> OrgBaseNode:
+        if self._root is None:
+            self._root = loads(self.text)
+        return self._root
+
+    @property
+    def num_nodes(self) -> int:
+        return len(self.root.env.nodes) - 1  # not counting the root
+
+
+def bench_load(ctx: Context) -> None:
+    load(ctx.path)
+
+
+def bench_loads(ctx: Context) -> None:
+    loads(ctx.text)
+
+
+def bench_loads_columnar(ctx: Context) -> None:
+    root = loads(ctx.text, env=OrgEnv(filename='<string>', columnar=True))
+    store = root.env.store
+    assert store is not None
+    # whole-document scan without creating nodes
+    for i in range(1, len(store)):
+        store.heading(i)
+        store.todo(i)
+        store.tags(i)
+
+
+def bench_navigation(ctx: Context) -> None:
+    for node in ctx.root[1:]:
+        node.parent  # noqa: B018
+        node.children  # noqa: B018
+        node.tags  # noqa: B018
+
+
+def bench_dates(ctx: Context) -> None:
+    for node in ctx.root[1:]:
+        node.scheduled  # noqa: B018
+        node.deadline  # noqa: B018
+        node.closed  # noqa: B018
+        node.clock  # noqa: B018
+        node.repeated_tasks  # noqa: B018
+        node.datelist  # noqa: B018
+        node.rangelist  # noqa: B018
+
+
+BENCHMARKS: dict[str, Callable[[Context], Any]] = {
+    'load': bench_load,
+    'loads': bench_loads,
+    'loads_columnar': bench_loads_columnar,
+    'navigation': bench_navigation,
+    'dates': bench_dates,
+}
+
+
+def max_rss() -> Optional[int]:
+    """Peak resident set size of the current process in bytes (None if unavailable on this platform)."""
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # linux reports kilobytes, osx reports bytes
+    return rss if sys.platform == 'darwin' else rss * 1024
+
+
+def measure(fn: Callable[[Context], Any], ctx: Context, *, repeat: int, memory: bool) -> dict[str, Any]:
+    ctx.root  # noqa: B018  # make sure tree is built outside of measurements
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(ctx)
+        timings.append(time.perf_counter() - start)
+    seconds = min(timings)
+    res: dict[str, Any] = {
+        'seconds': seconds,
+        'lines_per_sec': ctx.num_lines / seconds if seconds > 0 else None,
+        'nodes_per_sec': ctx.num_nodes / seconds if seconds > 0 else None,
+    }
+    if memory:
+        # separate run, tracemalloc slows things down a lot
+        tracemalloc.start()
+        try:
+            fn(ctx)
+            res['tracemalloc_peak'] = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        res['max_rss'] = max_rss()
+    return res
+
+
+def measure_tree_memory(ctx: Context, *, top: int = 10) -> dict[str, Any]:
+    """
+    Memory retained by a parsed tree: total and top allocation sites according to tracemalloc,
+    and a per attribute breakdown according to :meth:`orgparse.node.OrgBaseNode.memory_usage`.
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        root = loads(ctx.text)
+        gc.collect()
+        retained = tracemalloc.get_traced_memory()[0] - before
+        snapshot = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    snapshot = snapshot.filter_traces([tracemalloc.Filter(inclusive=False, filename_pattern=tracemalloc.__file__)])
+    sites = [
+        {'site': f'{st.traceback[0].filename}:{st.traceback[0].lineno}', 'size': st.size, 'count': st.count}
+        for st in snapshot.statistics('lineno')[:top]
+    ]
+    num_nodes = len(root.env.nodes) - 1
+    return {
+        'preset': ctx.preset,
+        'nodes': num_nodes,
+        'tracemalloc_retained': retained,
+        'bytes_per_node': retained / num_nodes if num_nodes > 0 else None,
+        'memory_usage': root.memory_usage(by='field'),
+        'top_sites': sites,
+    }
+
+
+def measure_scaling(
+    preset: str,
+    *,
+    num_nodes: int,
+    num_files: int,
+    workers: Sequence[int],
+    tmpdir: Path,
+    repeat: int,
+) -> dict[str, Any]:
+    """
+    Multi-file loading with :func:`orgparse.load_many`, for different thread pool sizes.
+
+    ``num_nodes`` are split evenly between ``num_files`` files.
+    Threads only speed up parsing on free-threaded Python builds, see ``gil_enabled`` in the report.
+    """
+    text = generate_org(max(num_nodes // num_files, 1), preset)
+    paths = []
+    for i in range(num_files):
+        path = tmpdir / f'{preset}-{i}.org'
+        path.write_text(text, encoding='utf8')
+        paths.append(path)
+    timings = []
+    for w in workers:
+        best = float('inf')
+        for _ in range(repeat):
+            start = time.perf_counter()
+            load_many(paths, max_workers=w)
+            best = min(best, time.perf_counter() - start)
+        timings.append((w, best))
+    (_, base) = timings[0]
+    return {
+        'preset': preset,
+        'files': num_files,
+        'lines': (text.count('\n') + 1) * num_files,
+        'runs': [{'workers': w, 'seconds': t, 'speedup': base / t if t > 0 else None} for w, t in timings],
+    }
+
+
+# 'import orgparse' should stay cheap, e.g. for shell hooks and CLI tools which import it on every run
+IMPORT_TIME_BUDGET = 0.05
+
+
+def measure_import_time(*, repeat: int) -> dict[str, Any]:
+    """
+    Time of ``import orgparse`` in a fresh interpreter (best of ``repeat`` runs), as reported by ``python -X importtime``,
+    and the orgparse modules it imports.
+
+    Bytecode is cached in a temporary directory (after a warm-up run), same as for an installed package,
+    even if writing bytecode is disabled in the environment.
+    """
+    code = 'import sys, orgparse; print(*sorted(m for m in sys.modules if m.startswith("orgparse")))'
+    package_dir = Path(__file__).resolve().parent.parent.parent
+    best = float('inf')
+    modules: list[str] = []
+    with tempfile.TemporaryDirectory() as td:
+        env = {k: v for k, v in os.environ.items() if k != 'PYTHONDONTWRITEBYTECODE'}
+        env['PYTHONPYCACHEPREFIX'] = td
+        env['PYTHONPATH'] = os.pathsep.join([str(package_dir), *filter(None, [os.environ.get('PYTHONPATH')])])
+        for i in range(repeat + 1):
+            proc = subprocess.run(
+                [sys.executable, '-X', 'importtime', '-c', code],
+                env=env,
+                capture_output=True,
+                text=True,
+                check=True,
+            )
+            modules = proc.stdout.split()
+            # e.g. 'import time:      1886 |      22937 | orgparse'
+            [cumulative] = [int(line.split('|')[1]) for line in proc.stderr.splitlines() if line.split('|')[-1].strip() == 'orgparse']
+            if i > 0:  # first run is the warm-up
+                best = min(best, cumulative / 1e6)
+    return {
+        'seconds': best,
+        'budget': IMPORT_TIME_BUDGET,
+        'within_budget': best <= IMPORT_TIME_BUDGET,
+        'modules': modules,
+    }
+
+
+def gil_enabled() -> bool:
+    # NOTE: sys._is_gil_enabled is only available since 3.13
+    return getattr(sys, '_is_gil_enabled', lambda: True)()
+
+
+def run(
+    *,
+    presets: Sequence[str],
+    benchmarks: Sequence[str],
+    num_nodes: int,
+    repeat: int = 3,
+    memory: bool = True,
+    scaling_workers: Sequence[int] = (),
+    scaling_files: int = 32,
+    import_time: bool = True,
+) -> dict[str, Any]:
+    results = []
+    tree_memory = []
+    scaling = []
+    with tempfile.TemporaryDirectory() as td:
+        for preset in presets:
+            ctx = Context(preset, num_nodes, Path(td))
+            if memory:
+                tree_memory.append(measure_tree_memory(ctx))
+            for name in benchmarks:
+                res = measure(BENCHMARKS[name], ctx, repeat=repeat, memory=memory)
+                results.append({
+                    'preset': preset,
+                    'benchmark': name,
+                    'nodes': ctx.num_nodes,
+                    'lines': ctx.num_lines,
+                    **res,
+                })  # fmt: skip
+            if len(scaling_workers) > 0:
+                scaling.append(
+                    measure_scaling(
+                        preset,
+                        num_nodes=num_nodes,
+                        num_files=scaling_files,
+                        workers=scaling_workers,
+                        tmpdir=Path(td),
+                        repeat=repeat,
+                    )
+                )
+    return {
+        'orgparse': _orgparse_version(),
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'gil_enabled': gil_enabled(),
+        'timestamp': time.time(),
+        'results': results,
+        'tree_memory': tree_memory,
+        'scaling': scaling,
+        'import_time': measure_import_time(repeat=repeat) if import_time else None,
+    }
+
+
+def _orgparse_version() -> Optional[str]:
+    try:
+        return version('orgparse')
+    except PackageNotFoundError:
+        return None
+
+
+def format_results(report: dict[str, Any]) -> str:
+    def fmt(x, unit: float = 1, spec: str = '.0f') -> str:
+        return '-' if x is None else format(x / unit, spec)
+
+    header = f'{"preset":<12} {"benchmark":<12} {"seconds":>9} {"lines/s":>10} {"nodes/s":>10} {"peak MB":>8} {"rss MB":>8}'
+    rows = [header]
+    for r in report['results']:
+        rows.append(
+            f'{r["preset"]:<12} {r["benchmark"]:<12} {r["seconds"]:>9.4f} '
+            f'{fmt(r["lines_per_sec"]):>10} {fmt(r["nodes_per_sec"]):>10} '
+            f'{fmt(r.get("tracemalloc_peak"), 2**20, ".1f"):>8} {fmt(r.get("max_rss"), 2**20, ".1f"):>8}'
+        )
+    for m in report.get('tree_memory', []):
+        rows.append('')
+        rows.append(f'{m["preset"]}: {m["tracemalloc_retained"] / 2**20:.1f} MB retained by the tree, {fmt(m["bytes_per_node"])} bytes per node')
+        for field, size in sorted(m['memory_usage'].items(), key=lambda kv: -kv[1]):
+            if size > 0:
+                rows.append(f'    {field:<20} {size / 2**20:>8.2f} MB')
+    for sc in report.get('scaling', []):
+        rows.append('')
+        rows.append(f'{sc["preset"]}: load_many, {sc["files"]} files (GIL enabled: {report["gil_enabled"]})')
+        for r in sc['runs']:
+            rows.append(f'    {r["workers"]:>3} workers {r["seconds"]:>9.4f} s  x{fmt(r["speedup"], spec=".2f")}')
+    it = report.get('import_time')
+    if it is not None:
+        rows.append('')
+        status = 'ok' if it['within_budget'] else 'OVER BUDGET'
+        rows.append(
+            f'import orgparse: {it["seconds"] * 1000:.1f} ms (budget {it["budget"] * 1000:.0f} ms, {status}), '
+            f'{len(it["modules"])} orgparse modules'
+        )
+    return '\n'.join(rows)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    p = argparse.ArgumentParser(prog='python -m orgparse.benchmarks', description=__doc__)
+    p.add_argument('--nodes', type=int, default=10_000, help='Number of headings in generated documents')
+    p.add_argument('--presets', default=','.join(SHAPES), help='Comma separated document presets (default: %(default)s)')
+    p.add_argument('--benchmarks', default=','.join(BENCHMARKS), help='Comma separated benchmarks (default: %(default)s)')
+    p.add_argument('--repeat', type=int, default=3, help='Number of timed runs, the best one is reported')
+    p.add_argument('--no-memory', action='store_true', help="Don't measure memory usage (faster)")
+    p.add_argument(
+        '--scaling',
+        metavar='WORKERS',
+        help='Comma separated thread pool sizes to measure multi-file loading with, e.g. 1,2,4,8 (disabled by default)',
+    )
+    p.add_argument('--files', type=int, default=32, help='Number of files for --scaling, --nodes are split between them')
+    p.add_argument('--no-import-time', action='store_true', help="Don't measure the time of 'import orgparse'")
+    p.add_argument('--output', '-o', type=Path, help='Write JSON results to this file')
+    args = p.parse_args(argv)
+
+    presets = args.presets.split(',')
+    benchmarks = args.benchmarks.split(',')
+    for x in presets:
+        if x not in SHAPES:
+            p.error(f'unknown preset {x}, available: {", ".join(SHAPES)}')
+    for x in benchmarks:
+        if x not in BENCHMARKS:
+            p.error(f'unknown benchmark {x}, available: {", ".join(BENCHMARKS)}')
+
+    report = run(
+        presets=presets,
+        benchmarks=benchmarks,
+        num_nodes=args.nodes,
+        repeat=args.repeat,
+        memory=not args.no_memory,
+        scaling_workers=[int(w) for w in args.scaling.split(',')] if args.scaling else (),
+        scaling_files=args.files,
+        import_time=not args.no_import_time,
+    )
+    print(format_results(report))
+    if args.output is not None:
+        args.output.write_text(json.dumps(report, indent=2))
@@ -0,0 +1,138 @@
+"""
+Command line interface, see ``python -m orgparse --help``.
+
+``python -m orgparse dump FILE...`` writes the nodes of org files as newline-delimited JSON,
+one object per node (see :func:`orgparse.stream.iter_node_records` for the fields).
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import queue
+import sys
+import threading
+from collections.abc import Iterable, Iterator, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Optional, TextIO, Union
+
+from .stream import iter_node_records
+
+# records per write
+_BATCH = 256
+# batches buffered per file when dumping files in parallel
+_QUEUE_SIZE = 16
+
+
+def dump(paths: Iterable[Union[str, Path]], out: TextIO, *, jobs: int = 1) -> None:
+    """
+    Write all nodes of the files to ``out`` as newline-delimited JSON, in the order of ``paths``.
+
+    Memory usage is bounded: records are written in small batches as the files are read,
+    and with ``jobs > 1`` each file being parsed only buffers a few batches ahead of the output.
+
+    :arg jobs:
+        Number of files parsed at once, in a thread pool.
+        Same as for :func:`orgparse.load_many`, this only speeds up parsing on free-threaded Python builds
+        (with the GIL, only reading the files overlaps).
+    """
+    if jobs <= 1:
+        for path in paths:
+            out.writelines(_batches(path))
+        return
+    _dump_parallel(paths, out, jobs=jobs)
+
+
+def _batches(path: Union[str, Path]) -> Iterator[str]:
+    lines: list[str] = []
+    try:
+        for record in iter_node_records([path]):
+            lines.append(json.dumps(record, separators=(',', ':')))
+            if len(lines) == _BATCH:
+                yield '\n'.join(lines) + '\n'
+                lines = []
+    except UnicodeDecodeError as e:
+        raise ValueError(f'{path}: {e}') from e
+    if len(lines) > 0:
+        yield '\n'.join(lines) + '\n'
+
+
+class _Failed:
+    __slots__ = ('error',)
+
+    def __init__(self, error: BaseException) -> None:
+        self.error = error
+
+
+# batch of output, error, or None at the end of file
+_Item = Union[str, _Failed, None]
+
+
+def _dump_parallel(paths: Iterable[Union[str, Path]], out: TextIO, *, jobs: int) -> None:
+    cancelled = threading.Event()
+
+    def put(q: queue.Queue[_Item], item: _Item) -> bool:
+        # NOTE: the output might stop early (e.g. on errors), so don't block on a full queue forever
+        while not cancelled.is_set():
+            try:
+                q.put(item, timeout=0.1)
+            except queue.Full:
+                continue
+            return True
+        return False
+
+    def produce(path: Union[str, Path], q: queue.Queue[_Item]) -> None:
+        if cancelled.is_set():
+            return
+        try:
+            for batch in _batches(path):
+                if not put(q, batch):
+                    return
+        except Exception as e:  # reraised in the main thread
+            put(q, _Failed(e))
+            return
+        put(q, None)
+
+    # files are submitted (and so started) in order, so the file being written is always in progress or done
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        try:
+            queues: list[queue.Queue[_Item]] = []
+            for path in paths:
+                q: queue.Queue[_Item] = queue.Queue(maxsize=_QUEUE_SIZE)
+                pool.submit(produce, path, q)
+                queues.append(q)
+            for q in queues:
+                while (item := q.get()) is not None:
+                    if isinstance(item, _Failed):
+                        raise item.error
+                    out.write(item)
+        finally:
+            cancelled.set()
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    p = argparse.ArgumentParser(prog='python -m orgparse', description='Tools for org-mode files.')
+    commands = p.add_subparsers(dest='command', required=True)
+    d = commands.add_parser(
+        'dump',
+        help='Write nodes of org files as newline-delimited JSON',
+        description='Write nodes of org files to stdout as newline-delimited JSON, one object per node, in the order of the files.',
+    )
+    d.add_argument('files', nargs='+', type=Path, metavar='FILE', help='Org files to read')
+    d.add_argument('-j', '--jobs', type=int, default=1, metavar='N', help='Number of files to parse in parallel (default: %(default)s)')
+    args = p.parse_args(argv)
+    if args.jobs < 1:
+        d.error('--jobs should be at least 1')
+
+    try:
+        dump(args.files, sys.stdout, jobs=args.jobs)
+        sys.stdout.flush()
+    except BrokenPipeError:
+        # output was closed early, e.g. piped to head: don't fail again when flushing stdout at exit
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.stdout.fileno())
+        sys.exit(1)
+    except (OSError, ValueError) as e:
+        sys.exit(f'orgparse: {e}')
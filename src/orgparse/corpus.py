@@ -0,0 +1,290 @@
+"""
+Collections of org files, queried as a whole.
+
+>>> import tempfile
+>>> from pathlib import Path
+>>> with tempfile.TemporaryDirectory() as tmp:
+...     _ = (Path(tmp) / 'work.org').write_text('* TODO Report :work:\\n  SCHEDULED: <2024-03-01 Fri>\\n')
+...     _ = (Path(tmp) / 'home.org').write_text('#+FILETAGS: :home:\\n* Garden\\n:PROPERTIES:\\n:ID: garden\\n:END:\\n')
+...     corpus = OrgCorpus(tmp)
+...     [n.heading for n in corpus.with_tag('home')]
+...     corpus.by_id('garden').heading
+...     [(str(d), n.heading) for d, n in corpus.dates(date(2024, 3, 1), date(2024, 3, 31))]
+...     _ = (Path(tmp) / 'home.org').write_text('* Kitchen :home:\\n')
+...     corpus.refresh().modified == [Path(tmp) / 'home.org']
+...     [n.heading for n in corpus.with_tag('home')]
+['', 'Garden']
+'Garden'
+[('<2024-03-01 Fri>', 'Report')]
+True
+['Kitchen']
+"""
+
+from __future__ import annotations
+
+import bisect
+import heapq
+import os
+from collections.abc import Iterable, Iterator, Sequence
+from concurrent.futures import Executor
+from datetime import date, datetime, time, timedelta
+from fnmatch import fnmatch
+from pathlib import Path
+from typing import NamedTuple, Optional, Union, cast
+
+from . import load_many
+from .date import OrgDate
+from .node import OrgBaseNode, OrgNode, OrgRootNode, PropertyValue
+
+_MISSING: object = object()
+
+# (start, end, file, node index, date, node): sorted by start, and never compared past the node index
+_DateEntry = tuple[datetime, datetime, str, int, OrgDate, OrgBaseNode]
+
+
+class CorpusChanges(NamedTuple):
+    added: list[Path]
+    modified: list[Path]
+    removed: list[Path]
+
+
+class _FileIndex:
+    """
+    Indexes of a single file, replaced as a whole when the file changes.
+    """
+
+    __slots__ = ('dates', 'ids', 'properties', 'root', 'stat', 'tags')
+
+    def __init__(self, root: OrgRootNode, stat: tuple[int, int]) -> None:
+        self.root = root
+        self.stat = stat
+        self.tags: dict[str, list[OrgBaseNode]] = {}
+        self.properties: dict[str, list[OrgBaseNode]] = {}
+        self.ids: dict[str, OrgBaseNode] = {}
+        self.dates: list[_DateEntry] = []
+
+        filename = root.env.filename
+        # (level, tags) of the current node's ancestors, same as OrgNode.tags computes them
+        stack: list[tuple[int, frozenset[str]]] = []
+        for node in root:
+            level = node.level
+            while len(stack) > 0 and stack[-1][0] >= level:
+                stack.pop()
+            tags = frozenset(node.shallow_tags)
+            if len(stack) > 0:
+                tags |= stack[-1][1]
+            stack.append((level, tags))
+            for tag in tags:
+                self.tags.setdefault(tag, []).append(node)
+            for key, value in node._properties.items():
+                self.properties.setdefault(key, []).append(node)
+                if key == 'ID':
+                    self.ids.setdefault(str(value), node)
+            dates: list[OrgDate] = node.get_timestamps(active=True, inactive=True, range=True, point=True)
+            if isinstance(node, OrgNode):
+                dates.extend(d for d in (node.scheduled, node.deadline, node.closed) if d)
+            for d in dates:
+                (start, end) = _date_span(d)
+                self.dates.append((start, end, filename, node._index, d, node))
+        self.dates.sort(key=_date_key)
+
+
+def _date_key(entry: _DateEntry) -> tuple[datetime, datetime, str, int]:
+    return entry[:4]
+
+
+def _date_span(d: OrgDate) -> tuple[datetime, datetime]:
+    start = OrgDate._as_datetime(d.start)
+    if not d.has_end():
+        if isinstance(d.start, datetime):
+            return (start, start)
+        # the whole day
+        return (start, datetime.combine(d.start, time.max))
+    end = d.end
+    if not isinstance(end, datetime):
+        # the whole last day
+        return (start, datetime.combine(end, time.max))
+    return (start, end)
+
+
+class OrgCorpus:
+    """
+    Org files under a directory, loaded as one collection with shared indexes.
+
+    Tags (including inherited ones and ``#+FILETAGS``), property names, ``:ID:`` properties
+    and timestamps of all nodes are indexed when a file is loaded,
+    so the queries don't need to iterate over the trees.
+    :meth:`refresh` reloads and reindexes only the files which changed.
+
+    The corpus isn't thread-safe: don't query it while :meth:`refresh` is running.
+    """
+
+    def __init__(
+        self,
+        directory: Union[str, Path],
+        *,
+        ignore: Iterable[str] = (),
+        suffixes: Sequence[str] = ('.org',),
+        max_workers: Optional[int] = None,
+        executor: Optional[Executor] = None,
+    ) -> None:
+        """
+        :arg directory: searched recursively for org files (symlinks to directories aren't followed).
+        :arg ignore:
+            Glob patterns of files and directories to skip,
+            matched against the path relative to ``directory`` (with ``/`` separators) and against the name,
+            e.g. ``'.git'``, ``'archive/*'`` or ``'*.sync-conflict-*'``.
+        :arg suffixes: extensions of the files to load.
+        :arg max_workers: see :func:`orgparse.load_many`.
+        :arg executor: see :func:`orgparse.load_many`.
+        """
+        self.directory = Path(directory)
+        self._ignore = list(ignore)
+        self._suffixes = tuple(suffixes)
+        self._max_workers = max_workers
+        self._executor = executor
+        self._files: dict[Path, _FileIndex] = {}
+        # corpus-wide postings: key -> files which have it
+        self._tags: dict[str, set[Path]] = {}
+        self._properties: dict[str, set[Path]] = {}
+        self._ids: dict[str, set[Path]] = {}
+        # merged from the files lazily, see _date_entries
+        self._dates: Optional[list[_DateEntry]] = None
+        self._date_starts: list[datetime] = []
+        self._max_date_span = timedelta(0)
+        self.refresh()
+
+    # loading
+
+    def _scan(self) -> dict[Path, tuple[int, int]]:
+        found: dict[Path, tuple[int, int]] = {}
+        todo = [(self.directory, '')]
+        while len(todo) > 0:
+            (directory, prefix) = todo.pop()
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    rel = prefix + entry.name
+                    if any(fnmatch(rel, p) or fnmatch(entry.name, p) for p in self._ignore):
+                        continue
+                    if entry.is_dir(follow_symlinks=False):
+                        todo.append((Path(entry.path), rel + '/'))
+                    elif entry.name.endswith(self._suffixes) and entry.is_file():
+                        st = entry.stat()
+                        found[Path(entry.path)] = (st.st_mtime_ns, st.st_size)
+        return found
+
+    def refresh(self) -> CorpusChanges:
+        """
+        Rescan the directory, load new and modified files (in parallel), and drop deleted ones.
+
+        Files are considered modified if their size or modification time changed.
+        """
+        found = self._scan()
+        removed = sorted(p for p in self._files if p not in found)
+        added = sorted(p for p in found if p not in self._files)
+        modified = sorted(p for p, st in found.items() if p in self._files and self._files[p].stat != st)
+        paths = added + modified
+        # NOTE: load first, so that the corpus isn't changed if loading fails
+        roots = load_many(paths, max_workers=self._max_workers, executor=self._executor)
+        for path in removed + modified:
+            self._remove(path)
+        for path, root in zip(paths, roots):
+            self._add(path, _FileIndex(cast(OrgRootNode, root), found[path]))
+        if len(paths) > 0 or len(removed) > 0:
+            self._dates = None
+        return CorpusChanges(added=added, modified=modified, removed=removed)
+
+    def _add(self, path: Path, index: _FileIndex) -> None:
+        self._files[path] = index
+        for postings, keys in ((self._tags, index.tags), (self._properties, index.properties), (self._ids, index.ids)):
+            for key in keys:
+                postings.setdefault(key, set()).add(path)
+
+    def _remove(self, path: Path) -> None:
+        index = self._files.pop(path)
+        for postings, keys in ((self._tags, index.tags), (self._properties, index.properties), (self._ids, index.ids)):
+            for key in keys:
+                paths = postings[key]
+                paths.discard(path)
+                if len(paths) == 0:
+                    del postings[key]
+
+    # access
+
+    @property
+    def files(self) -> list[Path]:
+        """Loaded files, sorted."""
+        return sorted(self._files)
+
+    @property
+    def roots(self) -> dict[Path, OrgRootNode]:
+        """Loaded files -> their root nodes."""
+        return {path: self._files[path].root for path in self.files}
+
+    def __len__(self) -> int:
+        return len(self._files)
+
+    def __iter__(self) -> Iterator[OrgBaseNode]:
+        """All nodes of all files (including the roots)."""
+        for path in self.files:
+            yield from self._files[path].root
+
+    # queries
+
+    def with_tag(self, tag: str) -> list[OrgBaseNode]:
+        """
+        Nodes having ``tag`` (same as :attr:`orgparse.node.OrgBaseNode.tags`, i.e. including inherited tags).
+        """
+        return [n for path in sorted(self._tags.get(tag, ())) for n in self._files[path].tags[tag]]
+
+    def with_property(self, key: str, value: object = _MISSING) -> list[OrgBaseNode]:
+        """
+        Nodes having property ``key`` (optionally, equal to ``value``).
+        """
+        nodes = [n for path in sorted(self._properties.get(key, ())) for n in self._files[path].properties[key]]
+        if value is _MISSING:
+            return nodes
+        return [n for n in nodes if n.properties[key] == cast(PropertyValue, value)]
+
+    def by_id(self, id_: str) -> Optional[OrgBaseNode]:
+        """
+        Node with the ``:ID:`` property (if there are duplicates, the one in the first file).
+        """
+        paths = self._ids.get(id_)
+        if paths is None:
+            return None
+        return self._files[min(paths)].ids[id_]
+
+    def dates(
+        self,
+        start: Optional[Union[date, datetime]] = None,
+        end: Optional[Union[date, datetime]] = None,
+    ) -> Iterator[tuple[OrgDate, OrgBaseNode]]:
+        """
+        Timestamps overlapping with ``[start, end]`` (either can be omitted), with their nodes, ordered by start.
+
+        Includes the timestamps in node bodies and SCHEDULED, DEADLINE and CLOSED dates (but not clocks).
+        Dates without time are the whole day.
+        """
+        entries = self._date_entries()
+        lo = 0
+        start_dt: Optional[datetime] = None
+        if start is not None:
+            start_dt = OrgDate._as_datetime(start)
+            # ranges which started before start might still overlap with it
+            lo = bisect.bisect_left(self._date_starts, start_dt - self._max_date_span)
+        hi = len(entries)
+        if end is not None:
+            end_dt = end if isinstance(end, datetime) else datetime.combine(end, time.max)
+            hi = bisect.bisect_right(self._date_starts, end_dt)
+        for i in range(lo, hi):
+            entry = entries[i]
+            if start_dt is None or entry[1] >= start_dt:
+                yield (entry[4], entry[5])
+
+    def _date_entries(self) -> list[_DateEntry]:
+        if self._dates is None:
+            self._dates = list(heapq.merge(*(f.dates for f in self._files.values()), key=_date_key))
+            self._date_starts = [e[0] for e in self._dates]
+            self._max_date_span = max((e[1] - e[0] for e in self._dates), default=timedelta(0))
+        return self._dates
@@ -2,12 +2,66 @@ from __future__ import annotations
 
 import datetime
 import re
+from collections.abc import Iterator
 from datetime import timedelta
-from typing import Optional, Union
+from typing import Any, Optional, Union, cast
 
 DateIsh = Union[datetime.date, datetime.datetime]
 
 
+class _LazyRegex:
+    """
+    Regex compiled on first use, so that importing orgparse doesn't pay for compiling large patterns.
+
+    Call it to get the compiled pattern. As a class attribute, it compiles on first access,
+    and replaces itself with the compiled pattern (so later accesses are ordinary attribute lookups).
+
+    >>> class C:
+    ...     pattern = _LazyRegex(r'\\d+')
+    >>> 'pattern' in C.__dict__ and isinstance(C.__dict__['pattern'], _LazyRegex)
+    True
+    >>> C().pattern.findall('1 2')
+    ['1', '2']
+    >>> isinstance(C.__dict__['pattern'], re.Pattern)
+    True
+    """
+
+    __slots__ = ('_compiled', '_flags', '_name', '_pattern')
+
+    def __init__(self, pattern: str, flags: int = 0) -> None:
+        self._pattern = pattern
+        self._flags = flags
+        self._compiled: Optional[re.Pattern[str]] = None
+        self._name: Optional[str] = None
+
+    def __call__(self) -> re.Pattern[str]:
+        compiled = self._compiled
+        if compiled is None:
+            # NOTE: compiling is idempotent, so it doesn't matter if several threads race here
+            compiled = re.compile(self._pattern, self._flags)
+            self._compiled = compiled
+        return compiled
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self._name = name
+
+    def __get__(self, obj: Any, owner: Optional[type] = None) -> re.Pattern[str]:
+        compiled = self()
+        for klass in (type(obj) if owner is None else owner).__mro__:
+            if klass.__dict__.get(self._name) is self:  # type: ignore[arg-type]
+                setattr(klass, cast(str, self._name), compiled)
+                break
+        return compiled
+
+
+def __getattr__(name: str) -> re.Pattern[str]:
+    # public patterns are compiled on first access, see _LazyRegex
+    lazy = _LAZY_PATTERNS.get(name)
+    if lazy is None:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    return lazy()
+
+
 def total_seconds(td: timedelta) -> float:
     """Equivalent to `datetime.timedelta.total_seconds`."""
     return float(td.microseconds + (td.seconds + td.days * 24 * 3600) * 10**6) / 10**6
@@ -91,7 +145,9 @@ def gene_timestamp_regex(brtype: str, prefix: str | None = None, *, nocookie: bo
     if brtype == 'nobrace':
         ignore = r'[\s\w]'
     else:
-        ignore = f'[^{bc}]'
+        # NOTE: newlines are excluded so timestamps never span multiple lines,
+        # this allows scanning a whole document at once
+        ignore = f'[^{bc}\\n]'
 
     if prefix is None:
         prefix = f'{brtype}_'
@@ -157,12 +213,12 @@ def is_same_day(date0, date1) -> bool:
     return OrgDate._date_to_tuple(date0)[:3] == OrgDate._date_to_tuple(date1)[:3]
 
 
-TIMESTAMP_NOBRACE_RE = re.compile(
+_TIMESTAMP_NOBRACE_RE = _LazyRegex(
     gene_timestamp_regex('nobrace', prefix=''),
     re.VERBOSE,
 )
 
-TIMESTAMP_RE = re.compile(
+_TIMESTAMP_RE = _LazyRegex(
     '|'.join((
         gene_timestamp_regex('active'),
         gene_timestamp_regex('inactive'),
@@ -174,7 +230,31 @@ TIMESTAMP_RE = re.compile(
 _Repeater = tuple[str, int, str]
 
 
+def _slots_getstate(obj: Any) -> dict[str, Any]:
+    """
+    Values of all the (set) slots of the object.
+
+    Pickle protocols 2+ handle ``__slots__`` on their own, but 0 and 1 need ``__getstate__``.
+    """
+    return {
+        field: getattr(obj, field)
+        for klass in type(obj).__mro__
+        for field in klass.__dict__.get('__slots__', ())
+        if hasattr(obj, field)
+    }
+
+
+def _slots_setstate(obj: Any, state: dict[str, Any]) -> None:
+    for field, value in state.items():
+        object.__setattr__(obj, field, value)
+
+
 class OrgDate:
+    __slots__ = ('_active', '_end', '_repeater', '_start', '_warning')
+
+    __getstate__ = _slots_getstate
+    __setstate__ = _slots_setstate
+
     _active_default = True
     """
     The default active value.
@@ -452,10 +532,28 @@ class OrgDate:
         >>> OrgDate.list_from_str("<2012-02-11 Sat 10:11--11:20>")
         [OrgDate((2012, 2, 11, 10, 11, 0), (2012, 2, 11, 11, 20, 0))]
         """
+        return [odate for (_, odate) in cls._iter_from_str(string)]
+
+    @classmethod
+    def _iter_from_str(cls, string: str) -> Iterator[tuple[int, OrgDate]]:
+        """
+        Scan string for timestamps, yield their offsets in the string along with parsed :class:`OrgDate` objects.
+
+        This is linear in the size of the string, so it's fine to call it against the whole document.
+        Timestamps never span multiple lines.
+
+        >>> list(OrgDate._iter_from_str("<2012-02-10 Fri>\\n  [2012-02-11 Sat]--[2012-02-12 Sun]"))
+        [(0, OrgDate((2012, 2, 10))), (19, OrgDate((2012, 2, 11), (2012, 2, 12), False))]
+        """
         cookie_suffix = ['pre', 'num', 'dwmy']
-        match = TIMESTAMP_RE.search(string)
-        if match:
-            rest = string[match.end() :]
+        timestamp_re = _TIMESTAMP_RE()
+        search = timestamp_re.search
+        pos = 0
+        while True:
+            match = search(string, pos)
+            if match is None:
+                return
+            pos = match.end()
             mdict = match.groupdict()
             if mdict['active_year']:
                 prefix = 'active_'
@@ -475,10 +573,9 @@ class OrgDate:
                 keys = [prefix + 'warn' + suffix for suffix in cookie_suffix]
                 values = [mdict[k] for k in keys]
                 warning = (values[0], int(values[1]), values[2])
-            has_rangedash = rest.startswith(rangedash)
-            match2 = TIMESTAMP_RE.search(rest) if has_rangedash else None
-            if has_rangedash and match2:
-                rest = rest[match2.end() :]
+            match2 = timestamp_re.match(string, pos + 2) if string.startswith(rangedash, pos) else None
+            if match2:
+                pos = match2.end()
                 # no need for check activeness here because of the rangedash
                 mdict2 = match2.groupdict()
                 odate = cls(
@@ -492,9 +589,7 @@ class OrgDate:
                 odate = cls(
                     *cls._daterange_from_groupdict(mdict, prefix), active=active, repeater=repeater, warning=warning
                 )
-            return [odate, *cls.list_from_str(rest)]
-        else:
-            return []
+            yield (match.start(), odate)
 
     @classmethod
     def from_str(cls, string: str) -> OrgDate:
@@ -514,12 +609,16 @@ class OrgDate:
         else:
             return cls(None)
 
-    _from_str_re = TIMESTAMP_NOBRACE_RE
+    _from_str_re = _TIMESTAMP_NOBRACE_RE
 
 
 def compile_sdc_re(sdctype):
+    return _sdc_re(sdctype)()
+
+
+def _sdc_re(sdctype: str) -> _LazyRegex:
     brtype = 'inactive' if sdctype == 'CLOSED' else 'active'
-    return re.compile(
+    return _LazyRegex(
         r'^(?!\#).*{}:\s+{}'.format(
             sdctype,
             gene_timestamp_regex(brtype, prefix='', nocookie=True),
@@ -529,7 +628,9 @@ def compile_sdc_re(sdctype):
 
 
 class OrgDateSDCBase(OrgDate):
-    _re = None  # override this!
+    __slots__ = ()
+
+    _re: Optional[re.Pattern[str]] = None  # override this!
 
     # FIXME: use OrgDate.from_str
     @classmethod
@@ -538,56 +639,115 @@ class OrgDateSDCBase(OrgDate):
         assert rgx is not None
         match = rgx.search(string)
         if match:
-            mdict = match.groupdict()
-            start = cls._datetuple_from_groupdict(mdict)
-            end = None
-            end_hour = mdict['end_hour']
-            end_min = mdict['end_min']
-            if end_hour is not None and end_min is not None:
-                end_dict = {}
-                end_dict.update(mdict)
-                end_dict.update({'hour': end_hour, 'min': end_min})
-                end = cls._datetuple_from_groupdict(end_dict)
-            cookie_suffix = ['pre', 'num', 'dwmy']
-            repeater: Optional[tuple[str, int, str]] = None
-            warning: Optional[tuple[str, int, str]] = None
-            prefix = ''
-            if mdict[prefix + 'repeatpre'] is not None:
-                keys = [prefix + 'repeat' + suffix for suffix in cookie_suffix]
-                values = [mdict[k] for k in keys]
-                repeater = (values[0], int(values[1]), values[2])
-            if mdict[prefix + 'warnpre'] is not None:
-                keys = [prefix + 'warn' + suffix for suffix in cookie_suffix]
-                values = [mdict[k] for k in keys]
-                warning = (values[0], int(values[1]), values[2])
-            return cls(start, end, active=cls._active_default, repeater=repeater, warning=warning)
+            return cls._from_groupdict(match.groupdict())
         else:
             return cls(None)
 
+    @classmethod
+    def _from_groupdict(cls, mdict, prefix=''):
+        start = cls._datetuple_from_groupdict(mdict, prefix)
+        end = None
+        end_hour = mdict[prefix + 'end_hour']
+        end_min = mdict[prefix + 'end_min']
+        if end_hour is not None and end_min is not None:
+            end_dict = {}
+            end_dict.update(mdict)
+            end_dict.update({prefix + 'hour': end_hour, prefix + 'min': end_min})
+            end = cls._datetuple_from_groupdict(end_dict, prefix)
+        cookie_suffix = ['pre', 'num', 'dwmy']
+        repeater: Optional[tuple[str, int, str]] = None
+        warning: Optional[tuple[str, int, str]] = None
+        if mdict[prefix + 'repeatpre'] is not None:
+            keys = [prefix + 'repeat' + suffix for suffix in cookie_suffix]
+            values = [mdict[k] for k in keys]
+            repeater = (values[0], int(values[1]), values[2])
+        if mdict[prefix + 'warnpre'] is not None:
+            keys = [prefix + 'warn' + suffix for suffix in cookie_suffix]
+            values = [mdict[k] for k in keys]
+            warning = (values[0], int(values[1]), values[2])
+        return cls(start, end, active=cls._active_default, repeater=repeater, warning=warning)
+
 
 class OrgDateScheduled(OrgDateSDCBase):
     """Date object to represent SCHEDULED attribute."""
 
-    _re = compile_sdc_re('SCHEDULED')
+    __slots__ = ()
+
+    _re = _sdc_re('SCHEDULED')
     _active_default = True
 
 
 class OrgDateDeadline(OrgDateSDCBase):
     """Date object to represent DEADLINE attribute."""
 
-    _re = compile_sdc_re('DEADLINE')
+    __slots__ = ()
+
+    _re = _sdc_re('DEADLINE')
     _active_default = True
 
 
 class OrgDateClosed(OrgDateSDCBase):
     """Date object to represent CLOSED attribute."""
 
-    _re = compile_sdc_re('CLOSED')
+    __slots__ = ()
+
+    _re = _sdc_re('CLOSED')
     _active_default = False
 
 
-def parse_sdc(string):
-    return (OrgDateScheduled.from_str(string), OrgDateDeadline.from_str(string), OrgDateClosed.from_str(string))
+# Matches any of the planning keywords along with its timestamp, so the whole planning line is tokenized in one scan.
+# SCHEDULED/DEADLINE take active timestamps, CLOSED takes an inactive one.
+_PLANNING_RE = _LazyRegex(
+    r'(?P<keyword>SCHEDULED|DEADLINE):\s+{} | CLOSED:\s+{}'.format(
+        gene_timestamp_regex('active', nocookie=True),
+        gene_timestamp_regex('inactive', nocookie=True),
+    ),
+    re.VERBOSE,
+)
+
+# Planning dates for nodes which don't have them.
+# Dates are never modified after creation, so these are shared between all nodes.
+_NULL_SDC = (OrgDateScheduled(None), OrgDateDeadline(None), OrgDateClosed(None))
+
+
+def parse_sdc(string: str) -> tuple[OrgDateScheduled, OrgDateDeadline, OrgDateClosed]:
+    """
+    Parse SCHEDULED, DEADLINE and CLOSED timestamps from a planning line.
+
+    All keywords are found in a single pass over the line.
+
+    >>> (scheduled, deadline, closed) = parse_sdc(
+    ...     'CLOSED: [2012-02-26 Sun 21:15] SCHEDULED: <2012-02-26 Sun +1w -2d>')
+    >>> scheduled
+    OrgDateScheduled((2012, 2, 26), None, True, ('+', 1, 'w'), ('-', 2, 'd'))
+    >>> closed
+    OrgDateClosed((2012, 2, 26, 21, 15, 0))
+    >>> bool(deadline)
+    False
+
+    Missing keywords are represented by shared 'empty' dates:
+
+    >>> parse_sdc('no planning here') is parse_sdc('# SCHEDULED: <2012-02-26 Sun>')
+    True
+    """
+    if string.startswith('#'):
+        # commented out line
+        return _NULL_SDC
+    matches = list(_PLANNING_RE().finditer(string))
+    if len(matches) == 0:
+        return _NULL_SDC
+    (scheduled, deadline, closed) = _NULL_SDC
+    # NOTE: if a keyword is repeated, the last one wins (same as the greedy per-keyword regexes used to behave)
+    for match in matches:
+        keyword = match.group('keyword')
+        mdict = match.groupdict()
+        if keyword == 'SCHEDULED':
+            scheduled = OrgDateScheduled._from_groupdict(mdict, 'active_')
+        elif keyword == 'DEADLINE':
+            deadline = OrgDateDeadline._from_groupdict(mdict, 'active_')
+        else:
+            closed = OrgDateClosed._from_groupdict(mdict, 'inactive_')
+    return (scheduled, deadline, closed)
 
 
 class OrgDateClock(OrgDate):
@@ -600,6 +760,8 @@ class OrgDateClock(OrgDate):
 
     """
 
+    __slots__ = ('_duration',)
+
     _active_default = False
 
     _allow_short_range = False
@@ -655,34 +817,34 @@ class OrgDateClock(OrgDate):
         match = cls._re.search(line)
         if not match:
             return cls(None, None)
+        return cls._from_match(match)
 
-        ymdhm1 = [int(d) for d in match.groups()[:5]]
+    @classmethod
+    def _from_match(cls, match: re.Match) -> OrgDateClock:
+        # NOTE: this is called for every CLOCK line, so avoiding generic conversions in OrgDate.__init__ here
+        (y1, m1, d1, H1, M1, has_end, y2, m2, d2, H2, M2, dh, dm) = match.groups()
+        start = datetime.datetime(int(y1), int(m1), int(d1), int(H1), int(M1))
 
         # second part starting with "--", does not exist for open clock dates
-        has_end = bool(match.group(6))
-        ymdhm2_dt: Optional[datetime.datetime]
+        end: Optional[datetime.datetime]
         len_min: Optional[int]
         if has_end:
-            ymdhm2 = [int(d) for d in match.groups()[6:11]]
-            hm3 = [int(d) for d in match.groups()[11:]]
-
-            ymdhm2_dt = datetime.datetime(*ymdhm2)  # type: ignore[arg-type]
-            len_min = hm3[0] * 60 + hm3[1]
+            end = datetime.datetime(int(y2), int(m2), int(d2), int(H2), int(M2))
+            len_min = int(dh) * 60 + int(dm)
         else:
-            ymdhm2_dt = None
+            end = None
             len_min = None
 
-        return cls(
-            datetime.datetime(*ymdhm1),  # type: ignore[arg-type]
-            ymdhm2_dt,
-            len_min,
-        )
+        return cls(start, end, len_min)
 
-    _re = re.compile(
-        r'^(?!#).*CLOCK:\s+'
+    _entry_re_str = (
+        r'CLOCK:\s+'
         r'\[(\d+)\-(\d+)\-(\d+)[^\]\d]*(\d+)\:(\d+)\]'
         r'(--\[(\d+)\-(\d+)\-(\d+)[^\]\d]*(\d+)\:(\d+)\]\s+=>\s+(\d+)\:(\d+))?'
     )
+    _re = _LazyRegex(r'^(?!#).*' + _entry_re_str)
+    # for lines already known to start with 'CLOCK:' (e.g. inside :LOGBOOK: drawers), avoids scanning with '.*'
+    _entry_re = _LazyRegex(_entry_re_str)
 
 
 class OrgDateRepeatedTask(OrgDate):
@@ -690,6 +852,8 @@ class OrgDateRepeatedTask(OrgDate):
     Date object to represent repeated tasks.
     """
 
+    __slots__ = ('_after', '_before')
+
     _active_default = False
 
     def __init__(self, start, before: str, after: str, active=None) -> None:
@@ -737,3 +901,10 @@ class OrgDateRepeatedTask(OrgDate):
 
         """
         return self._after
+
+
+_LAZY_PATTERNS = {
+    'TIMESTAMP_NOBRACE_RE': _TIMESTAMP_NOBRACE_RE,
+    'TIMESTAMP_RE': _TIMESTAMP_RE,
+    'PLANNING_RE': _PLANNING_RE,
+}
@@ -1,35 +1,97 @@
 from __future__ import annotations
 
+import importlib
 import re
 from collections.abc import Iterator, Sequence
-from typing import Optional, Union
+from typing import Any, Callable, Optional, Union
 
+from .date import OrgDate
+
+# NOTE: these are kept for backwards compatibility, but not used for parsing anymore:
+# the regexes backtrack a lot on long lines, see is_table_row/is_table_separator
 RE_TABLE_SEPARATOR = re.compile(r'\s*\|(\-+\+)*\-+\|')
-RE_TABLE_ROW = re.compile(r'\s*\|([^|]+)+\|')
+RE_TABLE_ROW = re.compile(r'\s*\|[^|]+\|')
 STRIP_CELL_WHITESPACE = True
 
 
+def is_table_row(line: str) -> bool:
+    """
+    Whether the line is a table row (separators are rows too), same as matching ``RE_TABLE_ROW``.
+
+    Takes linear time in the line length.
+
+    >>> is_table_row('  | a | b |')
+    True
+    >>> is_table_row('|-----+---|')
+    True
+    >>> is_table_row('|| not a table')
+    False
+    >>> is_table_row('| no closing pipe')
+    False
+    """
+    s = line.lstrip()
+    return s.startswith('|') and s.find('|', 1) > 1
+
+
+def is_table_separator(line: str) -> bool:
+    """
+    Whether the line is a table separator, e.g. ``|---+---|``, same as matching ``RE_TABLE_SEPARATOR``.
+
+    Takes linear time in the line length.
+
+    >>> is_table_separator('  |-----+---|')
+    True
+    >>> is_table_separator('|---|---|')
+    True
+    >>> is_table_separator('|--++--|')
+    False
+    >>> is_table_separator('| a |')
+    False
+    """
+    s = line.lstrip()
+    if not s.startswith('|'):
+        return False
+    end = s.find('|', 1)
+    if end == -1:
+        return False
+    inner = s[1:end]
+    return inner.startswith('-') and inner.endswith('-') and inner.strip('-+') == '' and '++' not in inner
+
+
 Row = Sequence[str]
 
 
 class Table:
-    def __init__(self, lines: list[str]) -> None:
+    def __init__(self, lines: list[str], *, strip_cells: Optional[bool] = None) -> None:
+        """
+        :arg strip_cells: strip whitespace around cell values, by default ``STRIP_CELL_WHITESPACE``.
+        """
         self._lines = lines
+        # NOTE: resolving the global setting now, so it doesn't matter if it's changed (e.g. by another thread) later
+        self._strip_cells = STRIP_CELL_WHITESPACE if strip_cells is None else strip_cells
+        # parsed on first access, see _pre_rows
+        # NOTE: these are only assigned once they are complete, so concurrent access from threads is fine
+        self._parsed: Optional[list[Optional[Row]]] = None
+        self._blocks: Optional[list[Sequence[Row]]] = None
 
     @property
     def blocks(self) -> Iterator[Sequence[Row]]:
-        group: list[Row] = []
-        first = True
-        for r in self._pre_rows():
-            if r is None:
-                if not first or len(group) > 0:
-                    yield group
-                    first = False
-                group = []
-            else:
-                group.append(r)
-        if len(group) > 0:
-            yield group
+        if self._blocks is None:
+            blocks: list[Sequence[Row]] = []
+            group: list[Row] = []
+            first = True
+            for r in self._pre_rows():
+                if r is None:
+                    if not first or len(group) > 0:
+                        blocks.append(group)
+                        first = False
+                    group = []
+                else:
+                    group.append(r)
+            if len(group) > 0:
+                blocks.append(group)
+            self._blocks = blocks
+        return iter(self._blocks)
 
     def __iter__(self) -> Iterator[Row]:
         return self.rows
@@ -40,19 +102,24 @@ class Table:
             if r is not None:
                 yield r
 
-    def _pre_rows(self) -> Iterator[Optional[Row]]:
-        for l in self._lines:
-            if RE_TABLE_SEPARATOR.match(l):
-                yield None
-            else:
-                pr = l.strip().strip('|').split('|')
-                if STRIP_CELL_WHITESPACE:
-                    pr = [x.strip() for x in pr]
-                yield pr
-        # TODO use iparse helper?
+    def _pre_rows(self) -> list[Optional[Row]]:
+        """
+        Rows of the table, ``None`` for separators. The lines are only split once.
+        """
+        if self._parsed is None:
+            parsed: list[Optional[Row]] = []
+            for l in self._lines:
+                if is_table_separator(l):
+                    parsed.append(None)
+                else:
+                    pr = l.strip().strip('|').split('|')
+                    if self._strip_cells:
+                        pr = [x.strip() for x in pr]
+                    parsed.append(pr)
+            self._parsed = parsed
+        return self._parsed
 
-    @property
-    def as_dicts(self) -> AsDictHelper:
+    def _columns_and_rows(self) -> tuple[Row, Sequence[Row]]:
         bl = list(self.blocks)
         if len(bl) != 2:
             raise RuntimeError('Need two-block table to non-ambiguously guess column names')
@@ -61,10 +128,159 @@ class Table:
             raise RuntimeError(f'Need single row heading to guess column names, got: {hrows}')
         columns = hrows[0]
         assert len(set(columns)) == len(columns), f'Duplicate column names: {columns}'
+        return (columns, bl[1])
+
+    @property
+    def as_dicts(self) -> AsDictHelper:
+        (columns, rows) = self._columns_and_rows()
         return AsDictHelper(
             columns=columns,
-            rows=bl[1],
+            rows=rows,
+        )
+
+    def to_columns(self, *, infer_types: bool = True, numpy: Optional[bool] = None) -> dict[str, Any]:
+        """
+        Column-major view of the table: a dict from column name to the list of its values.
+
+        Much faster than going through :attr:`as_dicts` for large tables.
+        Column names are guessed the same way as for :attr:`as_dicts`.
+
+        >>> t = Table([
+        ...     '| name | count | effort | when             |',
+        ...     '|------+-------+--------+------------------|',
+        ...     '| a    |     1 |   1:30 | <2020-01-01 Wed> |',
+        ...     '| b    |       |     2h | <2020-01-02 Thu> |',
+        ... ])
+        >>> cols = t.to_columns(numpy=False)
+        >>> cols['name'], cols['count'], cols['effort']
+        (['a', 'b'], [1, None], [90, 120])
+        >>> cols['when']
+        [OrgDate((2020, 1, 1)), OrgDate((2020, 1, 2))]
+
+        :arg infer_types:
+            Convert columns where all non-empty cells have the same type (see :func:`infer_column`).
+            Empty cells become ``None``. Otherwise all values are kept as strings.
+        :arg numpy:
+            Return NumPy arrays instead of lists.
+            By default, arrays are returned if NumPy is installed.
+            Numeric and duration columns become ``float64`` arrays (``int64`` if there are no empty cells),
+            with empty cells as ``nan``; timestamp columns become ``datetime64`` arrays of the start dates,
+            with empty cells as ``NaT``; the rest are ``object`` arrays.
+        """
+        np = _import_numpy(required=numpy is True) if numpy is not False else None
+
+        (columns, rows) = self._columns_and_rows()
+        ncols = len(columns)
+        if len(rows) == 0:
+            values: list[list[str]] = [[] for _ in columns]
+        elif all(len(r) == ncols for r in rows):
+            values = [list(c) for c in zip(*rows)]
+        else:
+            # ragged rows: pad missing cells, ignore extra ones (same as as_dicts)
+            values = [[r[i] if i < len(r) else '' for r in rows] for i in range(ncols)]
+
+        res: dict[str, Any] = {}
+        for name, vals in zip(columns, values):
+            kind: Optional[str] = None
+            col: list[Any] = vals
+            if infer_types:
+                (kind, col) = infer_column(vals)
+            res[name] = col if np is None else _to_array(np, kind, col)
+        return res
+
+
+def _parse_int(value: str) -> int:
+    # NOTE: int() also accepts things like '1_000', which aren't org numbers
+    if not value.lstrip('+-').isdigit():
+        raise ValueError(value)
+    return int(value)
+
+
+_RE_FLOAT = re.compile(r'[+-]?(\d+\.?\d*|\.\d+)([eE][+-]?\d+)?')
+
+
+def _parse_float(value: str) -> float:
+    # NOTE: float() also accepts things like '1_000', 'nan' or 'inf', which aren't org numbers
+    if _RE_FLOAT.fullmatch(value) is None:
+        raise ValueError(value)
+    return float(value)
+
+
+def _parse_timestamp(value: str) -> OrgDate:
+    if value[:1] not in '<[':
+        raise ValueError(value)
+    dates = OrgDate.list_from_str(value)
+    if len(dates) != 1:
+        raise ValueError(value)
+    return dates[0]
+
+
+def _column_types() -> list[tuple[str, Callable[[str], Any]]]:
+    # NOTE: importing here, node imports this module
+    from .node import parse_duration_to_minutes  # noqa: PLC0415
+
+    # NOTE: order matters, plain numbers are valid durations too
+    return [
+        ('int', _parse_int),
+        ('float', _parse_float),
+        ('duration', parse_duration_to_minutes),
+        ('timestamp', _parse_timestamp),
+    ]
+
+
+def infer_column(values: Sequence[str]) -> tuple[Optional[str], list[Any]]:
+    """
+    Guess the type of a table column and convert its values.
+
+    Returns the type name (``'int'``, ``'float'``, ``'duration'`` (in minutes),
+    ``'timestamp'`` (:class:`orgparse.date.OrgDate`), or ``None`` if the values are left as strings)
+    and the converted values, with empty cells as ``None``.
+
+    >>> infer_column(['1', '', '-3'])
+    ('int', [1, None, -3])
+    >>> infer_column(['1', '2.5'])
+    ('float', [1.0, 2.5])
+    >>> infer_column(['0:30', '1h'])
+    ('duration', [30, 60])
+    >>> infer_column(['1', 'two'])
+    (None, ['1', 'two'])
+    """
+    # columns often have repeated values, so only parsing each distinct value once
+    distinct = dict.fromkeys(values)
+    distinct.pop('', None)
+    if len(distinct) == 0:
+        return (None, list(values))
+    for kind, parse in _column_types():
+        try:
+            parsed: dict[str, Any] = {v: parse(v) for v in distinct}
+        except (ValueError, TypeError):
+            continue
+        parsed[''] = None
+        return (kind, [parsed[v] for v in values])
+    return (None, list(values))
+
+
+def _import_numpy(*, required: bool) -> Any:
+    # NOTE: numpy is an optional dependency, and a heavy import, so only importing it on demand
+    try:
+        return importlib.import_module('numpy')
+    except ImportError:
+        if required:
+            raise
+        return None
+
+
+def _to_array(np: Any, kind: Optional[str], values: list[Any]) -> Any:
+    if kind in {'int', 'float', 'duration'}:
+        if kind == 'int' and None not in values:
+            return np.array(values, dtype='int64')
+        return np.array([np.nan if v is None else v for v in values], dtype='float64')
+    if kind == 'timestamp':
+        return np.array(
+            [np.datetime64('NaT') if v is None else np.datetime64(v.start) for v in values],
+            dtype='datetime64[s]',
         )
+    return np.array(values, dtype=object)
 
 
 class AsDictHelper:
@@ -109,7 +325,8 @@ def to_rich_text(text: str) -> Iterator[Rich]:
         return res
 
     for line in lines:
-        if RE_TABLE_ROW.match(line) or RE_TABLE_SEPARATOR.match(line):
+        # NOTE: separators are matched by is_table_row too
+        if is_table_row(line):
             cur = Table
         else:
             cur = Gap  # type: ignore[assignment]
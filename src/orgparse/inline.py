@@ -1,8 +1,360 @@
 """
 Org-mode inline markup parser.
+
+Inline markup (links, emphasis, footnote references and timestamps) is recognized
+by a single scan over the text, see :class:`InlineText`.
+
+>>> text = InlineText('*Bold* text with [[https://orgmode.org][a link]] and [fn:1], see <2012-02-26 Sun>')
+>>> [type(t).__name__ for t in text.tokens]
+['Emphasis', 'Text', 'Link', 'Text', 'Footnote', 'Text', 'Timestamp']
+>>> text.plain_text
+'*Bold* text with a link and [fn:1], see <2012-02-26 Sun>'
 """
 
+from __future__ import annotations
+
 import re
+from bisect import bisect_left
+from collections.abc import Iterable, Iterator
+from typing import ClassVar, Optional, cast
+
+from .date import OrgDate
+
+
+class Token:
+    """
+    Span ``source[start:end]`` of the inline text.
+    """
+
+    __slots__ = ('end', 'source', 'start')
+
+    def __init__(self, source: str, start: int, end: int) -> None:
+        self.source = source
+        self.start = start
+        self.end = end
+
+    @property
+    def raw(self) -> str:
+        """Original text of the token."""
+        return self.source[self.start : self.end]
+
+    @property
+    def plain(self) -> str:
+        """Text of the token with links replaced by their descriptions (see :func:`to_plain_text`)."""
+        return self.raw
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}({self.raw!r})'
+
+
+class Text(Token):
+    """
+    Text without any markup.
+    """
+
+    __slots__ = ()
+
+
+class Link(Token):
+    """
+    ``[[target]]`` or ``[[target][description]]``.
+
+    >>> [link] = InlineText('[[https://orgmode.org][Org]]').links
+    >>> (link.target, link.description, link.plain)
+    ('https://orgmode.org', 'Org', 'Org')
+    """
+
+    __slots__ = ('description', 'target')
+
+    def __init__(self, source: str, start: int, end: int, target: str, description: Optional[str]) -> None:
+        super().__init__(source, start, end)
+        self.target = target
+        self.description = description
+
+    @property
+    def plain(self) -> str:
+        return self.description or self.target
+
+
+class Emphasis(Token):
+    """
+    Emphasis markup, e.g. ``*bold*`` or ``=verbatim=``.
+
+    >>> [em] = InlineText('some /italic [[link][text]]/').emphasis
+    >>> (em.kind, em.contents)
+    ('italic', 'italic [[link][text]]')
+    >>> em.children.tokens
+    [Text('italic '), Link('[[link][text]]')]
+    """
+
+    __slots__ = ('_children', 'marker')
+
+    KINDS: ClassVar[dict[str, str]] = {
+        '*': 'bold',
+        '/': 'italic',
+        '_': 'underline',
+        '=': 'verbatim',
+        '~': 'code',
+        '+': 'strike-through',
+    }
+
+    def __init__(self, source: str, start: int, end: int, marker: str) -> None:
+        super().__init__(source, start, end)
+        self.marker = marker
+        self._children: Optional[InlineText] = None
+
+    @property
+    def kind(self) -> str:
+        return self.KINDS[self.marker]
+
+    @property
+    def contents(self) -> str:
+        """Text between the markers."""
+        return self.source[self.start + 1 : self.end - 1]
+
+    @property
+    def children(self) -> InlineText:
+        """Markup inside the emphasis (parsed on first access)."""
+        if self._children is None:
+            self._children = InlineText(self.contents)
+        return self._children
+
+    @property
+    def is_verbatim(self) -> bool:
+        """Whether contents are taken literally (``=verbatim=`` and ``~code~``)."""
+        return self.marker in '=~'
+
+    @property
+    def plain(self) -> str:
+        # NOTE: markers are kept, only links are replaced (even inside verbatim), as to_plain_text always did
+        return self.marker + self.children.plain_text + self.marker
+
+
+class Footnote(Token):
+    """
+    Footnote reference ``[fn:label]`` or inline footnote ``[fn:label:definition]``.
+
+    >>> [fn] = InlineText('see[fn:note:inline definition]').footnotes
+    >>> (fn.label, fn.definition)
+    ('note', 'inline definition')
+    """
+
+    __slots__ = ('definition', 'label')
+
+    def __init__(self, source: str, start: int, end: int, label: str, definition: Optional[str]) -> None:
+        super().__init__(source, start, end)
+        self.label = label
+        self.definition = definition
+
+
+class Timestamp(Token):
+    """
+    Active or inactive timestamp, possibly a range.
+
+    >>> [ts] = InlineText('at [2012-02-26 Sun 10:00]--[2012-02-26 Sun 11:00]').timestamps
+    >>> ts.dates
+    [OrgDate((2012, 2, 26, 10, 0, 0), (2012, 2, 26, 11, 0, 0), False)]
+    """
+
+    __slots__ = ()
+
+    @property
+    def dates(self) -> list[OrgDate]:
+        """Parsed dates (empty if the timestamp is malformed)."""
+        return OrgDate.list_from_str(self.raw)
+
+
+class InlineText:
+    """
+    Inline markup of a piece of org text.
+
+    Tokens are produced lazily, on first access, by a single scan of the text (see :func:`_scan_markup`).
+    All the accessors share the same tokens.
+    """
+
+    __slots__ = ('_markup', '_tokens', 'text')
+
+    def __init__(self, text: str) -> None:
+        self.text = text
+        self._markup: Optional[list[_Markup]] = None
+        self._tokens: Optional[list[Token]] = None
+
+    def _scan(self) -> list[_Markup]:
+        if self._markup is None:
+            self._markup = list(_scan_markup(self.text))
+        return self._markup
+
+    @property
+    def tokens(self) -> list[Token]:
+        """Top level tokens, covering the whole text."""
+        if self._tokens is None:
+            self._tokens = list(_tokens_from_matches(self.text, self._scan()))
+        return self._tokens
+
+    @property
+    def plain_text(self) -> str:
+        """Text with links replaced by their descriptions, see :func:`to_plain_text`."""
+        text = self.text
+        if '[[' not in text:
+            # fast path: no links, nothing to replace
+            return text
+        # NOTE: working with the matches directly rather than tokens, it's much faster
+        parts = []
+        pos = 0
+        for kind, start, end, m in self._scan():
+            parts.append(text[pos:start])
+            if kind == 'link':
+                parts.append(m.group('desc') or m.group('target'))
+            elif kind == 'emphasis' and '[[' in text[start + 1 : end - 1]:
+                marker = text[start]
+                parts.append(marker + to_plain_text(text[start + 1 : end - 1]) + marker)
+            else:
+                parts.append(text[start:end])
+            pos = end
+        parts.append(text[pos:])
+        return ''.join(parts)
+
+    def walk(self) -> Iterator[Token]:
+        """
+        All tokens, including the ones nested in emphasis (apart from verbatim/code).
+        """
+        for t in self.tokens:
+            yield t
+            if isinstance(t, Emphasis) and not t.is_verbatim:
+                yield from t.children.walk()
+
+    @property
+    def links(self) -> list[Link]:
+        return [t for t in self.walk() if isinstance(t, Link)]
+
+    @property
+    def emphasis(self) -> list[Emphasis]:
+        return [t for t in self.walk() if isinstance(t, Emphasis)]
+
+    @property
+    def footnotes(self) -> list[Footnote]:
+        return [t for t in self.walk() if isinstance(t, Footnote)]
+
+    @property
+    def timestamps(self) -> list[Timestamp]:
+        return [t for t in self.walk() if isinstance(t, Timestamp)]
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}({self.text!r})'
+
+
+def tokenize(text: str) -> Iterator[Token]:
+    """
+    Split text into inline markup tokens in a single pass.
+
+    >>> list(tokenize('=code= and [[link]]'))
+    [Emphasis('=code='), Text(' and '), Link('[[link]]')]
+    """
+    return _tokens_from_matches(text, _scan_markup(text))
+
+
+# (kind, start, end, match)
+_Markup = tuple[str, int, int, re.Match]
+
+
+def _unclosed_links(text: str) -> list[int]:
+    """
+    Positions of ``[[`` which don't start a link (and aren't inside of one), in order.
+
+    Whether ``[[`` starts a link only depends on what follows the next ``]``,
+    so the link is only matched once for all ``[[`` before the same ``]``.
+
+    >>> _unclosed_links('[[a]] [[b] [[c')
+    [6, 11]
+    """
+    res = []
+    close = -1
+    pos = text.find('[[')
+    while pos != -1:
+        if pos > close:
+            m = _RE_LINK_FULL.match(text, pos)
+            if m is not None:
+                pos = text.find('[[', m.end())
+                continue
+            close = text.find(']', pos)
+            if close == -1:
+                close = len(text)
+        res.append(pos)
+        pos = text.find('[[', pos + 1)
+    return res
+
+
+def _scan_markup(text: str) -> Iterator[_Markup]:
+    """
+    Markup of the text, in order.
+
+    :data:`RE_INLINE` only matches the opening marker of links and emphasis, the rest is matched separately.
+    If emphasis isn't closed, the other ones with the same marker aren't closed until the end of the line
+    (or a ``[[`` which doesn't start a link) either, so they're skipped without matching them again.
+    ``[[`` which don't start a link are found in one go by :func:`_unclosed_links`,
+    and emphasis is only matched up to the next one of them.
+    This keeps the scan linear even if there are lots of markers which are never closed.
+
+    >>> text = '*a [[b*][c]]* *d *e'
+    >>> [(kind, text[start:end]) for kind, start, end, _ in _scan_markup(text)]
+    [('emphasis', '*a [[b*][c]]*')]
+    """
+    # marker -> position up to which emphasis opened with it isn't closed
+    unclosed: dict[str, int] = {}
+    unclosed_links: Optional[list[int]] = None
+    search = RE_INLINE.search
+    pos = 0
+    while (m := search(text, pos)) is not None:
+        kind = cast(str, m.lastgroup)
+        start = m.start()
+        if kind == 'emphasis':
+            marker = text[start]
+            if unclosed.get(marker, -1) > start:
+                pos = start + 1
+                continue
+            endpos = len(text)
+            if '[[' in text:
+                if unclosed_links is None:
+                    unclosed_links = _unclosed_links(text)
+                i = bisect_left(unclosed_links, start)
+                if i < len(unclosed_links):
+                    # NOTE: + 1, so that the marker before it still sees '[' after it, and not the end of the text
+                    endpos = unclosed_links[i] + 1
+            em = _RE_EMPHASIS.match(text, start, endpos)
+            if em is None:
+                unclosed[marker] = cast(re.Match, _RE_EMPHASIS_SPAN.match(text, start + 1, endpos)).end()
+                pos = start + 1
+                continue
+            m = em
+        elif kind == 'link':
+            if unclosed_links is None:
+                unclosed_links = _unclosed_links(text)
+            i = bisect_left(unclosed_links, start)
+            link = None if i < len(unclosed_links) and unclosed_links[i] == start else _RE_LINK_FULL.match(text, start)
+            if link is None:
+                pos = start + 1
+                continue
+            m = link
+        pos = m.end()
+        yield (kind, start, pos, m)
+
+
+def _tokens_from_matches(text: str, markup: Iterable[_Markup]) -> Iterator[Token]:
+    pos = 0
+    for kind, start, end, m in markup:
+        if start > pos:
+            yield Text(text, pos, start)
+        if kind == 'link':
+            yield Link(text, start, end, m.group('target'), m.group('desc'))
+        elif kind == 'footnote':
+            yield Footnote(text, start, end, m.group('fnlabel'), m.group('fndef'))
+        elif kind == 'timestamp':
+            yield Timestamp(text, start, end)
+        else:
+            yield Emphasis(text, start, end, m.group('marker'))
+        pos = end
+    if pos < len(text):
+        yield Text(text, pos, len(text))
 
 
 def to_plain_text(org_text):
@@ -25,7 +377,7 @@ def to_plain_text(org_text):
     See also: info:org#Link format
 
     """
-    return RE_LINK.sub(lambda m: m.group('desc0') or m.group('desc1'), org_text)
+    return InlineText(org_text).plain_text
 
 
 RE_LINK = re.compile(
@@ -45,3 +397,57 @@ RE_LINK = re.compile(
     """,
     re.VERBOSE,
 )
+
+_TIMESTAMP = r'[<\[] \d{4}-\d{2}-\d{2} [^<>\[\]\n]* [>\]]'
+
+# NOTE: the order of alternatives matters: at the same position links win over footnotes/timestamps
+RE_INLINE = re.compile(
+    rf"""
+    # quickly skip positions which can't start any markup, makes the scan about twice as fast
+    (?= [\[<*/_=~+] )
+    # only the opening brackets, see _scan_markup
+    (?P<link> \[ \[ ) |
+    (?P<footnote>
+        \[fn: (?P<fnlabel> [^\]\[:]*) (?: : (?P<fndef> [^\]\[]*) )? \]
+    ) |
+    (?P<timestamp>
+        {_TIMESTAMP} (?: -- {_TIMESTAMP} )?
+    ) |
+    # only the opening marker, see _scan_markup
+    (?P<emphasis>
+        (?: ^ | (?<= [\s\-({{'"] ) )
+        [*/_=~+]
+        # no whitespace at the start of contents
+        (?! \s )
+    )
+    """,
+    re.VERBOSE | re.MULTILINE,
+)
+
+_RE_LINK_FULL = re.compile(
+    r"""
+    \[ \[ (?P<target> [^\]]+) \]
+    (?: \[ (?P<desc> [^\]]+) \] )?
+    \]
+    """,
+    re.VERBOSE,
+)
+
+# links are consumed as a whole, so that emphasis never ends inside of a link
+_EMPHASIS_TOKEN = r'\[ \[ [^\]]+ \] (?: \[ [^\]]+ \] )? \] | [^\n\[] | \[ (?!\[)'
+
+_RE_EMPHASIS = re.compile(
+    rf"""
+    (?P<marker> [*/_=~+])
+    (?P<contents>
+        # no whitespace at the end of contents
+        (?: {_EMPHASIS_TOKEN} )+? (?<! \s )
+    )
+    (?P=marker)
+    (?= [\s\-.,;:!?')}}"\]] | $ )
+    """,
+    re.VERBOSE | re.MULTILINE,
+)
+
+# contents can't span past the end of this match
+_RE_EMPHASIS_SPAN = re.compile(rf'(?: {_EMPHASIS_TOKEN} )*', re.VERBOSE)
@@ -0,0 +1,349 @@
+"""
+Links between nodes: resolving link targets and finding backlinks.
+
+>>> from orgparse import loads
+>>> root = loads('''
+... * Projects
+...   :PROPERTIES:
+...   :ID: projects
+...   :END:
+... * Today
+...   Went through [[id:projects][projects]], then [[*Ideas]] and [[https://orgmode.org]].
+... * Ideas
+...   :PROPERTIES:
+...   :CUSTOM_ID: ideas
+...   :END:
+...   Also see [[#ideas][this]].
+... ''')
+>>> graph = LinkGraph([root])
+>>> (projects, today, ideas) = root.children
+>>> [(link.target, None if target is None else target.heading) for link, target in graph.links(today)]
+[('id:projects', 'Projects'), ('*Ideas', 'Ideas'), ('https://orgmode.org', None)]
+>>> [(source.heading, link.target) for source, link in graph.backlinks(ideas)]
+[('Today', '*Ideas'), ('Ideas', '#ideas')]
+"""
+
+from __future__ import annotations
+
+import re
+from array import array
+from collections.abc import Iterable
+from pathlib import Path
+from typing import TYPE_CHECKING, NamedTuple, Optional, Union
+
+from .inline import Link
+from .node import OrgBaseNode, OrgNode, OrgRootNode
+
+if TYPE_CHECKING:
+    from .corpus import CorpusChanges, OrgCorpus
+
+# link types (see org-link-parameters) which are never resolved to nodes, e.g. https:, mailto:
+_RE_SCHEME = re.compile(r'[a-zA-Z][\w+-]*:(?!\s)')
+
+
+class Adjacency(NamedTuple):
+    """
+    Compressed sparse row representation of the link graph.
+
+    Links of ``nodes[i]`` go to ``nodes[j]`` for ``j`` in ``targets[offsets[i]:offsets[i + 1]]``.
+    Only resolved links are included, in the same order as in the text.
+    """
+
+    nodes: list[OrgBaseNode]
+    offsets: array
+    targets: array
+
+
+class _FileLinks:
+    """
+    Links of a single document (extracted once), and what they can be resolved to.
+    """
+
+    __slots__ = ('custom_ids', 'depends', 'directory', 'headings', 'ids', 'key', 'links', 'resolved', 'root', 'spans')
+
+    def __init__(self, key: str, root: OrgRootNode) -> None:
+        self.key = key
+        self.root = root
+        # relative file links are resolved against it
+        self.directory = Path(root.env.filename).resolve().parent
+        self.links: list[tuple[OrgBaseNode, Link]] = []
+        self.resolved: list[Optional[OrgBaseNode]] = []
+        # node -> range of its links
+        self.spans: dict[OrgBaseNode, tuple[int, int]] = {}
+        self.ids: dict[str, OrgBaseNode] = {}
+        self.custom_ids: dict[str, OrgBaseNode] = {}
+        self.headings: dict[str, OrgBaseNode] = {}
+        # other documents the links refer to: 'id:...' or 'file:<absolute path>'
+        self.depends: set[str] = set()
+        for node in root:
+            start = len(self.links)
+            if isinstance(node, OrgNode):
+                self.headings.setdefault(node.heading, node)
+                self.links.extend((node, link) for link in node.heading_inline.links)
+            self.links.extend((node, link) for link in node.body_inline.links)
+            if len(self.links) > start:
+                self.spans[node] = (start, len(self.links))
+            props = node._properties
+            if 'ID' in props:
+                self.ids.setdefault(str(props['ID']), node)
+            if 'CUSTOM_ID' in props:
+                self.custom_ids.setdefault(str(props['CUSTOM_ID']), node)
+        for _, link in self.links:
+            dep = self._dependency(link.target)
+            if dep is not None:
+                self.depends.add(dep)
+
+    def _dependency(self, target: str) -> Optional[str]:
+        if target.startswith('id:'):
+            return target
+        path = self._file_path(target)
+        if path is not None and path != self.key:
+            return 'file:' + path
+        return None
+
+    def _file_path(self, target: str) -> Optional[str]:
+        """
+        Absolute path of the file a ``file:`` link (or a plain path) refers to.
+        """
+        if target.startswith('file:'):
+            path = target[len('file:') :].split('::', 1)[0]
+        elif target.startswith(('/', './', '../', '~')):
+            path = target.split('::', 1)[0]
+        else:
+            return None
+        if path == '':
+            return self.key
+        return str((self.directory / Path(path).expanduser()).resolve())
+
+    def find(self, search: str) -> Optional[OrgBaseNode]:
+        """
+        Node in this document for the search part of a link, e.g. ``*Heading``, ``#custom-id`` or ``Heading``.
+        """
+        if search.startswith('#'):
+            return self.custom_ids.get(search[1:])
+        return self.headings.get(search.removeprefix('*'))
+
+
+class LinkGraph:
+    """
+    Links between the nodes of one or more documents, with backlinks.
+
+    Links in headings and bodies are extracted once per document, and resolved through indexes:
+
+    - ``id:...`` links to nodes with the ``:ID:`` property, in any of the documents,
+    - ``#custom-id`` links to nodes with the ``:CUSTOM_ID:`` property, in the same document,
+    - ``*Heading`` and ``Heading`` (fuzzy) links to nodes with that heading, in the same document,
+    - ``file:path``, optionally with a ``::*Heading`` or ``::#custom-id`` search part, to documents in the graph.
+
+    Other links (e.g. ``https:``) are kept, but not resolved.
+
+    When a document changes, :meth:`update` re-extracts its links,
+    and only re-resolves links in other documents which refer to it.
+
+    Documents are identified by the resolved path of their :attr:`orgparse.node.OrgEnv.filename`.
+    Documents which weren't loaded from files (e.g. by :func:`orgparse.loads`, with filenames like ``<string>``)
+    are identified by the root object, unless they're given a name (see :meth:`update`).
+    """
+
+    def __init__(self, roots: Iterable[OrgRootNode] = ()) -> None:
+        """
+        :arg roots: documents, all of them should be different (otherwise :class:`ValueError` is raised).
+        """
+        self._files: dict[str, _FileLinks] = {}
+        # id of the document's env -> its key in _files
+        self._keys: dict[int, str] = {}
+        # ID -> documents defining it
+        self._ids: dict[str, set[str]] = {}
+        # 'id:...' or 'file:...' -> documents with links to it
+        self._dependents: dict[str, set[str]] = {}
+        # node -> (document, index in its links) of the links resolved to it
+        self._incoming: dict[OrgBaseNode, set[tuple[str, int]]] = {}
+        self._adjacency: Optional[tuple[Adjacency, Adjacency]] = None
+        for root in roots:
+            key = _key(root)
+            if key in self._files:
+                raise ValueError(f'Duplicate document {key}')
+            self.update(root)
+
+    @classmethod
+    def from_corpus(cls, corpus: OrgCorpus) -> LinkGraph:
+        """
+        Link graph of all files in the corpus, see :meth:`update_from`.
+        """
+        return cls(corpus.roots.values())
+
+    # updates
+
+    def update(self, root: OrgRootNode, name: Optional[str] = None) -> None:
+        """
+        Add a document, or replace the previous version of it (i.e. the document with the same path or name).
+
+        :arg name: identifies the document instead of its path, e.g. for new versions of documents loaded from strings.
+        """
+        key = _key(root) if name is None else name
+        old = self._files.get(key)
+        if old is not None:
+            self._drop(old)
+        new = _FileLinks(key, root)
+        self._files[key] = new
+        self._keys[id(root.env)] = key
+        for id_ in new.ids:
+            self._ids.setdefault(id_, set()).add(key)
+        for dep in new.depends:
+            self._dependents.setdefault(dep, set()).add(key)
+        self._resolve(new)
+        self._refresh_dependents(key, old, new)
+
+    def remove(self, document: Union[str, OrgRootNode]) -> None:
+        """
+        Remove a document (its nodes become link targets which can't be resolved).
+
+        :arg document: its filename or name (see :meth:`update`), or the root.
+        """
+        if isinstance(document, str):
+            key = document if document in self._files else str(Path(document).resolve())
+        else:
+            key = self._keys.get(id(document.env), '')
+        old = self._files.get(key)
+        if old is None:
+            raise KeyError(document)
+        self._drop(old)
+        del self._files[key]
+        self._refresh_dependents(key, old, None)
+
+    def update_from(self, corpus: OrgCorpus, changes: CorpusChanges) -> None:
+        """
+        Apply changes reported by :meth:`orgparse.corpus.OrgCorpus.refresh`,
+        e.g. ``graph.update_from(corpus, corpus.refresh())``.
+        """
+        for path in changes.removed:
+            self.remove(str(path))
+        roots = corpus.roots
+        for path in changes.added + changes.modified:
+            self.update(roots[path])
+
+    def _drop(self, f: _FileLinks) -> None:
+        self._unresolve(f)
+        del self._keys[id(f.root.env)]
+        for id_ in f.ids:
+            keys = self._ids[id_]
+            keys.discard(f.key)
+            if len(keys) == 0:
+                del self._ids[id_]
+        for dep in f.depends:
+            keys = self._dependents[dep]
+            keys.discard(f.key)
+            if len(keys) == 0:
+                del self._dependents[dep]
+
+    def _refresh_dependents(self, key: str, old: Optional[_FileLinks], new: Optional[_FileLinks]) -> None:
+        # links in other documents which might have been resolved to this one, or should be now
+        provided = {'file:' + key}
+        for f in (old, new):
+            if f is not None:
+                provided.update('id:' + id_ for id_ in f.ids)
+        affected: set[str] = set()
+        for dep in provided:
+            affected.update(self._dependents.get(dep, ()))
+        affected.discard(key)
+        for k in sorted(affected):
+            f = self._files[k]
+            self._unresolve(f)
+            self._resolve(f)
+
+    # resolution
+
+    def _resolve(self, f: _FileLinks) -> None:
+        f.resolved = [self._resolve_link(f, link.target) for _, link in f.links]
+        for i, target in enumerate(f.resolved):
+            if target is not None:
+                self._incoming.setdefault(target, set()).add((f.key, i))
+        self._adjacency = None
+
+    def _unresolve(self, f: _FileLinks) -> None:
+        for i, target in enumerate(f.resolved):
+            if target is None:
+                continue
+            incoming = self._incoming[target]
+            incoming.discard((f.key, i))
+            if len(incoming) == 0:
+                del self._incoming[target]
+        f.resolved = []
+        self._adjacency = None
+
+    def _resolve_link(self, f: _FileLinks, target: str) -> Optional[OrgBaseNode]:
+        if target.startswith('id:'):
+            keys = self._ids.get(target[len('id:') :])
+            if keys is None:
+                return None
+            return self._files[min(keys)].ids[target[len('id:') :]]
+        path = f._file_path(target)
+        if path is not None:
+            other = self._files.get(path)
+            if other is None:
+                return None
+            search = target.split('::', 1)[1] if '::' in target else ''
+            return other.root if search == '' else other.find(search)
+        if _RE_SCHEME.match(target):
+            return None
+        return f.find(target)
+
+    # queries
+
+    def links(self, node: OrgBaseNode) -> list[tuple[Link, Optional[OrgBaseNode]]]:
+        """
+        Links in the heading and body of ``node``, with the nodes they resolve to (or ``None``).
+        """
+        f = self._files[self._keys[id(node.env)]]
+        (start, end) = f.spans.get(node, (0, 0))
+        return [(f.links[i][1], f.resolved[i]) for i in range(start, end)]
+
+    def backlinks(self, node: OrgBaseNode) -> list[tuple[OrgBaseNode, Link]]:
+        """
+        Nodes with links resolved to ``node``, with the links (in document order).
+        """
+        return [self._files[key].links[i] for (key, i) in sorted(self._incoming.get(node, ()))]
+
+    @property
+    def forward(self) -> Adjacency:
+        """Outgoing links of all nodes, computed on first access after changes."""
+        return self._arrays()[0]
+
+    @property
+    def backward(self) -> Adjacency:
+        """Incoming links of all nodes (same numbering of nodes as :attr:`forward`)."""
+        return self._arrays()[1]
+
+    def _arrays(self) -> tuple[Adjacency, Adjacency]:
+        if self._adjacency is not None:
+            return self._adjacency
+        nodes = [node for key in sorted(self._files) for node in self._files[key].root]
+        number = {node: i for i, node in enumerate(nodes)}
+        outgoing: list[list[int]] = [[] for _ in nodes]
+        incoming: list[list[int]] = [[] for _ in nodes]
+        for key in sorted(self._files):
+            f = self._files[key]
+            for (source, _), target in zip(f.links, f.resolved):
+                if target is not None:
+                    (i, j) = (number[source], number[target])
+                    outgoing[i].append(j)
+                    incoming[j].append(i)
+        self._adjacency = (_csr(nodes, outgoing), _csr(nodes, incoming))
+        return self._adjacency
+
+
+def _csr(nodes: list[OrgBaseNode], edges: list[list[int]]) -> Adjacency:
+    offsets = array('l', [0])
+    targets = array('l')
+    for e in edges:
+        targets.extend(e)
+        offsets.append(len(targets))
+    return Adjacency(nodes=nodes, offsets=offsets, targets=targets)
+
+
+def _key(root: OrgRootNode) -> str:
+    filename = root.env.filename
+    if filename.startswith('<') and filename.endswith('>'):
+        # not a file, e.g. '<string>'
+        return f'{filename}@{id(root.env):x}'
+    return str(Path(filename).resolve())
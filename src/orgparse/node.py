@@ -1,26 +1,46 @@
 from __future__ import annotations
 
+import bisect
+import contextlib
+import functools
 import itertools
+import os
 import re
+import sys
+import threading
+from array import array
 from collections.abc import Iterable, Iterator, Sequence
+from datetime import datetime
+from pathlib import Path
 from typing import (
+    IO,
+    TYPE_CHECKING,
     Any,
+    Callable,
     Optional,
     Union,
     cast,
 )
 
 from .date import (
+    _NULL_SDC,
     OrgDate,
     OrgDateClock,
     OrgDateClosed,
     OrgDateDeadline,
     OrgDateRepeatedTask,
     OrgDateScheduled,
+    _LazyRegex,
+    _slots_getstate,
+    _slots_setstate,
     parse_sdc,
 )
-from .extra import Rich, to_rich_text
-from .inline import to_plain_text
+from .profiler import Profiler, StageStats
+
+if TYPE_CHECKING:
+    # NOTE: rich text, inline markup and the writer are imported on first use, to keep 'import orgparse' fast
+    from .extra import Rich
+    from .inline import InlineText
 
 
 def lines_to_chunks(lines: Iterable[str]) -> Iterable[list[str]]:
@@ -36,6 +56,102 @@ def lines_to_chunks(lines: Iterable[str]) -> Iterable[list[str]]:
 RE_NODE_HEADER = re.compile(r"^\*+ ")
 
 
+def text_to_chunks(text: str) -> Iterator[tuple[int, int, int]]:
+    """
+    Same as :func:`lines_to_chunks`, but works on the whole text at once.
+
+    Headings are found with a single regex scan, no per-line work is involved.
+    Yields ``(start, end, linenumber)`` spans: ``text[start:end]`` is the chunk
+    (including the trailing newline), ``linenumber`` is its first line (1-indexed).
+
+    >>> text = 'root\\n* h1\\nbody\\n* h2'
+    >>> [(text[s:e], l) for s, e, l in text_to_chunks(text)]
+    [('root\\n', 1), ('* h1\\nbody\\n', 2), ('* h2', 4)]
+    >>> list(text_to_chunks('* heading at the very start'))
+    [(0, 0, 1), (0, 27, 1)]
+    """
+    start = 0
+    lineno = 1
+    for m in RE_NODE_HEADER_MULTILINE.finditer(text):
+        hstart = m.start()
+        yield (start, hstart, lineno)
+        lineno += text.count('\n', start, hstart)
+        start = hstart
+    yield (start, len(text), lineno)
+
+
+RE_NODE_HEADER_MULTILINE = re.compile(r"^\*+ ", re.MULTILINE)
+
+
+def _bytes_to_chunks(data: bytes) -> Iterator[tuple[int, int, int]]:
+    """
+    Same as :func:`text_to_chunks`, but for UTF-8 encoded text (offsets are in bytes).
+
+    Headings are ASCII, so they can be found without decoding anything.
+    Instead of a multiline regex (which is tried at every offset), lines starting with ``*`` are found with
+    :meth:`bytes.find`, and only those are checked with the regex.
+
+    >>> data = 'rööt\\n* h1\\nbody\\n**not a heading\\n* h2'.encode('utf8')
+    >>> [(data[s:e], l) for s, e, l in _bytes_to_chunks(data)]
+    [(b'r\\xc3\\xb6\\xc3\\xb6t\\n', 1), (b'* h1\\nbody\\n**not a heading\\n', 2), (b'* h2', 5)]
+    >>> list(_bytes_to_chunks(b'* heading at the very start'))
+    [(0, 0, 1), (0, 27, 1)]
+    """
+    match = _RE_NODE_HEADER_BYTES.match
+    start = 0
+    lineno = 1
+    if match(data):
+        yield (0, 0, 1)
+    pos = data.find(b'\n*')
+    while pos != -1:
+        hstart = pos + 1
+        if match(data, hstart):
+            yield (start, hstart, lineno)
+            lineno += data.count(b'\n', start, hstart)
+            start = hstart
+        pos = data.find(b'\n*', hstart)
+    yield (start, len(data), lineno)
+
+
+_RE_NODE_HEADER_BYTES = re.compile(rb"\*+ ")
+
+
+def _bytes_special_comment_lines(data: bytes) -> Iterator[bytes]:
+    """
+    Lines matching ``_RE_SPECIAL_COMMENT_LINE`` in UTF-8 encoded text, found with :meth:`bytes.find` (see :func:`_bytes_to_chunks`).
+
+    >>> list(_bytes_special_comment_lines(b'#+TODO: A\\ntext #+not\\n  #+TITLE: x\\n#+'))
+    [b'#+TODO: A', b'  #+TITLE: x', b'#+']
+    """
+    pos = data.find(b'#+')
+    while pos != -1:
+        line_start = data.rfind(b'\n', 0, pos) + 1
+        if line_start == pos or data[line_start:pos].isspace():
+            line_end = data.find(b'\n', pos)
+            if line_end == -1:
+                line_end = len(data)
+            yield data[line_start:line_end]
+        else:
+            line_end = pos + 1
+        pos = data.find(b'#+', line_end)
+
+
+def _split_chunk(chunk: str) -> list[str]:
+    """
+    Split chunk produced by :func:`text_to_chunks` into lines.
+
+    >>> _split_chunk('* h1\\nbody\\n\\n')
+    ['* h1', 'body', '']
+    >>> _split_chunk('')
+    []
+    """
+    lines = chunk.split('\n')
+    if lines[-1] == '':
+        # trailing newline (or an empty chunk)
+        lines.pop()
+    return lines
+
+
 def parse_heading_level(heading: str) -> tuple[str, int] | None:
     """
     Get star-stripped heading and its level
@@ -84,7 +200,8 @@ def parse_heading_tags(heading: str) -> tuple[str, list[str]]:
     if match:
         heading = match.group(1)
         tagstr = match.group(2)
-        tags = tagstr.split(':')
+        # tags are repeated a lot across the nodes, so intern them
+        tags = list(map(sys.intern, tagstr.split(':')))
     else:
         tags = []
     return (heading, tags)
@@ -94,6 +211,17 @@ def parse_heading_tags(heading: str) -> tuple[str, list[str]]:
 RE_HEADING_TAGS = re.compile(r'(.*?)\s*:([\w@:]+):\s*$')
 
 
+@functools.lru_cache(maxsize=4096)
+def _tagset(tags: tuple[str, ...]) -> frozenset[str]:
+    """
+    Shared frozenset of tags, so that nodes with the same tags don't keep a set each.
+
+    >>> _tagset(('work', 'urgent')) is _tagset(('work', 'urgent'))
+    True
+    """
+    return frozenset(tags)
+
+
 def parse_heading_todos(heading: str, todo_candidates: list[str]) -> tuple[str, Optional[str]]:
     """
     Get TODO keyword and heading without TODO keyword.
@@ -136,6 +264,27 @@ def parse_heading_priority(heading):
 
 RE_HEADING_PRIORITY = re.compile(r'^\s*\[#([A-Z0-9])\] ?(.*)$')
 
+
+def _parse_heading_line(
+    line: str,
+    todo_candidates: list[str],
+) -> tuple[str, Optional[int], frozenset[str], Optional[str], Optional[str]]:
+    """
+    Parse heading line into ``(heading, level, tags, todo, priority)``.
+
+    >>> _parse_heading_line('** TODO [#B] Heading :tag:', ['TODO', 'DONE'])
+    ('Heading', 2, frozenset({'tag'}), 'TODO', 'B')
+    """
+    heading = line
+    level: Optional[int] = None
+    heading_level = parse_heading_level(heading)
+    if heading_level is not None:
+        (heading, level) = heading_level
+    (heading, tags) = parse_heading_tags(heading)
+    (heading, todo) = parse_heading_todos(heading, todo_candidates)
+    (heading, priority) = parse_heading_priority(heading)
+    return (heading, level, _tagset(tuple(tags)), todo, priority)
+
 PropertyValue = Union[str, int, float]
 
 
@@ -153,7 +302,7 @@ def parse_property(line: str) -> tuple[Optional[str], Optional[PropertyValue]]:
     prop_val: Optional[Union[str, int, float]] = None
     match = RE_PROP.search(line)
     if match:
-        prop_key = match.group(1)
+        prop_key = sys.intern(match.group(1))
         prop_val = match.group(2)
         if prop_key == 'Effort':
             prop_val = parse_duration_to_minutes(prop_val)
@@ -161,6 +310,46 @@ def parse_property(line: str) -> tuple[Optional[str], Optional[PropertyValue]]:
 
 
 RE_PROP = re.compile(r'^\s*:(.*?):\s*(.*?)\s*$')
+RE_PROPERTY_KEY = re.compile(r'[^\s:]+\+?')
+RE_HEADING_PREFIX = re.compile(r'\*+\s+')
+
+
+def _indentation(line: str) -> str:
+    return line[: len(line) - len(line.lstrip())]
+
+
+def parse_drawer(line: str) -> Optional[str]:
+    """
+    Get drawer name if the line opens or closes a drawer.
+
+    >>> parse_drawer('  :LOGBOOK:')
+    'LOGBOOK'
+    >>> parse_drawer(':END:')
+    'END'
+    >>> parse_drawer(':Effort: 1:00')  # None, property line
+    >>> parse_drawer('some text')  # None
+
+    """
+    # cheap checks first, this is called for most body lines
+    s = line.strip()
+    if len(s) < 3 or s[0] != ':' or s[-1] != ':':
+        return None
+    name = s[1:-1]
+    if RE_DRAWER_NAME.fullmatch(name) is None:
+        return None
+    return name
+
+
+RE_DRAWER_NAME = re.compile(r'[\w-]+')
+
+
+def _is_drawer_start(line: str) -> bool:
+    name = parse_drawer(line)
+    return name is not None and name.upper() != 'END'
+
+
+def _is_drawer_end(line: str) -> bool:
+    return line.strip().upper() == ':END:'
 
 
 def parse_duration_to_minutes(duration: str) -> Union[float, int]:
@@ -227,18 +416,18 @@ def parse_duration_to_minutes_float(duration: str) -> float:
         return 0.0
     if isinstance(duration, float):
         return float(duration)
-    if RE_ORG_DURATION_H_MM.fullmatch(duration):
+    if _RE_ORG_DURATION_H_MM().fullmatch(duration):
         hours, minutes, *seconds_ = map(float, duration.split(":"))
         seconds = seconds_[0] if seconds_ else 0
         return seconds / 60.0 + minutes + 60 * hours
-    if RE_ORG_DURATION_FULL.fullmatch(duration):
+    if _RE_ORG_DURATION_FULL().fullmatch(duration):
         minutes = 0
-        for match in RE_ORG_DURATION_UNIT.finditer(duration):
+        for match in _RE_ORG_DURATION_UNIT().finditer(duration):
             value = float(match.group(1))
             unit = match.group(2)
             minutes += value * ORG_DURATION_UNITS[unit]
         return float(minutes)
-    match = RE_ORG_DURATION_MIXED.fullmatch(duration)
+    match = _RE_ORG_DURATION_MIXED().fullmatch(duration)
     if match:
         units_part = match.groupdict()['A']
         hms_part = match.groupdict()['B']
@@ -262,26 +451,41 @@ ORG_DURATION_UNITS_RE = r'({})'.format(r'|'.join(ORG_DURATION_UNITS.keys()))
 # Regexp matching a duration expressed with H:MM or H:MM:SS format.
 # Hours can use any number of digits.
 ORG_DURATION_H_MM_RE = r'[ \t]*[0-9]+(?::[0-9]{2}){1,2}[ \t]*'
-RE_ORG_DURATION_H_MM = re.compile(ORG_DURATION_H_MM_RE)
+_RE_ORG_DURATION_H_MM = _LazyRegex(ORG_DURATION_H_MM_RE)
 # Regexp matching a duration with an unit.
 # Allowed units are defined in ORG_DURATION_UNITS.
 # Match group 1 contains the bare number.
 # Match group 2 contains the unit.
 ORG_DURATION_UNIT_RE = r'([0-9]+(?:[.][0-9]*)?)[ \t]*' + ORG_DURATION_UNITS_RE
-RE_ORG_DURATION_UNIT = re.compile(ORG_DURATION_UNIT_RE)
+_RE_ORG_DURATION_UNIT = _LazyRegex(ORG_DURATION_UNIT_RE)
 # Regexp matching a duration expressed with units.
 # Allowed units are defined in ORG_DURATION_UNITS.
 ORG_DURATION_FULL_RE = rf'(?:[ \t]*{ORG_DURATION_UNIT_RE})+[ \t]*'
-RE_ORG_DURATION_FULL = re.compile(ORG_DURATION_FULL_RE)
+_RE_ORG_DURATION_FULL = _LazyRegex(ORG_DURATION_FULL_RE)
 # Regexp matching a duration expressed with units and H:MM or H:MM:SS format.
 # Allowed units are defined in ORG_DURATION_UNITS.
 # Match group A contains units part.
 # Match group B contains H:MM or H:MM:SS part.
 ORG_DURATION_MIXED_RE = rf'(?P<A>([ \t]*{ORG_DURATION_UNIT_RE})+)[ \t]*(?P<B>[0-9]+(?::[0-9][0-9]){{1,2}})[ \t]*'
-RE_ORG_DURATION_MIXED = re.compile(ORG_DURATION_MIXED_RE)
+_RE_ORG_DURATION_MIXED = _LazyRegex(ORG_DURATION_MIXED_RE)
 # Regexp matching float numbers.
 RE_FLOAT = re.compile(r'[0-9]+([.][0-9]*)?')
 
+_LAZY_PATTERNS = {
+    'RE_ORG_DURATION_H_MM': _RE_ORG_DURATION_H_MM,
+    'RE_ORG_DURATION_UNIT': _RE_ORG_DURATION_UNIT,
+    'RE_ORG_DURATION_FULL': _RE_ORG_DURATION_FULL,
+    'RE_ORG_DURATION_MIXED': _RE_ORG_DURATION_MIXED,
+}
+
+
+def __getattr__(name: str) -> re.Pattern[str]:
+    # duration patterns are compiled on first access, see orgparse.date._LazyRegex
+    lazy = _LAZY_PATTERNS.get(name)
+    if lazy is None:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    return lazy()
+
 
 #  -> Optional[Tuple[str, Sequence[str]]]: # todo wtf?? it says 'ABCMeta isn't subscriptable??'
 def parse_comment(line: str):
@@ -295,7 +499,10 @@ def parse_comment(line: str):
     >>> parse_comment('#+FILETAGS: :tag1:tag2:')
     ('FILETAGS', ['tag1', 'tag2'])
     """
-    match = re.match(r'\s*#\+', line)
+    if '#+' not in line:
+        # fast path, most lines aren't special comments
+        return None
+    match = RE_SPECIAL_COMMENT.match(line)
     if match:
         end = match.end(0)
         comment = line[end:].split(':', maxsplit=1)
@@ -311,6 +518,12 @@ def parse_comment(line: str):
     return None
 
 
+RE_SPECIAL_COMMENT = re.compile(r'\s*#\+')
+
+
+_TODO_COMMENT_KEYS = ('TODO', 'SEQ_TODO', 'TYP_TODO')
+
+
 def parse_seq_todo(line):
     """
     Parse value part of SEQ_TODO/TODO/TYP_TODO comment.
@@ -342,9 +555,32 @@ def parse_seq_todo(line):
     )
 
 
+# Shared empty containers, so that nodes without e.g. clocks or properties don't need to allocate their own.
+# These are never modified: parsers always create a new container before adding anything to it.
+class _EmptyDict(dict):
+    __slots__ = ()
+
+    def _readonly(self, *_args, **_kwargs):
+        raise TypeError(f'{type(self).__name__} is read-only')
+
+    __setitem__ = __delitem__ = __ior__ = clear = pop = popitem = setdefault = update = _readonly
+
+    def __reduce__(self) -> str:
+        # unpickle as the shared instance
+        return '_EMPTY_DICT'
+
+
+_EMPTY: Any = ()
+_EMPTY_DICT: Any = _EmptyDict()
+
+
 class OrgEnv:
     """
     Information global to the file (e.g, TODO keywords).
+
+    The environment is updated while its document is parsed, so it shouldn't be shared
+    between documents parsed concurrently (e.g. by :func:`orgparse.load_many`).
+    Parsed trees can be read from multiple threads.
     """
 
     def __init__(
@@ -352,16 +588,51 @@ class OrgEnv:
         todos: Sequence[str] | None = None,
         dones: Sequence[str] | None = None,
         filename: str = '<undefined>',
+        *,
+        timestamps_in_drawers: bool = False,
+        profiler: Optional[Profiler] = None,
+        columnar: bool = False,
     ) -> None:
+        """
+        :arg timestamps_in_drawers:
+            Whether timestamps inside drawers (e.g. notes in ``:LOGBOOK:``)
+            should be reported by :meth:`OrgBaseNode.get_timestamps`.
+            By default drawer contents are skipped.
+        :arg profiler:
+            Collect parsing statistics, see :attr:`parse_stats`.
+        :arg columnar:
+            Keep headings in a compact :class:`NodeStore` instead of
+            creating a node object per heading upfront, see :attr:`store`.
+            Such documents are read-only: modifying or saving them raises :class:`TypeError`.
+        """
         if dones is None:
             dones = ['DONE']
         if todos is None:
             todos = ['TODO']
-        self._todos = list(todos)
-        self._dones = list(dones)
+        # interned, so that TODO keywords of all nodes (across all documents) are the same objects
+        self._todos = list(map(sys.intern, todos))
+        self._dones = list(map(sys.intern, dones))
         self._todo_not_specified_in_comment = True
         self._filename = filename
-        self._nodes: list[OrgBaseNode] = []
+        self._timestamps_in_drawers = timestamps_in_drawers
+        self._profiler = profiler
+        self._columnar = columnar
+        self._store: Optional[NodeStore] = None
+        self._nodes: Sequence[OrgBaseNode] = []
+        # levels of the nodes (root has level 0), used for tree traversal without touching the nodes
+        self._levels: Sequence[int] = []
+        # modified nodes -> their original number of lines, see OrgRootNode.save
+        self._dirty: dict[OrgBaseNode, int] = {}
+        # file the nodes' line numbers refer to (if different from filename, e.g. after saving elsewhere)
+        self._source: Optional[str] = None
+        # identity of the source file when it was loaded (see _file_stat), to tell whether it was changed since
+        self._source_stat: Optional[tuple[int, int, int]] = None
+        # after structural changes: first lines of the nodes in the source (and its number of lines)
+        self._origin: Optional[dict[OrgBaseNode, int]] = None
+        self._source_lines = 0
+        # pending structural changes, see batch
+        self._tree: Optional[_Tree] = None
+        self._batch_depth = 0
 
     @property
     def nodes(self) -> list[OrgBaseNode]:
@@ -383,15 +654,110 @@ class OrgEnv:
          <orgparse.node.OrgNode object at 0x...>]
 
         """
-        return self._nodes
+        if isinstance(self._nodes, list):
+            self._sync()
+            return self._nodes
+        # columnar store: create all nodes
+        return list(self._nodes)
+
+    @property
+    def store(self) -> Optional[NodeStore]:
+        """
+        Columnar heading storage, or ``None`` if the env wasn't created with ``columnar=True``.
+        """
+        return self._store
+
+    @contextlib.contextmanager
+    def batch(self) -> Iterator[None]:
+        """
+        Group structural changes (:meth:`OrgBaseNode.insert_child`, :meth:`OrgNode.remove`,
+        :meth:`OrgNode.move_to`), so that the node order, indices and line numbers are recomputed
+        once on exit instead of after every change.
+
+        >>> from orgparse import loads
+        >>> root = loads('''
+        ... * Inbox
+        ... ** Note 1
+        ... ** Note 2
+        ... * Archive
+        ... ''')
+        >>> (inbox, archive) = root.children
+        >>> with root.env.batch():
+        ...     for note in inbox.children:
+        ...         note.move_to(archive)
+        ...     _ = archive.insert_child('* Note 3')
+        >>> print('\\n'.join(str(n) for n in root[1:]))
+        * Inbox
+        * Archive
+        ** Note 1
+        ** Note 2
+        ** Note 3
+        >>> [n.linenumber for n in root[1:]]
+        [2, 3, 4, 5, 6]
+
+        Navigating the tree (e.g. :attr:`OrgBaseNode.children` or iteration) inside the batch
+        applies the pending changes first, so it's always consistent, but it takes linear time.
+        :attr:`OrgBaseNode.linenumber` is only updated on exit.
+        Batches can be nested, the changes are applied when the outermost one exits
+        (also on exceptions: changes made so far are not rolled back).
+        """
+        self._check_modifiable()
+        self._batch_depth += 1
+        try:
+            yield
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0:
+                self._sync()
+
+    def _check_modifiable(self) -> None:
+        if self._store is not None:
+            raise TypeError(
+                'Documents parsed with columnar=True (e.g. by orgparse.loadb) are read-only, '
+                'load the document without columnar=True to modify it'
+            )
+
+    def _get_tree(self) -> _Tree:
+        """
+        Tree for structural changes, applied to the nodes by :meth:`_sync`.
+        """
+        self._check_modifiable()
+        if self._origin is None:
+            # line numbers are about to change, remember where the nodes are in the source file
+            self._source_lines = _source_line_count(self._nodes, self._dirty)
+            self._origin = {n: n.linenumber for n in self._nodes}
+        if self._tree is None:
+            self._tree = _Tree(self._nodes, self._levels)
+        return self._tree
+
+    def _sync(self) -> None:
+        """
+        Apply pending structural changes: update node order, indices, levels and line numbers in a single pass.
+        """
+        tree = self._tree
+        if tree is None:
+            return
+        self._tree = None
+        nodes = tree.flatten(self._nodes[0])
+        for i, node in enumerate(nodes):
+            node._index = i
+        self._nodes = nodes
+        self._levels = [node.level for node in nodes]
+        self._renumber()
+
+    def _renumber(self) -> None:
+        lineno = 1
+        for node in self._nodes:
+            node.linenumber = lineno
+            lineno += len(node._lines)
 
     def add_todo_keys(self, todos, dones):
         if self._todo_not_specified_in_comment:
             self._todos = []
             self._dones = []
             self._todo_not_specified_in_comment = False
-        self._todos.extend(todos)
-        self._dones.extend(dones)
+        self._todos.extend(map(sys.intern, todos))
+        self._dones.extend(map(sys.intern, dones))
 
     @property
     def todo_keys(self):
@@ -429,6 +795,22 @@ class OrgEnv:
         """
         return self._todos + self._dones
 
+    @property
+    def parse_stats(self) -> Optional[dict[str, StageStats]]:
+        """
+        Per-stage parsing statistics, or ``None`` if parsed without a :class:`orgparse.profiler.Profiler`.
+
+        >>> from orgparse import loads
+        >>> from orgparse.profiler import Profiler
+        >>> root = loads('* Heading', profiler=Profiler())
+        >>> root.env.parse_stats['heading']  # doctest: +ELLIPSIS
+        StageStats(time=..., calls=1, lines=1, regex_calls=...)
+
+        """
+        if self._profiler is None:
+            return None
+        return self._profiler.stages
+
     @property
     def filename(self) -> str:
         """
@@ -507,6 +889,21 @@ class OrgBaseNode(Sequence):
     5
     """
 
+    __slots__ = (
+        '_body_lines',
+        '_index',
+        '_lines',
+        '_properties',
+        '_special_comments',
+        '_text_cache',
+        '_timestamps',
+        'env',
+        'linenumber',
+    )
+
+    __getstate__ = _slots_getstate
+    __setstate__ = _slots_setstate
+
     _body_lines: list[str]  # set by the child classes
 
     def __init__(self, env: OrgEnv, index: int | None = None) -> None:
@@ -515,10 +912,14 @@ class OrgBaseNode(Sequence):
         self.linenumber = cast(int, None)  # set in parse_lines
 
         # content
-        self._lines: list[str] = []
+        self._lines: list[str] = _EMPTY
+        self._special_comments: dict[str, list[str]] = _EMPTY_DICT
 
-        self._properties: dict[str, PropertyValue] = {}
-        self._timestamps: list[OrgDate] = []
+        self._properties: dict[str, PropertyValue] = _EMPTY_DICT
+        self._timestamps: list[OrgDate] = _EMPTY
+
+        # memoised heading/body text, see _cached_text
+        self._text_cache: Optional[dict[tuple[str, str], Any]] = None
 
         # FIXME: use `index` argument to set index.  (Currently it is
         # done externally in `parse_lines`.)
@@ -538,12 +939,14 @@ class OrgBaseNode(Sequence):
 
     def __iter__(self):
         yield self
-        level = self.level
-        for node in self.env._nodes[self._index + 1 :]:
-            if node.level > level:
-                yield node
-            else:
+        self.env._sync()
+        nodes = self.env._nodes
+        levels = self.env._levels
+        level = levels[self._index]
+        for i in range(self._index + 1, len(levels)):
+            if levels[i] <= level:
                 break
+            yield nodes[i]
 
     def __len__(self) -> int:
         return sum(1 for _ in self)
@@ -568,12 +971,14 @@ class OrgBaseNode(Sequence):
 
     # tree structure
 
-    def _find_same_level(self, iterable) -> OrgBaseNode | None:
-        for node in iterable:
-            if node.level < self.level:
+    def _find_same_level(self, indices: Iterable[int]) -> OrgBaseNode | None:
+        levels = self.env._levels
+        level = levels[self._index]
+        for i in indices:
+            if levels[i] < level:
                 return None
-            if node.level == self.level:
-                return node
+            if levels[i] == level:
+                return self.env._nodes[i]
         return None
 
     @property
@@ -596,7 +1001,8 @@ class OrgBaseNode(Sequence):
         True
 
         """
-        return self._find_same_level(reversed(self.env._nodes[: self._index]))
+        self.env._sync()
+        return self._find_same_level(range(self._index - 1, -1, -1))
 
     @property
     def next_same_level(self) -> OrgBaseNode | None:
@@ -618,13 +1024,17 @@ class OrgBaseNode(Sequence):
         True
 
         """
-        return self._find_same_level(self.env._nodes[self._index + 1 :])
+        self.env._sync()
+        return self._find_same_level(range(self._index + 1, len(self.env._levels)))
 
     # FIXME: cache parent node
     def _find_parent(self):
-        for node in reversed(self.env._nodes[: self._index]):
-            if node.level < self.level:
-                return node
+        self.env._sync()
+        levels = self.env._levels
+        level = levels[self._index]
+        for i in range(self._index - 1, -1, -1):
+            if levels[i] < level:
+                return self.env._nodes[i]
         return None
 
     def get_parent(self, max_level: int | None = None):
@@ -713,21 +1123,10 @@ class OrgBaseNode(Sequence):
 
     # FIXME: cache children nodes
     def _find_children(self):
-        nodeiter = iter(self.env._nodes[self._index + 1 :])
-        try:
-            node = next(nodeiter)
-        except StopIteration:
-            return
-        if node.level <= self.level:
-            return
-        yield node
-        last_child_level = node.level
-        for node in nodeiter:
-            if node.level <= self.level:
-                return
-            if node.level <= last_child_level:
-                yield node
-                last_child_level = node.level
+        self.env._sync()
+        nodes = self.env._nodes
+        for i in _children_indices(self.env._levels, self._index):
+            yield nodes[i]
 
     @property
     def children(self):
@@ -781,6 +1180,9 @@ class OrgBaseNode(Sequence):
         """
         Node properties as a dictionary.
 
+        For nodes without properties it's a new empty dictionary every time,
+        use :meth:`set_property` to add them.
+
         >>> from orgparse import loads
         >>> root = loads('''
         ... * Node
@@ -792,6 +1194,9 @@ class OrgBaseNode(Sequence):
         'value'
 
         """
+        if self._properties is _EMPTY_DICT:
+            # NOTE: not stored on the node, so that reading properties of all nodes doesn't allocate a dict for each
+            return {}
         return self._properties
 
     def get_property(self, key, val=None) -> Optional[PropertyValue]:
@@ -807,16 +1212,177 @@ class OrgBaseNode(Sequence):
         """
         return self._properties.get(key, val)
 
+    # modification
+
+    def set_property(self, key: str, value: PropertyValue) -> None:
+        """
+        Set property ``key`` to ``value``, adding a ``:PROPERTIES:`` drawer if necessary.
+
+        Like other modifications, this is written out by :meth:`OrgRootNode.save`.
+
+        >>> from orgparse import loads
+        >>> root = loads('''
+        ... * Node
+        ...   SCHEDULED: <2012-02-26 Sun>
+        ...   body
+        ... ''')
+        >>> node = root.children[0]
+        >>> node.set_property('Effort', '1:30')
+        >>> node.get_property('Effort')
+        90
+        >>> print(node)
+        * Node
+          SCHEDULED: <2012-02-26 Sun>
+          :PROPERTIES:
+          :Effort: 1:30
+          :END:
+          body
+        """
+        value_str = str(value)
+        if not key or RE_PROPERTY_KEY.fullmatch(key) is None:
+            raise ValueError(f'Invalid property name: {key!r}')
+        if '\n' in value_str:
+            raise ValueError(f'Property value must be a single line: {value_str!r}')
+        # NOTE: validate the value (e.g. Effort should be a duration) before changing anything
+        parse_property(f':{key}: {value_str}')
+        lines = self._modify_lines()
+        drawer = self._find_properties_drawer()
+        if drawer is None:
+            pos = self._meta_end()
+            indent = self._body_indent()
+            lines[pos:pos] = [f'{indent}:PROPERTIES:', f'{indent}:{key}: {value_str}', f'{indent}:END:']
+        else:
+            (start, end) = drawer
+            for i in range(start + 1, end):
+                if parse_property(lines[i])[0] == key:
+                    lines[i] = f'{_indentation(lines[i])}:{key}: {value_str}'
+                    break
+            else:
+                lines.insert(end, f'{_indentation(lines[start])}:{key}: {value_str}')
+        self._reparse()
+
+    def insert_child(self, text: str, position: Optional[int] = None) -> OrgNode:
+        """
+        Parse ``text`` (a heading with its subtree) and insert it as a child of this node.
+
+        The headings are shifted to the level of the children.
+        See :meth:`OrgEnv.batch` for inserting many nodes at once.
+
+        :arg position: index in :attr:`children` to insert at (same as :meth:`list.insert`), at the end by default.
+        :returns: the inserted node.
+
+        >>> from orgparse import loads
+        >>> root = loads('''
+        ... * Projects
+        ... ** Garden
+        ... ''')
+        >>> projects = root.children[0]
+        >>> node = projects.insert_child('* TODO Kitchen\\n  body\\n** Paint walls', position=0)
+        >>> (node.todo, node.level, node.linenumber)
+        ('TODO', 2, 3)
+        >>> print('\\n'.join(str(n) for n in projects))
+        * Projects
+        ** TODO Kitchen
+          body
+        *** Paint walls
+        ** Garden
+        """
+        env = self.env
+        new = _parse_subtree(env, text)
+        with env.batch():
+            tree = env._get_tree()
+            if not tree.contains(self):
+                raise ValueError('Node was removed from the document')
+            tree.add(new)
+            tree.insert(self, new[0], position)
+        return new[0]
+
+    def _find_properties_drawer(self) -> Optional[tuple[int, int]]:
+        """
+        Indices of the ``:PROPERTIES:`` and ``:END:`` lines (same as the parser finds them).
+        """
+        lines = self._lines
+        for start in range(self._meta_end(), len(lines)):
+            if lines[start].find(':PROPERTIES:') >= 0:
+                for end in range(start + 1, len(lines)):
+                    if lines[end].find(':END:') >= 0:
+                        return (start, end)
+                return (start, len(lines))
+        return None
+
+    def _meta_end(self) -> int:
+        """
+        Index of the first line after the heading and the planning line.
+        """
+        return 0
+
+    def _body_indent(self) -> str:
+        """
+        Indentation for the new lines, same as of the first non-blank line after the heading.
+        """
+        for line in itertools.islice(self._lines, self._meta_end() if self.is_root() else 1, None):
+            if line.strip():
+                return _indentation(line)
+        return ''
+
+    def _modify_lines(self) -> list[str]:
+        """
+        Mark the node as modified, and return its lines for in-place changes.
+
+        Call :meth:`_reparse` after changing them.
+        """
+        env = self.env
+        env._check_modifiable()
+        if self not in env._dirty:
+            env._dirty[self] = len(self._lines)
+        if not isinstance(self._lines, list):
+            self._lines = list(self._lines)
+        self._invalidate_text()
+        return self._lines
+
+    def _reparse(self) -> None:
+        """
+        Parse the changed lines of the node again, so that everything derived from them (body, clocks, etc.) is up to date.
+        """
+        self._properties = _EMPTY_DICT
+        _assign_timestamps([self], ['\n'.join(self._parse_pre())])
+        self._invalidate_text()
+
     # parser
 
     @classmethod
-    def from_chunk(cls, env, lines):
+    def from_chunk(cls, env, lines, *, add_todo_keys: bool = True):
         self = cls(env)
         self._lines = lines
-        self._parse_comments()
+        self._parse_comments(add_todo_keys=add_todo_keys)
         return self
 
-    def _parse_comments(self):
+    def _parse_pre(self, profiler: Optional[Profiler] = None) -> list[str]:
+        """
+        Call parsers which must be called before tree structuring
+
+        Returns lines which should be searched for timestamps.
+        """
+        raise NotImplementedError
+
+    def _run_stages(
+        self,
+        ilines: Iterator[str],
+        stages: Sequence[tuple[str, Callable[[Iterator[str]], Iterator[str]]]],
+        profiler: Optional[Profiler],
+    ) -> list[str]:
+        """
+        Chain ``_iparse_*`` parsers and return the remaining (body) lines.
+
+        With a profiler, time spent in each stage is recorded separately.
+        """
+        if profiler is not None:
+            return list(profiler.chain(stages, ilines))
+        for _, stage in stages:
+            ilines = stage(ilines)
+        return list(ilines)
+
+    def _parse_comments(self, *, add_todo_keys: bool = True) -> None:
         special_comments: dict[str, list[str]] = {}
         for line in self._lines:
             parsed = parse_comment(line)
@@ -824,14 +1390,16 @@ class OrgBaseNode(Sequence):
                 (key, vals) = parsed
                 key = key.upper()  # case insensitive, so keep as uppercase
                 special_comments.setdefault(key, []).extend(vals)
-        self._special_comments = special_comments
+        self._special_comments = special_comments or _EMPTY_DICT
+        if not add_todo_keys:
+            return
         # parse TODO keys and store in OrgEnv
-        for todokey in ['TODO', 'SEQ_TODO', 'TYP_TODO']:
+        for todokey in _TODO_COMMENT_KEYS:
             for val in special_comments.get(todokey, []):
                 self.env.add_todo_keys(*parse_seq_todo(val))
 
     def _iparse_properties(self, ilines: Iterator[str]) -> Iterator[str]:
-        self._properties = {}
+        properties: dict[str, PropertyValue] = {}
         in_property_field = False
         for line in ilines:
             if in_property_field:
@@ -840,14 +1408,37 @@ class OrgBaseNode(Sequence):
                 else:
                     (key, val) = parse_property(line)
                     if key is not None and val is not None:
-                        self._properties.update({key: val})
+                        properties.update({key: val})
             elif line.find(":PROPERTIES:") >= 0:
                 in_property_field = True
+                self._properties = properties
             else:
                 yield line
         for line in ilines:
             yield line
 
+    def _iparse_timestamps(self, ilines: Iterator[str], scan: list[str]) -> Iterator[str]:
+        """
+        Collect lines which should be searched for timestamps into ``scan``.
+
+        The search itself happens later, in one pass over the whole document (see :func:`parse_lines`).
+        """
+        skip_drawers = not self.env._timestamps_in_drawers
+        for line in ilines:
+            yield line
+            if skip_drawers and _is_drawer_start(line):
+                drawer: list[str] = []
+                for dline in ilines:
+                    yield dline
+                    if _is_drawer_end(dline):
+                        break
+                    drawer.append(dline)
+                else:
+                    # no :END:, so not really a drawer
+                    scan.extend(drawer)
+                continue
+            scan.append(line)
+
     # misc
 
     @property
@@ -901,14 +1492,58 @@ class OrgBaseNode(Sequence):
     @staticmethod
     def _get_text(text, format: str = 'plain'):  # noqa: A002
         if format == 'plain':
+            from .inline import to_plain_text  # noqa: PLC0415
+
             return to_plain_text(text)
         elif format == 'raw':
             return text
         elif format == 'rich':
+            from .extra import to_rich_text  # noqa: PLC0415
+
             return to_rich_text(text)
         else:
             raise ValueError(f'format={format} is not supported.')
 
+    def _cached_text(self, part: str, format: str):  # noqa: A002
+        """
+        Text of the heading or body (``part``) in the given format, memoised per node.
+        """
+        if format == 'rich':
+            # rich text is an iterator, so can't be reused
+            return self._get_text(self._raw_text(part), format)
+        key = (part, format)
+        cache = self._text_cache
+        if cache is None:
+            cache = self._text_cache = {}
+        else:
+            text = cache.get(key)
+            if text is not None:
+                return text
+        if format == 'raw':
+            text = self._raw_text(part)
+        elif format == 'inline':
+            from .inline import InlineText  # noqa: PLC0415
+
+            text = InlineText(self._cached_text(part, 'raw'))
+        elif format == 'plain':
+            # share the inline markup scan with the other inline accessors
+            text = self._cached_text(part, 'inline').plain_text
+        else:
+            text = self._get_text(self._cached_text(part, 'raw'), format)
+        cache[key] = text
+        return text
+
+    def _raw_text(self, part: str) -> str:
+        if part == 'body':
+            return '\n'.join(self._body_lines) if self._lines else ''
+        raise ValueError(part)
+
+    def _invalidate_text(self) -> None:
+        """
+        Must be called whenever heading or body of the node changes.
+        """
+        self._text_cache = None
+
     def get_body(self, format: str = 'plain') -> str:  # noqa: A002
         """
         Return a string of body text.
@@ -916,7 +1551,7 @@ class OrgBaseNode(Sequence):
         See also: :meth:`get_heading`.
 
         """
-        return self._get_text('\n'.join(self._body_lines), format) if self._lines else ''
+        return self._cached_text('body', format)
 
     @property
     def body(self) -> str:
@@ -926,7 +1561,25 @@ class OrgBaseNode(Sequence):
     @property
     def body_rich(self) -> Iterator[Rich]:
         r = self.get_body(format='rich')
-        return cast(Iterator[Rich], r)  # meh..
+        return cast('Iterator[Rich]', r)  # meh..
+
+    @property
+    def body_inline(self) -> InlineText:
+        """
+        Inline markup (links, emphasis, footnotes, timestamps) of the body.
+
+        >>> from orgparse import loads
+        >>> node = loads('''
+        ... * Node
+        ...   See [[https://orgmode.org][Org]] and *this*.
+        ... ''').children[0]
+        >>> [link.target for link in node.body_inline.links]
+        ['https://orgmode.org']
+        >>> [em.contents for em in node.body_inline.emphasis]
+        ['this']
+
+        """
+        return self._cached_text('body', 'inline')
 
     @property
     def heading(self) -> str:
@@ -1077,6 +1730,96 @@ class OrgBaseNode(Sequence):
         else:
             raise RuntimeError(f'Multiple values for property {property}: {vals}')
 
+    def memory_usage(self, *, deep: bool = True, by: str = 'field') -> dict[Any, int]:
+        """
+        Estimate memory (in bytes) used by this node and its descendants.
+
+        :arg deep:
+            If true, include objects referenced by the node attributes (strings, dates, etc.),
+            otherwise only count the attribute values themselves (e.g. list objects, but not their items).
+            Objects shared between several attributes or nodes are counted once,
+            under the first attribute they are found in.
+        :arg by:
+            How to group the result:
+            ``'field'`` -- by node attribute name (the node objects themselves are under ``'<object>'``),
+            ``'level'`` -- by node level,
+            ``'node'`` -- by node index in :attr:`OrgEnv.nodes`.
+
+        >>> from orgparse import loads
+        >>> root = loads('''
+        ... * Heading
+        ...   CLOCK: [2012-02-26 Sun 21:10]--[2012-02-26 Sun 21:15] =>  0:05
+        ...   body
+        ... ** Child
+        ... ''')
+        >>> usage = root.memory_usage()
+        >>> usage['_lines'] > 0 and usage['_clocklist'] > 0
+        True
+        >>> sorted(root.memory_usage(by='level'))
+        [0, 1, 2]
+        >>> sorted(root.children[0].memory_usage(by='node'))
+        [1, 2]
+
+        """
+        if by not in ('field', 'level', 'node'):
+            raise ValueError(f"by should be one of 'field', 'level', 'node', got {by!r}")
+        seen: set[int] = set()
+        usage: dict[Any, int] = {}
+        for node in self:
+            size = sys.getsizeof(node)
+            d = getattr(node, '__dict__', None)
+            if d is not None:
+                size += sys.getsizeof(d)
+            key = '<object>' if by == 'field' else node.level if by == 'level' else node._index
+            usage[key] = usage.get(key, 0) + size
+            for field, value in node._memory_fields():
+                size = _deep_sizeof(value, seen) if deep else sys.getsizeof(value)
+                key = field if by == 'field' else node.level if by == 'level' else node._index
+                usage[key] = usage.get(key, 0) + size
+        return usage
+
+    def _memory_fields(self) -> Iterator[tuple[str, Any]]:
+        d = getattr(self, '__dict__', None)
+        if d is not None:
+            for field, value in d.items():
+                if field != 'env':
+                    yield (field, value)
+        fields = [f for cls in type(self).__mro__ for f in cls.__dict__.get('__slots__', ())]
+        # body lines are shared with _lines, so make sure they are accounted for under _lines
+        fields.sort(key=lambda f: f != '_lines')
+        for field in fields:
+            if field not in ('env', '__dict__', '__weakref__') and hasattr(self, field):
+                yield (field, getattr(self, field))
+
+
+def _deep_sizeof(obj: Any, seen: set[int]) -> int:
+    """
+    Size of the object and everything reachable from it (apart from nodes/env), counting each object once.
+    """
+    stack = [obj]
+    total = 0
+    while stack:
+        o = stack.pop()
+        if id(o) in seen or isinstance(o, (OrgBaseNode, OrgEnv, type)):
+            continue
+        seen.add(id(o))
+        total += sys.getsizeof(o)
+        if isinstance(o, (str, bytes, int, float)):
+            continue
+        if isinstance(o, dict):
+            stack.extend(o.keys())
+            stack.extend(o.values())
+        elif isinstance(o, (list, tuple, set, frozenset)):
+            stack.extend(o)
+        d = getattr(o, '__dict__', None)
+        if d is not None:
+            stack.append(d)
+        for cls in type(o).__mro__:
+            for field in cls.__dict__.get('__slots__', ()):
+                if field not in ('__dict__', '__weakref__') and hasattr(o, field):
+                    stack.append(getattr(o, field))
+    return total
+
 
 class OrgRootNode(OrgBaseNode):
     """
@@ -1086,6 +1829,8 @@ class OrgRootNode(OrgBaseNode):
     See :class:`OrgBaseNode` for other available functions.
     """
 
+    __slots__ = ()
+
     @property
     def heading(self) -> str:
         return ''
@@ -1104,20 +1849,79 @@ class OrgRootNode(OrgBaseNode):
     def is_root(self) -> bool:
         return True
 
+    def save(self, path: Optional[Union[str, Path]] = None) -> None:
+        """
+        Write the document to ``path`` (by default, to the file it was loaded from).
+
+        Only the nodes changed with :meth:`set_property`, :meth:`OrgNode.set_todo`, :meth:`OrgNode.add_clock`
+        (or inserted and shifted to another level by :meth:`insert_child`, :meth:`OrgNode.move_to`)
+        are serialized, the rest of the document is copied from the original file as is
+        (with :func:`os.sendfile` where supported), so saving a small change to a large file is cheap.
+        If the original file was changed since it was loaded (i.e. its size, modification time or inode changed),
+        or the document wasn't loaded from a file, the whole document is serialized instead.
+        The file is replaced atomically.
+
+        >>> import tempfile
+        >>> from pathlib import Path
+        >>> from orgparse import load
+        >>> with tempfile.TemporaryDirectory() as tmp:
+        ...     path = Path(tmp) / 'tasks.org'
+        ...     _ = path.write_text('* TODO Task\\n* TODO Another task\\n')
+        ...     root = load(path)
+        ...     root.children[1].set_todo('DONE')
+        ...     root.save()
+        ...     print(path.read_text(), end='')
+        * TODO Task
+        * DONE Another task
+        """
+        env = self.env
+        env._check_modifiable()
+        source = Path(env._source if env._source is not None else env.filename)
+        if path is None:
+            if not source.is_file():
+                raise ValueError(f'Document was not loaded from a file ({env.filename}), path is required')
+            path = source
+        target = Path(path)
+        env._sync()
+        nodes = env._nodes
+        (dirty, origin) = (env._dirty, env._origin)
+        spans: list[Optional[tuple[int, int]]] = []
+        for n in nodes:
+            start = n.linenumber if origin is None else origin.get(n)
+            spans.append(None if start is None or n in dirty else (start, len(n._lines)))
+        from .writer import write_document  # noqa: PLC0415
+
+        write_document(
+            target,
+            [n._lines for n in nodes],
+            source=source,
+            spans=spans,
+            source_lines=_source_line_count(nodes, dirty) if origin is None else env._source_lines,
+            source_stat=env._source_stat,
+        )
+        env._source_stat = _file_stat(target)
+        # line numbers now refer to the saved file
+        if len(dirty) > 0 or origin is not None:
+            env._renumber()
+        env._dirty = {}
+        env._origin = None
+        env._source = str(target)
+
     # parsers
 
-    def _parse_pre(self):
-        """Call parsers which must be called before tree structuring"""
-        ilines: Iterator[str] = iter(self._lines)
-        ilines = self._iparse_properties(ilines)
-        ilines = self._iparse_timestamps(ilines)
-        self._body_lines = list(ilines)
+    def _parse_pre(self, profiler: Optional[Profiler] = None) -> list[str]:
+        """
+        Call parsers which must be called before tree structuring
 
-    def _iparse_timestamps(self, ilines: Iterator[str]) -> Iterator[str]:
-        self._timestamps = []
-        for line in ilines:
-            self._timestamps.extend(OrgDate.list_from_str(line))
-            yield line
+        Returns lines which should be searched for timestamps.
+        """
+        scan: list[str] = []
+        stages = (
+            ('properties', self._iparse_properties),
+            ('timestamps', lambda ilines: self._iparse_timestamps(ilines, scan)),
+        )
+        self._body_lines = self._run_stages(iter(self._lines), stages, profiler) or _EMPTY
+        return scan
 
 
 class OrgNode(OrgBaseNode):
@@ -1128,47 +1932,228 @@ class OrgNode(OrgBaseNode):
 
     """
 
+    __slots__ = (
+        '_clocklist',
+        '_closed',
+        '_deadline',
+        '_heading',
+        '_level',
+        '_priority',
+        '_repeated_tasks',
+        '_scheduled',
+        '_tags',
+        '_todo',
+    )
+
     def __init__(self, *args, **kwds) -> None:
         super().__init__(*args, **kwds)
         # fixme instead of casts, should organize code in such a way that they aren't necessary
         self._heading = cast(str, None)
         self._level: int | None = None
-        self._tags = cast(list[str], None)
+        self._tags: frozenset[str] = frozenset()
         self._todo: Optional[str] = None
-        self._priority = None
-        self._scheduled = OrgDateScheduled(None)
-        self._deadline = OrgDateDeadline(None)
-        self._closed = OrgDateClosed(None)
-        self._clocklist: list[OrgDateClock] = []
-        self._body_lines: list[str] = []
-        self._repeated_tasks: list[OrgDateRepeatedTask] = []
+        self._priority: Optional[str] = None
+        self._scheduled: OrgDateScheduled
+        self._deadline: OrgDateDeadline
+        self._closed: OrgDateClosed
+        (self._scheduled, self._deadline, self._closed) = _NULL_SDC
+        self._clocklist: list[OrgDateClock] = _EMPTY
+        self._body_lines: list[str] = _EMPTY
+        self._repeated_tasks: list[OrgDateRepeatedTask] = _EMPTY
+
+    # modification
+
+    def set_todo(self, todo: Optional[str]) -> None:
+        """
+        Change the TODO keyword of the heading (``None`` to remove it).
+
+        >>> from orgparse import loads
+        >>> node = loads('* TODO [#A] Heading :tag:').children[0]
+        >>> node.set_todo('DONE')
+        >>> print(node)
+        * DONE [#A] Heading :tag:
+        >>> node.set_todo(None)
+        >>> (node.todo, str(node))
+        (None, '* [#A] Heading :tag:')
+        """
+        if todo is not None and todo not in self.env.all_todo_keys:
+            raise ValueError(f'Unknown TODO keyword {todo!r}, expected one of {self.env.all_todo_keys}')
+        lines = self._modify_lines()
+        line = lines[0]
+        m = RE_HEADING_PREFIX.match(line)
+        assert m is not None, line
+        rest = line[m.end() :]
+        if self._todo is not None:
+            assert rest.startswith(self._todo), (rest, self._todo)
+            rest = rest[len(self._todo) :]
+            rest = rest.removeprefix(' ')
+        if todo is not None:
+            rest = f'{todo} {rest}' if rest else todo
+        lines[0] = m.group(0) + rest
+        self._reparse()
+
+    def add_clock(self, start: datetime, end: Optional[datetime] = None) -> OrgDateClock:
+        """
+        Add a CLOCK entry into the ``:LOGBOOK:`` drawer (created if necessary).
+
+        Without ``end``, the clock is left running.
+
+        >>> from datetime import datetime
+        >>> from orgparse import loads
+        >>> node = loads('* Heading').children[0]
+        >>> node.add_clock(datetime(2012, 2, 26, 21, 10), datetime(2012, 2, 26, 22, 15))
+        OrgDateClock((2012, 2, 26, 21, 10, 0), (2012, 2, 26, 22, 15, 0))
+        >>> print(node)
+        * Heading
+        :LOGBOOK:
+        CLOCK: [2012-02-26 Sun 21:10]--[2012-02-26 Sun 22:15] =>  1:05
+        :END:
+        """
+        if end is None:
+            clock = OrgDateClock(start)
+            entry = f'CLOCK: {clock}'
+        else:
+            minutes = int((end - start).total_seconds() // 60)
+            if minutes < 0:
+                raise ValueError(f'Clock ends before it starts: {start} > {end}')
+            clock = OrgDateClock(start, end, minutes)
+            entry = f'CLOCK: {clock} => {minutes // 60:2d}:{minutes % 60:02d}'
+        lines = self._modify_lines()
+        for i in range(self._meta_end(), len(lines)):
+            if (parse_drawer(lines[i]) or '').upper() == 'LOGBOOK':
+                # org puts the most recent entries first
+                lines.insert(i + 1, _indentation(lines[i]) + entry)
+                break
+        else:
+            properties = self._find_properties_drawer()
+            pos = self._meta_end() if properties is None else properties[1] + 1
+            indent = self._body_indent()
+            lines[pos:pos] = [f'{indent}:LOGBOOK:', indent + entry, f'{indent}:END:']
+        self._reparse()
+        return clock
+
+    def remove(self) -> None:
+        """
+        Remove the node with its subtree from the document.
+
+        The removed nodes shouldn't be used afterwards.
+        See :meth:`OrgEnv.batch` for removing many nodes at once.
+
+        >>> from orgparse import loads
+        >>> root = loads('''
+        ... * Node 1
+        ... ** Node 2
+        ... * Node 3
+        ... ''')
+        >>> root.children[0].remove()
+        >>> [(n.heading, n.linenumber) for n in root[1:]]
+        [('Node 3', 2)]
+        """
+        with self.env.batch():
+            tree = self.env._get_tree()
+            if self not in tree.parents:
+                raise ValueError('Node was already removed from the document')
+            tree.detach(self)
+
+    def move_to(self, parent: OrgBaseNode, position: Optional[int] = None) -> None:
+        """
+        Move the node with its subtree under ``parent``.
+
+        The headings are shifted to the level of the new siblings.
+        See :meth:`OrgEnv.batch` for moving many nodes at once.
+
+        :arg position: index in ``parent.children`` to move to (same as :meth:`list.insert`), at the end by default.
+
+        >>> from orgparse import loads
+        >>> root = loads('''
+        ... * Node 1
+        ... ** Node 2
+        ... *** Node 3
+        ... * Node 4
+        ... ''')
+        >>> (n1, n2, n3, n4) = root[1:]
+        >>> n2.move_to(n4)
+        >>> n3.move_to(root, position=0)
+        >>> print('\\n'.join(str(n) for n in root[1:]))
+        * Node 3
+        * Node 1
+        * Node 4
+        ** Node 2
+        """
+        env = self.env
+        if parent.env is not env:
+            raise ValueError('Cannot move a node to another document')
+        with env.batch():
+            tree = env._get_tree()
+            if self not in tree.parents or not tree.contains(parent):
+                raise ValueError('Node was removed from the document')
+            ancestor: Optional[OrgBaseNode] = parent
+            while ancestor is not None:
+                if ancestor is self:
+                    raise ValueError('Cannot move a node into its own subtree')
+                ancestor = tree.parents.get(ancestor)
+            tree.detach(self)
+            tree.insert(parent, self, position)
+
+    def _relevel(self, tree: _Tree, level: int) -> None:
+        """
+        Change level of the node and its subtree (rewriting the heading stars).
+        """
+        delta = level - self.level
+        if delta == 0:
+            return
+        stack: list[OrgNode] = [self]
+        while len(stack) > 0:
+            node = stack.pop()
+            old = node.level
+            lines = node._modify_lines()
+            lines[0] = '*' * (old + delta) + lines[0][old:]
+            node._level = old + delta
+            stack.extend(cast(list[OrgNode], tree.children.get(node, ())))
+
+    def _meta_end(self) -> int:
+        has_planning = len(self._lines) > 1 and bool(self._scheduled or self._deadline or self._closed)
+        return 2 if has_planning else 1
 
     # parser
 
-    def _parse_pre(self):
-        """Call parsers which must be called before tree structuring"""
-        self._parse_heading()
+    def _parse_pre(self, profiler: Optional[Profiler] = None) -> list[str]:
+        """
+        Call parsers which must be called before tree structuring
+
+        Returns lines which should be searched for timestamps.
+        """
+        if profiler is None:
+            self._parse_heading()
+        else:
+            profiler.call('heading', 1, self._parse_heading)
+        scan: list[str] = []
         # FIXME: make the following parsers "lazy"
         ilines: Iterator[str] = iter(self._lines)
         try:
             next(ilines)  # skip heading
         except StopIteration:
-            return
-        ilines = self._iparse_sdc(ilines)
-        ilines = self._iparse_clock(ilines)
-        ilines = self._iparse_properties(ilines)
-        ilines = self._iparse_repeated_tasks(ilines)
-        ilines = self._iparse_timestamps(ilines)
-        self._body_lines = list(ilines)
+            return scan
+        stages = (
+            ('sdc', self._iparse_sdc),
+            ('logbook', self._iparse_logbook),
+            ('properties', self._iparse_properties),
+            ('repeated_tasks', self._iparse_repeated_tasks),
+            ('timestamps', lambda ilines: self._iparse_timestamps(ilines, scan)),
+        )
+        self._body_lines = self._run_stages(ilines, stages, profiler) or _EMPTY
+        # don't keep empty lists allocated by the parsers around
+        if not self._clocklist:
+            self._clocklist = _EMPTY
+        if not self._repeated_tasks:
+            self._repeated_tasks = _EMPTY
+        return scan
 
     def _parse_heading(self) -> None:
-        heading = self._lines[0]
-        heading_level = parse_heading_level(heading)
-        if heading_level is not None:
-            (heading, self._level) = heading_level
-        (heading, self._tags) = parse_heading_tags(heading)
-        (heading, self._todo) = parse_heading_todos(heading, self.env.all_todo_keys)
-        (heading, self._priority) = parse_heading_priority(heading)
+        (heading, level, tags, self._todo, self._priority) = _parse_heading_line(self._lines[0], self.env.all_todo_keys)
+        if level is not None:
+            self._level = level
+        self._tags = tags
         self._heading = heading
 
     # The following ``_iparse_*`` methods are simple generator based
@@ -1181,7 +2166,7 @@ class OrgNode(OrgBaseNode):
         """
         Parse SCHEDULED, DEADLINE and CLOSED time tamps.
 
-        They are assumed be in the first line.
+        They are assumed be in the first line, which is tokenized by a single :func:`parse_sdc` call.
 
         """
         try:
@@ -1196,37 +2181,92 @@ class OrgNode(OrgBaseNode):
         for line in ilines:
             yield line
 
-    def _iparse_clock(self, ilines: Iterator[str]) -> Iterator[str]:
+    def _iparse_logbook(self, ilines: Iterator[str]) -> Iterator[str]:
+        """
+        Parse CLOCK lines and state changes.
+
+        Entries inside a ``:LOGBOOK:`` drawer are decoded in bulk (see :meth:`_parse_logbook`).
+        CLOCK lines outside of drawers are still recognized, state changes
+        outside of drawers are handled by :meth:`_iparse_repeated_tasks`.
+        """
         self._clocklist = []
+        self._repeated_tasks = []
         for line in ilines:
+            if 'CLOCK:' in line:
+                cl = OrgDateClock.from_str(line)
+                if cl:
+                    self._clocklist.append(cl)
+                    continue
+            elif (parse_drawer(line) or '').upper() == 'LOGBOOK':
+                yield line
+                drawer: list[str] = []
+                for dline in ilines:
+                    if _is_drawer_end(dline):
+                        yield from self._parse_logbook(drawer)
+                        yield dline
+                        break
+                    drawer.append(dline)
+                else:
+                    # no :END:, so not really a drawer -- process the lines as usual
+                    yield from self._iparse_logbook_lines(drawer)
+                continue
+            yield line
+
+    def _iparse_logbook_lines(self, lines: list[str]) -> Iterator[str]:
+        for line in lines:
             cl = OrgDateClock.from_str(line)
             if cl:
                 self._clocklist.append(cl)
             else:
                 yield line
 
-    def _iparse_timestamps(self, ilines: Iterator[str]) -> Iterator[str]:
-        self._timestamps = []
-        self._timestamps.extend(OrgDate.list_from_str(self._heading))
-        for l in ilines:
-            self._timestamps.extend(OrgDate.list_from_str(l))
-            yield l
+    def _parse_logbook(self, lines: list[str]) -> Iterator[str]:
+        """
+        Decode contents of a ``:LOGBOOK:`` drawer, yield lines which aren't CLOCK/state change entries.
+        """
+        # NOTE: this is a hot loop for heavily clocked nodes, so keep it tight
+        clocks = self._clocklist
+        tasks = self._repeated_tasks
+        clock_match = OrgDateClock._entry_re.match
+        clock_from_match = OrgDateClock._from_match
+        task_match = self._repeated_tasks_re.match
+        task_from_match = self._repeated_task_from_match
+        for line in lines:
+            s = line.lstrip()
+            if s.startswith('CLOCK:'):
+                m = clock_match(s)
+                if m is not None:
+                    clocks.append(clock_from_match(m))
+                    continue
+            elif s.startswith('- State'):
+                m = task_match(s)
+                if m is not None:
+                    tasks.append(task_from_match(m))
+                    continue
+            yield line
+
+    def _iparse_timestamps(self, ilines: Iterator[str], scan: list[str]) -> Iterator[str]:
+        scan.append(self._heading)
+        yield from super()._iparse_timestamps(ilines, scan)
 
     def _iparse_repeated_tasks(self, ilines: Iterator[str]) -> Iterator[str]:
-        self._repeated_tasks = []
         for line in ilines:
             match = self._repeated_tasks_re.search(line)
             if match:
-                # FIXME: move this parsing to OrgDateRepeatedTask.from_str
-                mdict = match.groupdict()
-                done_state = mdict['done']
-                todo_state = mdict['todo']
-                date = OrgDate.from_str(mdict['date'])
-                self._repeated_tasks.append(OrgDateRepeatedTask(date.start, todo_state, done_state))
+                self._repeated_tasks.append(self._repeated_task_from_match(match))
             else:
                 yield line
 
-    _repeated_tasks_re = re.compile(
+    @staticmethod
+    def _repeated_task_from_match(match: re.Match) -> OrgDateRepeatedTask:
+        # FIXME: move this parsing to OrgDateRepeatedTask.from_str
+        mdict = match.groupdict()
+        done_state = mdict['done']
+        todo_state = mdict['todo']
+        date = OrgDate.from_str(mdict['date'])
+        return OrgDateRepeatedTask(date.start, todo_state, done_state)
+
+    _repeated_tasks_re = _LazyRegex(
         r'''
         \s*- \s+
         State \s+ "(?P<done> [^"]+)" \s+
@@ -1255,7 +2295,25 @@ class OrgNode(OrgBaseNode):
         '[[link][Node 1]]'
 
         """
-        return self._get_text(self._heading, format)
+        return self._cached_text('heading', format)
+
+    def _raw_text(self, part: str) -> str:
+        if part == 'heading':
+            return self._heading
+        return super()._raw_text(part)
+
+    @property
+    def heading_inline(self) -> InlineText:
+        """
+        Inline markup of the heading, see :attr:`body_inline`.
+
+        >>> from orgparse import loads
+        >>> node = loads('* Meeting <2012-02-26 Sun 10:00>').children[0]
+        >>> [ts.dates for ts in node.heading_inline.timestamps]
+        [[OrgDate((2012, 2, 26, 10, 0, 0))]]
+
+        """
+        return self._cached_text('heading', 'inline')
 
     @property
     def heading(self) -> str:
@@ -1392,7 +2450,7 @@ class OrgNode(OrgBaseNode):
         [OrgDateClock((2012, 2, 26, 21, 10, 0), (2012, 2, 26, 21, 15, 0))]
 
         """
-        return self._clocklist
+        return self._clocklist or []
 
     def has_date(self):
         """
@@ -1444,30 +2502,465 @@ class OrgNode(OrgBaseNode):
         <http://orgmode.org/manual/Repeated-tasks.html>`_
 
         """
-        return self._repeated_tasks
+        return self._repeated_tasks or []
+
+
+def parse_lines(lines: Iterable[str], filename, env=None, profiler: Optional[Profiler] = None) -> OrgNode:
+    if env is not None and env._columnar:
+        # columnar store works on the whole text
+        return parse_text('\n'.join(lines), filename=filename, env=env, profiler=profiler)
+
+    def numbered_chunks() -> Iterator[tuple[int, list[str]]]:
+        lineno = 1  # in text editors lines are 1-indexed
+        for chunk in lines_to_chunks(lines):
+            yield (lineno, chunk)
+            lineno += len(chunk)
+
+    return _parse_chunks(numbered_chunks(), filename=filename, env=env, profiler=profiler)
 
 
-def parse_lines(lines: Iterable[str], filename, env=None) -> OrgNode:
+def parse_text(text: str, filename, env=None, profiler: Optional[Profiler] = None) -> OrgNode:
+    """
+    Same as :func:`parse_lines`, but for the whole document text at once.
+
+    Lines are expected to be separated by ``'\\n'``.
+    """
+    if env is not None and env._columnar:
+        return _parse_columnar(text, filename=filename, env=env, profiler=profiler)
+    chunks = ((lineno, _split_chunk(text[start:end])) for (start, end, lineno) in text_to_chunks(text))
+    return _parse_chunks(chunks, filename=filename, env=env, profiler=profiler)
+
+
+def parse_bytes(data: bytes, filename, env=None, profiler: Optional[Profiler] = None) -> OrgNode:
+    """
+    Same as :func:`parse_text`, but for UTF-8 encoded text.
+
+    Line breaks are handled same as when reading a file in text mode (``'\\r\\n'`` and ``'\\r'`` are newlines).
+
+    With a columnar ``env``, the structure is located on the raw bytes: only the heading lines are decoded upfront,
+    and the rest of a node is decoded when the node is created (i.e. first accessed), see :class:`NodeStore`.
+    Otherwise all nodes are parsed upfront, so the whole text is decoded first.
+    """
+    if b'\r' in data:
+        data = data.replace(b'\r\n', b'\n').replace(b'\r', b'\n')
+    if env is not None and env._columnar:
+        return _parse_columnar(data, filename=filename, env=env, profiler=profiler)
+    return parse_text(data.decode('utf8'), filename=filename, env=env, profiler=profiler)
+
+
+def _parse_chunks(
+    chunks: Iterable[tuple[int, list[str]]],
+    filename,
+    env=None,
+    profiler: Optional[Profiler] = None,
+) -> OrgNode:
     if not env:
         env = OrgEnv(filename=filename)
     elif env.filename != filename:
         raise ValueError('If env is specified, filename must match')
+    if profiler is not None:
+        env._profiler = profiler
+    profiler = env._profiler
+
+    if profiler is None:
+        return _parse_chunks_into(env, chunks, None)
+    profiler.start()
+    try:
+        chunks = profiler.iterate('chunking', chunks, lambda c: len(c[1]))
+        return profiler.call('total', 0, _parse_chunks_into, env, chunks, profiler)
+    finally:
+        profiler.stop()
 
+
+def _parse_chunks_into(env: OrgEnv, chunks: Iterable[tuple[int, list[str]]], profiler: Optional[Profiler]) -> OrgNode:
     # parse into node of list (environment will be parsed)
-    ch1, ch2 = itertools.tee(lines_to_chunks(lines))
-    linenos = itertools.accumulate(itertools.chain([0], (len(c) for c in ch1)))
-    nodes = env.from_chunks(ch2)
-    nodelist = []
-    for lineno, node in zip(linenos, nodes):
-        lineno += 1  # in text editors lines are 1-indexed
+    nodelist: list[OrgBaseNode] = []
+    for lineno, chunk in chunks:
+        node_cls = OrgNode if nodelist else OrgRootNode
+        if profiler is None:
+            node = node_cls.from_chunk(env, chunk)
+        else:
+            node = profiler.call('comments', len(chunk), node_cls.from_chunk, env, chunk)
         node.linenumber = lineno
         nodelist.append(node)
     # parse headings (level, TODO, TAGs, and heading)
-    nodelist[0]._index = 0
-    # parse the root node
-    nodelist[0]._parse_pre()
-    for i, node in enumerate(nodelist[1:], 1):  # nodes except root node
+    scan: list[str] = []
+    for i, node in enumerate(nodelist):  # root node goes first
         node._index = i
-        node._parse_pre()
+        scan.append('\n'.join(node._parse_pre(profiler)))
+    if profiler is None:
+        _assign_timestamps(nodelist, scan)
+    else:
+        profiler.call('timestamp_search', sum(t.count('\n') + 1 for t in scan), _assign_timestamps, nodelist, scan)
     env._nodes = nodelist
-    return nodelist[0]  # root
+    env._levels = [node.level for node in nodelist]
+    return cast(OrgNode, nodelist[0])  # root
+
+
+def _parse_columnar(text: Union[str, bytes], filename, env: OrgEnv, profiler: Optional[Profiler] = None) -> OrgNode:
+    if env.filename != filename:
+        raise ValueError('If env is specified, filename must match')
+    if profiler is not None:
+        env._profiler = profiler
+    profiler = env._profiler
+    if profiler is None:
+        store = NodeStore(text, env)
+    else:
+        num_lines = (text.count('\n') if isinstance(text, str) else text.count(b'\n')) + 1
+        store = profiler.call('total', num_lines, NodeStore, text, env)
+    env._store = store
+    env._nodes = store
+    env._levels = store.levels
+    return cast(OrgNode, store[0])  # root
+
+
+def _parse_subtree(env: OrgEnv, text: str) -> list[OrgNode]:
+    """
+    Parse a heading with its subtree into new nodes of ``env``, in document order.
+    """
+    chunks = text_to_chunks(text)
+    (start, end, _) = next(chunks)
+    if start != end:
+        raise ValueError(f'Text should start with a heading: {text!r}')
+    nodes = [OrgNode.from_chunk(env, _split_chunk(text[s:e]), add_todo_keys=False) for (s, e, _) in chunks]
+    if len(nodes) == 0:
+        raise ValueError(f'Text should start with a heading: {text!r}')
+    scan = ['\n'.join(node._parse_pre()) for node in nodes]
+    _assign_timestamps(nodes, scan)
+    if any(node.level <= nodes[0].level for node in nodes[1:]):
+        raise ValueError(f'Text should contain a single subtree: {text!r}')
+    return nodes
+
+
+def _file_stat(file: Union[Path, IO]) -> Optional[tuple[int, int, int]]:
+    """
+    Inode, size and modification time of a file (or an open file object, if it has a file descriptor).
+    """
+    try:
+        st = file.stat() if isinstance(file, Path) else os.fstat(file.fileno())
+    except (AttributeError, OSError):
+        # e.g. io.StringIO (io.UnsupportedOperation is an OSError)
+        return None
+    return (st.st_ino, st.st_size, st.st_mtime_ns)
+
+
+def _source_line_count(nodes: Sequence[OrgBaseNode], dirty: dict[OrgBaseNode, int]) -> int:
+    """
+    Number of lines of the source file, given the (original) line numbers of the nodes.
+    """
+    if len(nodes) == 0:
+        return 0
+    last = nodes[-1]
+    return last.linenumber - 1 + dirty.get(last, len(last._lines))
+
+
+class _Tree:
+    """
+    Explicit parent/children links of the nodes, so that structural changes don't need to
+    shift the flat node list (see :meth:`OrgEnv.batch`).
+
+    The links are the same as navigation methods infer from the levels
+    (e.g. :meth:`OrgBaseNode._find_parent`): the parent is the closest preceding node with a lower level.
+    """
+
+    __slots__ = ('children', 'parents')
+
+    def __init__(self, nodes: Sequence[OrgBaseNode], levels: Sequence[int]) -> None:
+        self.children: dict[OrgBaseNode, list[OrgBaseNode]] = {}
+        self.parents: dict[OrgBaseNode, OrgBaseNode] = {}
+        self.add(nodes, levels)
+
+    def add(self, nodes: Sequence[OrgBaseNode], levels: Optional[Sequence[int]] = None) -> None:
+        """
+        Link ``nodes[1:]`` (in document order) into the subtree of ``nodes[0]``.
+        """
+        if levels is None:
+            levels = [node.level for node in nodes]
+        stack: list[int] = [0]
+        for i in range(1, len(nodes)):
+            while len(stack) > 1 and levels[stack[-1]] >= levels[i]:
+                stack.pop()
+            parent = nodes[stack[-1]]
+            self.children.setdefault(parent, []).append(nodes[i])
+            self.parents[nodes[i]] = parent
+            stack.append(i)
+
+    def contains(self, node: OrgBaseNode) -> bool:
+        return node.is_root() or node in self.parents
+
+    def detach(self, node: OrgBaseNode) -> None:
+        siblings = self.children[self.parents.pop(node)]
+        siblings.remove(node)
+
+    def insert(self, parent: OrgBaseNode, node: OrgNode, position: Optional[int]) -> None:
+        siblings = self.children.setdefault(parent, [])
+        # same as list.insert
+        if position is None:
+            position = len(siblings)
+        elif position < 0:
+            position = max(0, len(siblings) + position)
+        else:
+            position = min(position, len(siblings))
+        siblings.insert(position, node)
+        self.parents[node] = parent
+        # NOTE: siblings' levels are non-increasing (see _children_indices),
+        # so the node must not be above the next one, otherwise it would become its parent
+        level = parent.level + 1
+        if position + 1 < len(siblings):
+            level = max(level, siblings[position + 1].level)
+        node._relevel(self, level)
+
+    def flatten(self, root: OrgBaseNode) -> list[OrgBaseNode]:
+        nodes = []
+        stack = [root]
+        while len(stack) > 0:
+            node = stack.pop()
+            nodes.append(node)
+            stack.extend(reversed(self.children.get(node, ())))
+        return nodes
+
+
+def _children_indices(levels: Sequence[int], index: int) -> Iterator[int]:
+    """
+    Indices of the children of the node at ``index``, given levels of all nodes in the document.
+    """
+    level = levels[index]
+    last_child_level: Optional[int] = None
+    for i in range(index + 1, len(levels)):
+        lvl = levels[i]
+        if lvl <= level:
+            return
+        if last_child_level is None or lvl <= last_child_level:
+            yield i
+            last_child_level = lvl
+
+
+class NodeStore(Sequence[OrgBaseNode]):
+    """
+    Columnar (struct-of-arrays) storage of the document headings.
+
+    Used instead of a list of nodes when :class:`OrgEnv` is created with ``columnar=True``.
+    Heading attributes are kept in compact arrays indexed by node index (``0`` is the root),
+    so whole-document scans don't need to create a node object per heading.
+    Nodes are created on demand when indexed, by parsing their part of the document text.
+
+    >>> from orgparse import loads
+    >>> root = loads('''
+    ... #+TODO: TODO WAITING | DONE
+    ... * TODO [#A] Heading 1 :tag:
+    ... ** WAITING Heading 2
+    ... * Heading 3
+    ... ''', env=OrgEnv(columnar=True, filename='<string>'))
+    >>> store = root.env.store
+    >>> len(store)  # including the root
+    4
+    >>> [store.heading(i) for i in range(1, len(store))]
+    ['Heading 1', 'Heading 2', 'Heading 3']
+    >>> list(store.find(todo='WAITING'))
+    [2]
+    >>> (store.todo(1), store.priority(1), store.tags(1), store.linenumbers[1])
+    ('TODO', 'A', frozenset({'tag'}), 3)
+    >>> store.parent(2), store.children(0)
+    (1, [1, 3])
+
+    The text can also be UTF-8 encoded bytes (see :func:`parse_bytes`),
+    then only the heading lines are decoded upfront, and the rest of the nodes when they're accessed.
+
+    Nodes behave the same as usual:
+
+    >>> [n.heading for n in root.children]
+    ['Heading 1', 'Heading 3']
+    >>> root.children[0].children[0].todo
+    'WAITING'
+
+    """
+
+    def __init__(self, text: Union[str, bytes], env: OrgEnv) -> None:
+        self.text = text
+        """Text of the document, or its UTF-8 encoded bytes (then :attr:`offsets` are in bytes)."""
+        self.env = env
+        self.levels = array('I')
+        """Node levels (``0`` for the root)."""
+        self.linenumbers = array('l')
+        """Line numbers where the nodes start (1-indexed)."""
+        self.offsets = array('l')
+        """Offsets of the nodes in :attr:`text` (one extra item at the end, for the end of the last node)."""
+        self.headings: list[str] = []
+        """Interned headings."""
+        self.todos = array('I')
+        """TODO keywords (index in :attr:`todo_keys` plus one, or ``0`` if there is none)."""
+        self.priorities = array('B')
+        """Priority characters (ASCII codes, or ``0`` if there is none)."""
+        self._tags: list[frozenset[str]] = []
+
+        self._prescan_todo_keys()
+        self.todo_keys: list[str] = env.all_todo_keys
+
+        intern = sys.intern
+        todo_code = {todo: i + 1 for i, todo in enumerate(self.todo_keys)}
+        chunks = text_to_chunks(text) if isinstance(text, str) else _bytes_to_chunks(text)
+        for start, end, lineno in chunks:
+            self.offsets.append(start)
+            self.linenumbers.append(lineno)
+            if len(self.offsets) == 1:
+                # root
+                self.levels.append(0)
+                self.headings.append('')
+                self.todos.append(0)
+                self.priorities.append(0)
+                self._tags.append(frozenset())
+                continue
+            if isinstance(text, str):
+                nl = text.find('\n', start, end)
+                line = text[start : end if nl == -1 else nl]
+            else:
+                nl = text.find(b'\n', start, end)
+                line = text[start : end if nl == -1 else nl].decode('utf8')
+            (heading, level, tags, todo, priority) = _parse_heading_line(line, self.todo_keys)
+            self.levels.append(cast(int, level))
+            self.headings.append(intern(heading))
+            self.todos.append(todo_code[todo] if todo is not None else 0)
+            self.priorities.append(ord(priority) if priority is not None else 0)
+            self._tags.append(tags)
+        self.offsets.append(len(text))
+        self._cache: list[Optional[OrgBaseNode]] = [None] * len(self.levels)
+        self._lock = threading.Lock()
+
+    def __getstate__(self) -> dict[str, Any]:
+        state = self.__dict__.copy()
+        # locks can't be pickled
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def _prescan_todo_keys(self) -> None:
+        # normally TODO keys are collected from all chunks before parsing headings, so have to do the same here
+        text = self.text
+        if isinstance(text, str):
+            lines: Iterable[str] = (m.group(0) for m in _RE_SPECIAL_COMMENT_LINE.finditer(text))
+        else:
+            lines = (line.decode('utf8') for line in _bytes_special_comment_lines(text))
+        for line in lines:
+            parsed = parse_comment(line)
+            if parsed is None:
+                continue
+            (key, vals) = parsed
+            if key.upper() in _TODO_COMMENT_KEYS:
+                for val in vals:
+                    self.env.add_todo_keys(*parse_seq_todo(val))
+
+    def __len__(self) -> int:
+        return len(self.levels)
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return [self.node(i) for i in range(*key.indices(len(self)))]
+        if key < 0:
+            key += len(self)
+        if not 0 <= key < len(self):
+            raise IndexError(key)
+        return self.node(key)
+
+    def node(self, index: int) -> OrgBaseNode:
+        """
+        Node object at ``index`` (created on the first access).
+        """
+        node = self._cache[index]
+        if node is not None:
+            return node
+        # NOTE: parsed without holding the lock, so that threads can create different nodes in parallel.
+        # If multiple threads create the same node, the first one is kept, so all threads get the same object
+        node = self._make_node(index)
+        with self._lock:
+            cached = self._cache[index]
+            if cached is not None:
+                return cached
+            self._cache[index] = node
+            return node
+
+    def _make_node(self, index: int) -> OrgBaseNode:
+        chunk = self.text[self.offsets[index] : self.offsets[index + 1]]
+        lines = _split_chunk(chunk if isinstance(chunk, str) else chunk.decode('utf8'))
+        node_cls = OrgNode if index > 0 else OrgRootNode
+        # TODO keys were already collected by the store
+        node = node_cls.from_chunk(self.env, lines, add_todo_keys=False)
+        node.linenumber = self.linenumbers[index]
+        node._index = index
+        _assign_timestamps([node], ['\n'.join(node._parse_pre(self.env._profiler))])
+        return node
+
+    def heading(self, index: int) -> str:
+        return self.headings[index]
+
+    def todo(self, index: int) -> Optional[str]:
+        code = self.todos[index]
+        return self.todo_keys[code - 1] if code > 0 else None
+
+    def priority(self, index: int) -> Optional[str]:
+        code = self.priorities[index]
+        return chr(code) if code > 0 else None
+
+    def tags(self, index: int) -> frozenset[str]:
+        """
+        Tags of the heading (not including inherited tags).
+        """
+        return self._tags[index]
+
+    def parent(self, index: int) -> Optional[int]:
+        levels = self.levels
+        level = levels[index]
+        for i in range(index - 1, -1, -1):
+            if levels[i] < level:
+                return i
+        return None
+
+    def children(self, index: int) -> list[int]:
+        return list(_children_indices(self.levels, index))
+
+    def find(
+        self,
+        *,
+        todo: Optional[str] = None,
+        tag: Optional[str] = None,
+        level: Optional[int] = None,
+    ) -> Iterator[int]:
+        """
+        Indices of the headings matching all the given criteria.
+        """
+        todo_code = None if todo is None else (self.todo_keys.index(todo) + 1 if todo in self.todo_keys else -1)
+        for i in range(1, len(self)):
+            if level is not None and self.levels[i] != level:
+                continue
+            if todo_code is not None and self.todos[i] != todo_code:
+                continue
+            if tag is not None and tag not in self._tags[i]:
+                continue
+            yield i
+
+
+_RE_SPECIAL_COMMENT_LINE = re.compile(r'^[^\S\n]*#\+.*$', re.MULTILINE)
+
+
+def _assign_timestamps(nodes: Sequence[OrgBaseNode], texts: Sequence[str]) -> None:
+    """
+    Search timestamps in a single pass over the whole document.
+
+    ``texts[i]`` is the text which should be searched for timestamps of ``nodes[i]``.
+    Matches are assigned to the nodes by bisecting the offsets of texts in the joined buffer.
+    """
+    starts = list(itertools.accumulate((len(t) + 1 for t in texts[:-1]), initial=0))
+    buffer = '\n'.join(texts)
+    for node in nodes:
+        node._timestamps = _EMPTY
+    idx = 0
+    for offset, odate in OrgDate._iter_from_str(buffer):
+        # offsets are increasing, so no need to look before the previous match
+        idx = bisect.bisect_right(starts, offset, lo=idx) - 1
+        node = nodes[idx]
+        if node._timestamps is _EMPTY:
+            node._timestamps = [odate]
+        else:
+            node._timestamps.append(odate)
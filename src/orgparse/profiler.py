@@ -0,0 +1,207 @@
+"""
+Instrumentation for the parser: per-stage timings, line counts and regex invocation counts.
+
+>>> from orgparse import loads
+>>> profiler = Profiler()
+>>> root = loads('''
+... * TODO Heading
+...   SCHEDULED: <2012-02-26 Sun>
+...   :PROPERTIES:
+...   :Effort:   1:00
+...   :END:
+... ''', profiler=profiler)
+>>> stats = root.env.parse_stats
+>>> stats['properties'].lines
+4
+>>> stats['sdc'].regex_calls
+1
+>>> sorted(stats)  # doctest: +NORMALIZE_WHITESPACE
+['chunking', 'comments', 'heading', 'logbook', 'properties', 'repeated_tasks',
+ 'sdc', 'timestamp_search', 'timestamps', 'total']
+
+When no profiler is passed, the parser doesn't do any extra work, and ``parse_stats`` is ``None``.
+
+>>> loads('* Heading').env.parse_stats is None
+True
+"""
+
+from __future__ import annotations
+
+import re
+import sys
+import time
+from collections.abc import Iterable, Iterator
+from typing import Any, Callable, Optional, TypeVar
+
+T = TypeVar('T')
+
+
+class StageStats:
+    """
+    Cumulative statistics of a single parsing stage.
+    """
+
+    def __init__(self) -> None:
+        self.time = 0.0
+        """Total time spent in the stage, in seconds."""
+        self.calls = 0
+        """How many times the stage was run (e.g. once per node)."""
+        self.lines = 0
+        """Total number of lines the stage received."""
+        self.regex_calls = 0
+        """Number of compiled regex method calls during the stage (only counted with ``count_regex=True``)."""
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            'time': self.time,
+            'calls': self.calls,
+            'lines': self.lines,
+            'regex_calls': self.regex_calls,
+        }
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}(time={self.time:.6f}, calls={self.calls}, lines={self.lines}, regex_calls={self.regex_calls})'
+
+
+class Profiler:
+    """
+    Collects statistics about parsing stages.
+
+    Pass it to :func:`orgparse.load` (or :func:`orgparse.loads`, :func:`orgparse.loadi`),
+    results are available as :attr:`orgparse.node.OrgEnv.parse_stats` of the returned root.
+    Statistics are cumulative, so the same profiler can be used for multiple documents.
+
+    The stages are:
+
+    - ``chunking``: splitting the document into per-node chunks (includes reading the input for :func:`orgparse.loadi`)
+    - ``comments``: special comments, e.g. ``#+TODO:``
+    - ``heading``: heading level, tags, TODO keyword and priority
+    - ``sdc``: SCHEDULED/DEADLINE/CLOSED line
+    - ``logbook``: CLOCK entries and ``:LOGBOOK:`` drawers
+    - ``properties``: ``:PROPERTIES:`` drawer
+    - ``repeated_tasks``: state changes outside of ``:LOGBOOK:``
+    - ``timestamps``: collecting lines which should be searched for timestamps
+    - ``timestamp_search``: searching timestamps over the whole document
+    - ``total``: the whole parse
+
+    Stages of each node are interleaved the same way as without a profiler (so the results are the same),
+    but every line passing between them is timed, so profiled parsing is slower than the normal one.
+
+    :arg count_regex:
+        Count calls to compiled regex methods (``match``, ``search``, etc.).
+        This uses :func:`sys.setprofile`, which makes all Python calls slower,
+        so pass ``False`` for more accurate timings.
+    """
+
+    def __init__(self, *, count_regex: bool = True) -> None:
+        self.stages: dict[str, StageStats] = {}
+        self._count_regex = count_regex
+        self._regex_calls = 0
+        self._prev_profile: Optional[Callable] = None
+
+    def _stats(self, name: str) -> StageStats:
+        st = self.stages.get(name)
+        if st is None:
+            st = self.stages[name] = StageStats()
+        return st
+
+    def call(self, name: str, lines: int, fn: Callable[..., T], *args: Any) -> T:
+        """
+        Call ``fn(*args)``, recording the time it took under stage ``name``.
+        """
+        regex_calls = self._regex_calls
+        start = time.perf_counter()
+        res = fn(*args)
+        elapsed = time.perf_counter() - start
+        st = self._stats(name)
+        st.time += elapsed
+        st.calls += 1
+        st.lines += lines
+        st.regex_calls += self._regex_calls - regex_calls
+        return res
+
+    def chain(
+        self,
+        stages: Iterable[tuple[str, Callable[[Iterator[str]], Iterable[str]]]],
+        ilines: Iterator[str],
+    ) -> Iterator[str]:
+        """
+        Chain line-based parser stages (see ``OrgNode._iparse_*`` methods) the same way as without a profiler.
+
+        Time of each stage excludes the time spent in the stages before it, which produce its input.
+        """
+        for name, stage in stages:
+            ilines = self._timed_stage(name, stage, ilines)
+        return ilines
+
+    def _timed_stage(self, name: str, stage: Callable[[Iterator[str]], Iterable[str]], ilines: Iterator[str]) -> Iterator[str]:
+        st = self._stats(name)
+        st.calls += 1
+        # time and regex calls spent producing the input of the stage
+        upstream_time = 0.0
+        upstream_regex_calls = 0
+        sentinel: Any = object()
+
+        def source() -> Iterator[str]:
+            nonlocal upstream_time, upstream_regex_calls
+            while True:
+                (start, regex_calls) = (time.perf_counter(), self._regex_calls)
+                line = next(ilines, sentinel)
+                upstream_time += time.perf_counter() - start
+                upstream_regex_calls += self._regex_calls - regex_calls
+                if line is sentinel:
+                    return
+                st.lines += 1
+                yield line
+
+        out = iter(stage(source()))
+        while True:
+            (upstream_time, upstream_regex_calls) = (0.0, 0)
+            (start, regex_calls) = (time.perf_counter(), self._regex_calls)
+            line = next(out, sentinel)
+            st.time += time.perf_counter() - start - upstream_time
+            st.regex_calls += self._regex_calls - regex_calls - upstream_regex_calls
+            if line is sentinel:
+                return
+            yield line
+
+    def iterate(self, name: str, iterable: Iterable[T], size: Callable[[T], int]) -> Iterator[T]:
+        """
+        Iterate over ``iterable``, recording the time it took to produce the items under stage ``name``.
+        """
+        it = iter(iterable)
+        sentinel: Any = object()
+        while True:
+            item = self.call(name, 0, next, it, sentinel)
+            if item is sentinel:
+                return
+            self.stages[name].lines += size(item)
+            yield item
+
+    def start(self) -> None:
+        if not self._count_regex:
+            return
+        self._prev_profile = sys.getprofile()
+        sys.setprofile(self._profile_hook)
+
+    def stop(self) -> None:
+        if not self._count_regex:
+            return
+        sys.setprofile(self._prev_profile)
+        self._prev_profile = None
+
+    def _profile_hook(self, frame, event: str, arg) -> None:  # noqa: ARG002
+        if event == 'c_call' and isinstance(getattr(arg, '__self__', None), re.Pattern):
+            self._regex_calls += 1
+
+    def as_dict(self) -> dict[str, dict[str, Any]]:
+        """
+        Statistics as plain dictionaries, e.g. for logging or dumping as JSON.
+        """
+        return {name: st.as_dict() for name, st in self.stages.items()}
+
+    def __str__(self) -> str:
+        rows = [f'{"stage":<16} {"time, s":>10} {"calls":>8} {"lines":>10} {"regex":>10}']
+        for name, st in sorted(self.stages.items(), key=lambda kv: -kv[1].time):
+            rows.append(f'{name:<16} {st.time:>10.4f} {st.calls:>8} {st.lines:>10} {st.regex_calls:>10}')
+        return '\n'.join(rows)
@@ -0,0 +1,311 @@
+"""
+Export of org files into an SQLite database, updated incrementally.
+
+>>> import sqlite3, tempfile
+>>> from pathlib import Path
+>>> with tempfile.TemporaryDirectory() as tmp:
+...     path = Path(tmp) / 'tasks.org'
+...     _ = path.write_text('* TODO Task :work:\\n  SCHEDULED: <2024-03-01 Fri>\\n')
+...     db = Path(tmp) / 'org.db'
+...     sync(db, [path])
+...     sync(db, [path])
+...     with sqlite3.connect(db) as conn:
+...         conn.execute('''
+...             SELECT heading, todo, tag, kind, start FROM nodes
+...             JOIN tags ON tags.node_id = nodes.id JOIN timestamps ON timestamps.node_id = nodes.id
+...         ''').fetchall()
+SyncStats(added=1, updated=0, unchanged=0, removed=0)
+SyncStats(added=0, updated=0, unchanged=1, removed=0)
+[('Task', 'TODO', 'work', 'scheduled', '2024-03-01')]
+"""
+
+from __future__ import annotations
+
+import hashlib
+import sqlite3
+from collections.abc import Iterable, Iterator
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, NamedTuple, Optional, Union, cast
+
+from . import loads
+from .date import OrgDate, OrgDateClock, total_minutes
+from .node import OrgBaseNode, OrgNode
+
+SCHEMA_VERSION = 1
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    hash TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS nodes (
+    id INTEGER PRIMARY KEY,
+    file_id INTEGER NOT NULL REFERENCES files(id),
+    parent_id INTEGER REFERENCES nodes(id),
+    position INTEGER NOT NULL,  -- index of the node in the file, 0 is the root
+    level INTEGER NOT NULL,
+    linenumber INTEGER NOT NULL,
+    heading TEXT NOT NULL,
+    todo TEXT,
+    priority TEXT,
+    body TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS nodes_file_id ON nodes(file_id);
+CREATE TABLE IF NOT EXISTS tags (
+    node_id INTEGER NOT NULL REFERENCES nodes(id),
+    tag TEXT NOT NULL,
+    inherited INTEGER NOT NULL  -- from an ancestor or #+FILETAGS
+);
+CREATE INDEX IF NOT EXISTS tags_node_id ON tags(node_id);
+CREATE INDEX IF NOT EXISTS tags_tag ON tags(tag);
+CREATE TABLE IF NOT EXISTS properties (
+    node_id INTEGER NOT NULL REFERENCES nodes(id),
+    key TEXT NOT NULL,
+    value  -- as parsed, e.g. Effort is in minutes
+);
+CREATE INDEX IF NOT EXISTS properties_node_id ON properties(node_id);
+CREATE INDEX IF NOT EXISTS properties_key ON properties(key);
+CREATE TABLE IF NOT EXISTS timestamps (
+    node_id INTEGER NOT NULL REFERENCES nodes(id),
+    kind TEXT NOT NULL,  -- scheduled, deadline, closed or body
+    start TEXT NOT NULL,
+    end TEXT,
+    active INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS timestamps_node_id ON timestamps(node_id);
+CREATE INDEX IF NOT EXISTS timestamps_start ON timestamps(start);
+CREATE TABLE IF NOT EXISTS clocks (
+    node_id INTEGER NOT NULL REFERENCES nodes(id),
+    start TEXT NOT NULL,
+    end TEXT,
+    minutes INTEGER
+);
+CREATE INDEX IF NOT EXISTS clocks_node_id ON clocks(node_id);
+'''
+
+_NODE_TABLES = ('tags', 'properties', 'timestamps', 'clocks')
+
+
+class SyncStats(NamedTuple):
+    added: int
+    updated: int
+    unchanged: int
+    removed: int
+
+
+class _Rows:
+    """
+    Rows of all tables for the files being exported.
+    """
+
+    def __init__(self) -> None:
+        self.nodes: list[tuple] = []
+        self.tags: list[tuple] = []
+        self.properties: list[tuple] = []
+        self.timestamps: list[tuple] = []
+        self.clocks: list[tuple] = []
+
+    def __len__(self) -> int:
+        return sum(len(rows) for rows in (self.nodes, self.tags, self.properties, self.timestamps, self.clocks))
+
+    def add_file(self, file_id: int, first_id: int, nodes: Iterable[OrgBaseNode]) -> int:
+        """
+        Returns the next free node id.
+        """
+        node_id = first_id
+        # (level, id, tags) of the current node's ancestors
+        stack: list[tuple[int, int, frozenset[str]]] = []
+        for position, node in enumerate(nodes):
+            level = node.level
+            while len(stack) > 0 and stack[-1][0] >= level:
+                stack.pop()
+            (parent_id, inherited) = (stack[-1][1], stack[-1][2]) if len(stack) > 0 else (None, frozenset())
+            shallow = node.shallow_tags
+            (todo, priority) = (node.todo, node.priority) if isinstance(node, OrgNode) else (None, None)
+            self.nodes.append(
+                (node_id, file_id, parent_id, position, level, node.linenumber, node.heading, todo, priority, node.body)
+            )
+            self.properties.extend((node_id, key, value) for key, value in node._properties.items())
+            if isinstance(node, OrgNode):
+                self.tags.extend((node_id, tag, 0) for tag in sorted(shallow))
+                self.tags.extend((node_id, tag, 1) for tag in sorted(inherited - shallow))
+                for kind, d in (('scheduled', node.scheduled), ('deadline', node.deadline), ('closed', node.closed)):
+                    if d:
+                        self.timestamps.append(_timestamp_row(node_id, kind, d))
+                self.clocks.extend(_clock_row(node_id, c) for c in node.clock)
+            self.timestamps.extend(
+                _timestamp_row(node_id, 'body', d)
+                for d in node.get_timestamps(active=True, inactive=True, range=True, point=True)
+            )
+            # FILETAGS are inherited by the top level nodes
+            stack.append((level, node_id, inherited | shallow))
+            node_id += 1
+        return node_id
+
+    def insert(self, conn: sqlite3.Connection) -> None:
+        conn.executemany('INSERT INTO nodes VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)', self.nodes)
+        conn.executemany('INSERT INTO tags VALUES (?, ?, ?)', self.tags)
+        conn.executemany('INSERT INTO properties VALUES (?, ?, ?)', self.properties)
+        conn.executemany('INSERT INTO timestamps VALUES (?, ?, ?, ?, ?)', self.timestamps)
+        conn.executemany('INSERT INTO clocks VALUES (?, ?, ?, ?)', self.clocks)
+        for rows in (self.nodes, self.tags, self.properties, self.timestamps, self.clocks):
+            rows.clear()
+
+
+def _isoformat(d: date) -> str:
+    if isinstance(d, datetime):
+        # NOTE: space separated, same as sqlite date functions produce
+        return d.isoformat(sep=' ')
+    return d.isoformat()
+
+
+def _timestamp_row(node_id: int, kind: str, d: OrgDate) -> tuple:
+    return (node_id, kind, _isoformat(d.start), _isoformat(d.end) if d.has_end() else None, int(d.is_active()))
+
+
+def _clock_row(node_id: int, clock: OrgDateClock) -> tuple:
+    if not clock.has_end():
+        return (node_id, _isoformat(clock.start), None, None)
+    return (node_id, _isoformat(clock.start), _isoformat(clock.end), round(total_minutes(clock.duration)))
+
+
+def connect(db_path: Union[str, Path]) -> sqlite3.Connection:
+    """
+    Open the database (creating the tables if necessary), in WAL mode.
+    """
+    conn = sqlite3.connect(db_path, isolation_level=None)
+    try:
+        _init(conn, db_path)
+    except BaseException:
+        conn.close()
+        raise
+    return conn
+
+
+def _init(conn: sqlite3.Connection, db_path: Union[str, Path]) -> None:
+    conn.execute('PRAGMA journal_mode=WAL')
+    # NOTE: in WAL mode this is still durable across application crashes, only not power loss
+    conn.execute('PRAGMA synchronous=NORMAL')
+    (version,) = conn.execute('PRAGMA user_version').fetchone()
+    if version not in {0, SCHEMA_VERSION}:
+        raise ValueError(f'{db_path}: unsupported schema version {version}, expected {SCHEMA_VERSION}')
+    conn.executescript(SCHEMA)
+    conn.execute(f'PRAGMA user_version={SCHEMA_VERSION}')
+
+
+def sync(
+    db_path: Union[str, Path],
+    paths: Iterable[Union[str, Path]],
+    *,
+    prune: bool = False,
+    batch_rows: int = 100_000,
+) -> SyncStats:
+    """
+    Export org files into the database at ``db_path``, skipping the files which didn't change since the last sync.
+
+    Files are identified by their resolved absolute path (i.e. with symlinks resolved),
+    so the same file passed several times (or via different paths) is exported once.
+    A file is unchanged if its size and modification time are the same, or otherwise if its content hash is the same.
+    Rows of the changed files are replaced in a single transaction,
+    so readers (e.g. BI tools) never see partially exported files.
+
+    Tables (see :data:`SCHEMA`): ``files``, ``nodes`` (with ``parent_id``), ``tags``, ``properties``,
+    ``timestamps`` (``SCHEDULED``/``DEADLINE``/``CLOSED`` and timestamps in the body) and ``clocks``.
+    Dates are stored as ISO 8601 text.
+
+    :arg prune: also delete the files which are in the database but not in ``paths``.
+    :arg batch_rows: rows are accumulated in memory and written with ``executemany`` in batches of about this size.
+    """
+    conn = connect(db_path)
+    try:
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            stats = _sync(conn, paths, prune=prune, batch_rows=batch_rows)
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        conn.execute('COMMIT')
+    finally:
+        conn.close()
+    return stats
+
+
+def _sync(conn: sqlite3.Connection, paths: Iterable[Union[str, Path]], *, prune: bool, batch_rows: int) -> SyncStats:
+    known: dict[str, tuple[int, str, int, int]] = {
+        path: (file_id, hash_, size, mtime_ns)
+        for (file_id, path, hash_, size, mtime_ns) in conn.execute('SELECT id, path, hash, size, mtime_ns FROM files')
+    }
+    (next_node_id,) = conn.execute('SELECT COALESCE(MAX(id), 0) + 1 FROM nodes').fetchone()
+    (added, updated, unchanged) = (0, 0, 0)
+    seen: set[str] = set()
+    rows = _Rows()
+    for path, data, stat in _read_changed(paths, known):
+        seen.add(path)
+        if data is None:
+            unchanged += 1
+            continue
+        hash_ = hashlib.blake2b(data, digest_size=16).hexdigest()
+        old = known.get(path)
+        if old is not None and old[1] == hash_:
+            # touched, but the same content
+            conn.execute('UPDATE files SET size = ?, mtime_ns = ? WHERE id = ?', (*stat, old[0]))
+            unchanged += 1
+            continue
+        if old is None:
+            file_id = cast(
+                int,
+                conn.execute(
+                    'INSERT INTO files (path, hash, size, mtime_ns) VALUES (?, ?, ?, ?)', (path, hash_, *stat)
+                ).lastrowid,
+            )
+            added += 1
+        else:
+            file_id = old[0]
+            _delete_nodes(conn, file_id)
+            conn.execute('UPDATE files SET hash = ?, size = ?, mtime_ns = ? WHERE id = ?', (hash_, *stat, file_id))
+            updated += 1
+        root = loads(data.decode('utf8'), filename=path)
+        next_node_id = rows.add_file(file_id, next_node_id, root)
+        if len(rows) >= batch_rows:
+            rows.insert(conn)
+    rows.insert(conn)
+    removed = 0
+    if prune:
+        for path, (file_id, *_) in known.items():
+            if path not in seen:
+                _delete_nodes(conn, file_id)
+                conn.execute('DELETE FROM files WHERE id = ?', (file_id,))
+                removed += 1
+    return SyncStats(added=added, updated=updated, unchanged=unchanged, removed=removed)
+
+
+def _read_changed(
+    paths: Iterable[Union[str, Path]],
+    known: dict[str, Any],
+) -> Iterator[tuple[str, Optional[bytes], tuple[int, int]]]:
+    """
+    Yields ``(resolved path, contents or None if not modified, (size, mtime))``, once per file.
+    """
+    seen: set[Path] = set()
+    for p in paths:
+        path = Path(p).resolve()
+        if path in seen:
+            continue
+        seen.add(path)
+        st = path.stat()
+        stat = (st.st_size, st.st_mtime_ns)
+        old = known.get(str(path))
+        if old is not None and (old[2], old[3]) == stat:
+            yield (str(path), None, stat)
+        else:
+            yield (str(path), path.read_bytes(), stat)
+
+
+def _delete_nodes(conn: sqlite3.Connection, file_id: int) -> None:
+    for table in _NODE_TABLES:
+        conn.execute(f'DELETE FROM {table} WHERE node_id IN (SELECT id FROM nodes WHERE file_id = ?)', (file_id,))
+    conn.execute('DELETE FROM nodes WHERE file_id = ?', (file_id,))
@@ -0,0 +1,240 @@
+"""
+Streaming extraction from org files, without building the node tree.
+
+>>> import tempfile
+>>> from pathlib import Path
+>>> with tempfile.TemporaryDirectory() as tmp:
+...     path = Path(tmp) / 'metrics.org'
+...     _ = path.write_text('''
+... * TODO Project :work:
+... ** Metrics
+... | day | value |
+... |-----+-------|
+... | mon |     1 |
+... ''')
+...     [(file, heading_path, linenumber, table)] = iter_tables([path])
+>>> heading_path, linenumber
+(('Project', 'Metrics'), 4)
+>>> list(table.as_dicts)
+[{'day': 'mon', 'value': '1'}]
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator
+from datetime import date
+from pathlib import Path
+from typing import Any, NamedTuple, Optional, Union
+
+from .date import OrgDate, OrgDateClock, total_minutes
+from .extra import Table, is_table_row
+from .node import (
+    _TODO_COMMENT_KEYS,
+    RE_NODE_HEADER,
+    OrgBaseNode,
+    OrgEnv,
+    OrgNode,
+    OrgRootNode,
+    _assign_timestamps,
+    _parse_heading_line,
+    lines_to_chunks,
+    parse_comment,
+    parse_seq_todo,
+)
+
+# nodes parsed at once by iter_node_records (timestamps are searched in a single pass over a batch)
+_NODE_BATCH = 256
+
+
+class TableLocation(NamedTuple):
+    file: Path
+    """File the table was found in."""
+    heading_path: tuple[str, ...]
+    """Headings of the enclosing node and its ancestors, outermost first (empty for tables before the first heading)."""
+    linenumber: int
+    """Line number of the first table line (1-indexed)."""
+    table: Table
+
+
+def iter_tables(paths: Iterable[Union[str, Path]]) -> Iterator[TableLocation]:
+    """
+    Find all tables in org files, without parsing them into nodes.
+
+    The tables are the same as the ones in :attr:`orgparse.node.OrgBaseNode.body_rich`,
+    and heading paths are made of :attr:`orgparse.node.OrgNode.heading` (i.e. without TODO keywords and tags).
+
+    Files are read line by line, and only the lines of the current table and the current heading path
+    are kept in memory, so memory usage doesn't depend on the size of the files or their number.
+
+    :arg paths: org files to scan, processed lazily, one by one.
+    """
+    for p in paths:
+        yield from _iter_file_tables(Path(p))
+
+
+def _iter_file_tables(path: Path) -> Iterator[TableLocation]:
+    todo_keys = _scan_todo_keys(path)
+    # (level, heading) of the current node and its ancestors
+    stack: list[tuple[int, str]] = []
+    table: list[str] = []
+    table_start = 0
+
+    def emit() -> TableLocation:
+        return TableLocation(
+            file=path,
+            heading_path=tuple(h for _, h in stack),
+            linenumber=table_start,
+            table=Table(table),
+        )
+
+    with path.open('r', encoding='utf8') as f:
+        for lineno, line in enumerate(f, start=1):
+            if is_table_row(line):
+                if len(table) == 0:
+                    table_start = lineno
+                table.append(line.rstrip('\n'))
+                continue
+            if len(table) > 0:
+                yield emit()
+                table = []
+            if line.startswith('*') and RE_NODE_HEADER.match(line):
+                (heading, level, *_) = _parse_heading_line(line.rstrip('\n'), todo_keys)
+                assert level is not None, line
+                while len(stack) > 0 and stack[-1][0] >= level:
+                    stack.pop()
+                stack.append((level, heading))
+    if len(table) > 0:
+        yield emit()
+
+
+def iter_node_records(paths: Iterable[Union[str, Path]]) -> Iterator[dict[str, Any]]:
+    """
+    Extract the main fields of all nodes in org files as JSON-compatible dicts, without building the node tree.
+
+    This is what ``python -m orgparse dump`` outputs, one object per line:
+
+    >>> import tempfile
+    >>> from pathlib import Path
+    >>> with tempfile.TemporaryDirectory() as tmp:
+    ...     path = Path(tmp) / 'tasks.org'
+    ...     _ = path.write_text('#+FILETAGS: :home:\\n* TODO Garden :outside:\\n  SCHEDULED: <2024-03-01 Fri>\\n')
+    ...     [_, record] = iter_node_records([path])
+    >>> {k: v for k, v in record.items() if k != 'path'}  # doctest: +NORMALIZE_WHITESPACE
+    {'level': 1, 'linenumber': 2, 'heading': 'Garden', 'todo': 'TODO', 'priority': None,
+     'tags': ['home', 'outside'], 'properties': {},
+     'scheduled': {'start': '2024-03-01', 'end': None, 'active': True}, 'deadline': None, 'closed': None,
+     'clocks': []}
+
+    Root nodes (with the lines before the first heading) are included, with level 0 and an empty heading.
+    Tags include inherited ones and ``#+FILETAGS``, same as :attr:`orgparse.node.OrgBaseNode.tags`.
+    Dates are in ISO 8601 format, clock durations are in minutes.
+
+    Files are read line by line and parsed in small batches of nodes,
+    so memory usage doesn't depend on the size of the files or their number.
+
+    :arg paths: org files to read, processed lazily, one by one.
+    """
+    for p in paths:
+        path = Path(p)
+        name = str(path)
+        for node, tags in _iter_file_nodes(path):
+            yield _node_record(name, node, tags)
+
+
+def _iter_file_nodes(path: Path) -> Iterator[tuple[OrgBaseNode, frozenset[str]]]:
+    """
+    Nodes of the file with their tags (including inherited), parsed as in :func:`orgparse.load`, but not linked into a tree.
+    """
+    env = _scan_env(path)
+    # (level, tags) of the current node's ancestors
+    stack: list[tuple[int, frozenset[str]]] = []
+    batch: list[OrgBaseNode] = []
+
+    def parse_batch() -> Iterator[tuple[OrgBaseNode, frozenset[str]]]:
+        scan = ['\n'.join(node._parse_pre()) for node in batch]
+        _assign_timestamps(batch, scan)
+        for node in batch:
+            level = node.level
+            while len(stack) > 0 and stack[-1][0] >= level:
+                stack.pop()
+            tags = frozenset(node.shallow_tags)
+            if len(stack) > 0:
+                tags |= stack[-1][1]
+            stack.append((level, tags))
+            yield (node, tags)
+        batch.clear()
+
+    with path.open('r', encoding='utf8') as f:
+        lineno = 1
+        node_cls: type[OrgBaseNode] = OrgRootNode  # the lines before the first heading go first
+        for chunk in lines_to_chunks(line.rstrip('\n') for line in f):
+            node = node_cls.from_chunk(env, chunk, add_todo_keys=False)
+            node.linenumber = lineno
+            lineno += len(chunk)
+            node_cls = OrgNode
+            batch.append(node)
+            if len(batch) == _NODE_BATCH:
+                yield from parse_batch()
+    if len(batch) > 0:
+        yield from parse_batch()
+
+
+def _node_record(path: str, node: OrgBaseNode, tags: frozenset[str]) -> dict[str, Any]:
+    record: dict[str, Any] = {
+        'path': path,
+        'level': node.level,
+        'linenumber': node.linenumber,
+        'heading': node.heading,
+        'todo': None,
+        'priority': None,
+        'tags': sorted(tags),
+        'properties': dict(node._properties),
+        'scheduled': None,
+        'deadline': None,
+        'closed': None,
+        'clocks': [],
+    }
+    if isinstance(node, OrgNode):
+        record['todo'] = node.todo
+        record['priority'] = node.priority
+        record['scheduled'] = _date_record(node.scheduled)
+        record['deadline'] = _date_record(node.deadline)
+        record['closed'] = _date_record(node.closed)
+        record['clocks'] = [_clock_record(c) for c in node.clock]
+    return record
+
+
+def _date_record(d: OrgDate) -> Optional[dict[str, Any]]:
+    if not d:
+        return None
+    return {'start': _isoformat(d.start), 'end': _isoformat(d.end) if d.has_end() else None, 'active': d.is_active()}
+
+
+def _clock_record(clock: OrgDateClock) -> dict[str, Any]:
+    if not clock.has_end():
+        return {'start': _isoformat(clock.start), 'end': None, 'minutes': None}
+    return {'start': _isoformat(clock.start), 'end': _isoformat(clock.end), 'minutes': round(total_minutes(clock.duration))}
+
+
+def _isoformat(d: date) -> str:
+    return d.isoformat()
+
+
+def _scan_todo_keys(path: Path) -> list[str]:
+    return _scan_env(path).all_todo_keys
+
+
+def _scan_env(path: Path) -> OrgEnv:
+    # NOTE: TODO keywords apply to the whole file, even to the headings before the #+TODO line,
+    # so need a separate (cheap) pass to collect them first
+    env = OrgEnv(filename=str(path))
+    with path.open('r', encoding='utf8') as f:
+        for line in f:
+            parsed = parse_comment(line)
+            if parsed is None:
+                continue
+            (key, vals) = parsed
+            if key.upper() in _TODO_COMMENT_KEYS:
+                for val in vals:
+                    env.add_todo_keys(*parse_seq_todo(val))
+    return env
@@ -0,0 +1,92 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from .. import aload, aload_many, load
+
+
+def write_files(tmp_path: Path, count: int) -> list[Path]:
+    paths = []
+    for i in range(count):
+        p = tmp_path / f'{i}.org'
+        p.write_text(f'#+TODO: WAIT | DONE\n* WAIT Heading {i}\n  SCHEDULED: <2020-01-0{i % 9 + 1} Wed>\n** Child\n')
+        paths.append(p)
+    return paths
+
+
+def test_aload(tmp_path: Path) -> None:
+    [path] = write_files(tmp_path, 1)
+    root = asyncio.run(aload(str(path)))
+    expected = load(path)
+    assert root.env.filename == expected.env.filename
+    assert [str(n) for n in root[:]] == [str(n) for n in expected[:]]
+    assert root.children[0].todo == 'WAIT'
+
+
+class CountingExecutor(ThreadPoolExecutor):
+    def __init__(self) -> None:
+        super().__init__(max_workers=8)
+        self.lock = threading.Lock()
+        self.running = 0
+        self.max_running = 0
+        self.submitted = 0
+
+    def submit(self, fn, /, *args, **kwargs):
+        self.submitted += 1
+
+        def counted():
+            with self.lock:
+                self.running += 1
+                self.max_running = max(self.max_running, self.running)
+            try:
+                time.sleep(0.01)
+                return fn(*args, **kwargs)
+            finally:
+                with self.lock:
+                    self.running -= 1
+
+        return super().submit(counted)
+
+
+def test_aload_many(tmp_path: Path) -> None:
+    paths = write_files(tmp_path, 10)
+
+    async def main(executor):
+        task = asyncio.ensure_future(aload_many(iter(paths), concurrency=3, executor=executor))
+        # the event loop should stay responsive while files are parsed
+        ticks = 0
+        while not task.done():
+            ticks += 1
+            await asyncio.sleep(0.001)
+        return (task.result(), ticks)
+
+    with CountingExecutor() as executor:
+        (roots, ticks) = asyncio.run(main(executor))
+    assert ticks > 1
+    assert [r.children[0].heading for r in roots] == [f'Heading {i}' for i in range(10)]
+    assert 1 <= executor.max_running <= 3
+
+    assert asyncio.run(aload_many([])) == []
+    with pytest.raises(ValueError, match='concurrency'):
+        asyncio.run(aload_many(paths, concurrency=0))
+
+
+def test_aload_many_error(tmp_path: Path) -> None:
+    paths = write_files(tmp_path, 10)
+    paths[1] = tmp_path / 'missing.org'
+
+    async def main(executor):
+        with pytest.raises(FileNotFoundError):
+            await aload_many(paths, concurrency=3, executor=executor)
+        # other workers are cancelled and finished, and don't load anything else
+        assert asyncio.all_tasks() == {asyncio.current_task()}
+        submitted = executor.submitted
+        await asyncio.sleep(0.05)
+        assert executor.submitted == submitted < len(paths)
+
+    with CountingExecutor() as executor:
+        asyncio.run(main(executor))
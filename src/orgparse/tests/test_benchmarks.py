@@ -0,0 +1,63 @@
+import json
+
+import pytest
+
+from .. import loads
+from ..benchmarks.corpus import SHAPES, generate_org
+from ..benchmarks.runner import BENCHMARKS, IMPORT_TIME_BUDGET, main, measure_import_time
+
+
+@pytest.mark.parametrize('preset', list(SHAPES))
+def test_generated_corpus_parses(preset: str) -> None:
+    text = generate_org(50, preset)
+    assert generate_org(50, preset) == text  # deterministic
+    root = loads(text)
+    assert len(root.env.nodes) == 1 + 50
+
+
+def test_generated_corpus_shapes() -> None:
+    deep = loads(generate_org(50, 'deep'))
+    assert max(n.level for n in deep[1:]) > 5
+
+    logbook = loads(generate_org(10, 'logbook'))
+    assert all(len(n.clock) > 0 for n in logbook[1:])
+
+    todos = loads(generate_org(50, 'todos'))
+    assert len(todos.env.todo_keys) > len(('TODO',))
+
+
+def test_runner(tmp_path) -> None:
+    out = tmp_path / 'results.json'
+    main(['--nodes', '20', '--presets', 'wide,logbook', '--repeat', '1', '--output', str(out)])
+    report = json.loads(out.read_text())
+    results = report['results']
+    assert {(r['preset'], r['benchmark']) for r in results} == {(p, b) for p in ('wide', 'logbook') for b in BENCHMARKS}
+    for r in results:
+        assert r['nodes'] == 20
+        assert r['seconds'] >= 0
+        assert r['tracemalloc_peak'] > 0
+    [mem, _] = report['tree_memory']
+    assert mem['tracemalloc_retained'] > 0
+    assert mem['memory_usage']['_lines'] > 0
+    assert report['import_time']['seconds'] > 0
+
+
+def test_runner_scaling(tmp_path) -> None:
+    out = tmp_path / 'results.json'
+    main(['--nodes', '40', '--presets', 'wide', '--benchmarks', 'load', '--repeat', '1', '--no-memory', '--no-import-time', '--scaling', '1,2', '--files', '4', '--output', str(out)])
+    report = json.loads(out.read_text())
+    [scaling] = report['scaling']
+    assert scaling['files'] == 4
+    assert [r['workers'] for r in scaling['runs']] == [1, 2]
+    assert scaling['runs'][0]['speedup'] == 1
+    assert isinstance(report['gil_enabled'], bool)
+    assert report['import_time'] is None
+
+
+def test_import_time() -> None:
+    res = measure_import_time(repeat=1)
+    # rich text, inline markup, writer etc. are only imported when used
+    # NOTE: the time itself depends on the machine, so it's only compared to the budget by the benchmark runner
+    assert res['modules'] == ['orgparse', 'orgparse.date', 'orgparse.node', 'orgparse.profiler']
+    assert res['budget'] == IMPORT_TIME_BUDGET
+    assert isinstance(res['within_budget'], bool)
@@ -0,0 +1,71 @@
+import io
+import json
+from pathlib import Path
+
+import pytest
+
+from .. import cli
+from ..cli import dump, main
+
+
+def write_files(tmp_path: Path, count: int) -> list[Path]:
+    paths = []
+    for i in range(count):
+        path = tmp_path / f'{i}.org'
+        path.write_text(''.join(f'* TODO Task {i}.{j} :f{i}:\n** Sub\n' for j in range(50)))
+        paths.append(path)
+    return paths
+
+
+def test_dump(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setattr(cli, '_BATCH', 7)
+    monkeypatch.setattr(cli, '_QUEUE_SIZE', 2)
+    paths = write_files(tmp_path, 5)
+    out = io.StringIO()
+    dump(paths, out)
+    lines = out.getvalue().splitlines()
+    assert len(lines) == 5 * 101
+    records = [json.loads(line) for line in lines]
+    assert [r['path'] for r in records[:: 101]] == [str(p) for p in paths]
+    assert records[2] == {
+        'path': str(paths[0]),
+        'level': 2,
+        'linenumber': 2,
+        'heading': 'Sub',
+        'todo': None,
+        'priority': None,
+        'tags': ['f0'],
+        'properties': {},
+        'scheduled': None,
+        'deadline': None,
+        'closed': None,
+        'clocks': [],
+    }
+
+    for jobs in [2, 8]:
+        parallel = io.StringIO()
+        dump(iter(paths), parallel, jobs=jobs)
+        assert parallel.getvalue() == out.getvalue()
+
+
+def test_dump_errors(tmp_path: Path) -> None:
+    paths = write_files(tmp_path, 3)
+    paths[1].write_bytes(b'* invalid \xff utf8\n')
+    for jobs in [1, 2]:
+        out = io.StringIO()
+        with pytest.raises(ValueError, match=r'1\.org'):
+            dump(paths, out, jobs=jobs)
+        # files before the failed one were written
+        assert len(out.getvalue().splitlines()) == 101
+
+
+def test_main(tmp_path: Path, capsys) -> None:
+    (path,) = write_files(tmp_path, 1)
+    main(['dump', '-j', '2', str(path), str(path)])
+    assert len(capsys.readouterr().out.splitlines()) == 2 * 101
+
+    with pytest.raises(SystemExit, match='No such file'):
+        main(['dump', str(tmp_path / 'missing.org')])
+    with pytest.raises(SystemExit):
+        main(['dump', '-j', '0', str(path)])
+    assert 'at least 1' in capsys.readouterr().err
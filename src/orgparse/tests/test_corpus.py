@@ -0,0 +1,91 @@
+import os
+from datetime import date, datetime
+from pathlib import Path
+
+from .. import OrgCorpus
+
+WORK = '''\
+#+FILETAGS: :work:
+* TODO Report :urgent:
+  SCHEDULED: <2024-03-01 Fri>
+  :PROPERTIES:
+  :ID: report
+  :Effort: 1:00
+  :END:
+** Draft
+   Meeting <2024-03-05 Tue 10:00>--<2024-03-05 Tue 11:00>
+* Conference
+  <2024-02-28 Wed>--<2024-03-02 Sat>
+'''
+
+HOME = '''\
+* Garden :outside:
+  :PROPERTIES:
+  :ID: garden
+  :Effort: 0:30
+  :END:
+  CLOSED: [2024-03-10 Sun 12:00]
+'''
+
+
+def headings(nodes) -> list[str]:
+    return [n.heading for n in nodes]
+
+
+def test_corpus(tmp_path: Path) -> None:
+    (tmp_path / 'projects').mkdir()
+    (tmp_path / 'projects' / 'work.org').write_text(WORK)
+    (tmp_path / 'home.org').write_text(HOME)
+    (tmp_path / 'notes.txt').write_text('* not org')
+    (tmp_path / '.git').mkdir()
+    (tmp_path / '.git' / 'ignored.org').write_text('* ignored :work:')
+    (tmp_path / 'projects' / 'old.org').write_text('* ignored :work:')
+
+    corpus = OrgCorpus(tmp_path, ignore=['.git', 'projects/old.*'], max_workers=2)
+    assert corpus.files == [tmp_path / 'home.org', tmp_path / 'projects' / 'work.org']
+    assert len(corpus) == 2
+    assert len(list(corpus)) == sum(len(root) for root in corpus.roots.values())
+
+    # same as querying the trees directly
+    for tag in ['work', 'urgent', 'outside', 'missing']:
+        assert corpus.with_tag(tag) == [n for n in corpus if tag in n.tags]
+    assert headings(corpus.with_tag('urgent')) == ['Report', 'Draft']
+    assert headings(corpus.with_property('Effort')) == ['Garden', 'Report']
+    assert headings(corpus.with_property('Effort', 60)) == ['Report']
+    assert corpus.by_id('report') is corpus.roots[tmp_path / 'projects' / 'work.org'].children[0]
+    assert corpus.by_id('missing') is None
+
+    def dates(start, end) -> list[tuple[str, str]]:
+        return [(str(d), n.heading) for d, n in corpus.dates(start, end)]
+
+    assert dates(None, None) == [
+        ('<2024-02-28 Wed>--<2024-03-02 Sat>', 'Conference'),
+        ('<2024-03-01 Fri>', 'Report'),
+        ('<2024-03-05 Tue 10:00--11:00>', 'Draft'),
+        ('[2024-03-10 Sun 12:00]', 'Garden'),
+    ]
+    # ranges overlapping with the start are included, dates are whole days
+    assert headings(n for _, n in corpus.dates(date(2024, 3, 2), date(2024, 3, 5))) == ['Conference', 'Draft']
+    assert dates(datetime(2024, 3, 5, 11, 30), date(2024, 3, 10)) == [('[2024-03-10 Sun 12:00]', 'Garden')]
+    assert dates(date(2024, 3, 11), None) == []
+    assert dates(datetime(2024, 3, 1, 12, 0), datetime(2024, 3, 1, 13, 0)) == [
+        ('<2024-02-28 Wed>--<2024-03-02 Sat>', 'Conference'),
+        ('<2024-03-01 Fri>', 'Report'),
+    ]
+
+    # nothing changed
+    assert corpus.refresh() == ([], [], [])
+
+    (tmp_path / 'home.org').unlink()
+    (tmp_path / 'projects' / 'more.org').write_text('* Another report :urgent:\n:PROPERTIES:\n:ID: garden\n:END:\n')
+    work = tmp_path / 'projects' / 'work.org'
+    work.write_text(WORK.replace('#+FILETAGS: :work:', ''))
+    st = work.stat()
+    os.utime(work, ns=(st.st_atime_ns, st.st_mtime_ns + 1))
+    changes = corpus.refresh()
+    assert changes == ([tmp_path / 'projects' / 'more.org'], [work], [tmp_path / 'home.org'])
+    assert corpus.with_tag('work') == []
+    assert corpus.with_tag('outside') == []
+    assert headings(corpus.with_tag('urgent')) == ['Another report', 'Report', 'Draft']
+    assert headings([corpus.by_id('garden')]) == ['Another report']
+    assert headings(n for _, n in corpus.dates(None, None)) == ['Conference', 'Report', 'Draft']
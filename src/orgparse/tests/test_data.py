@@ -5,6 +5,7 @@ from pathlib import Path
 import pytest
 
 from .. import load, loads
+from ..node import OrgEnv
 
 DATADIR = Path(__file__).parent / 'data'
 
@@ -155,3 +156,37 @@ def test_commented_property_is_ignored_by_node_get_property():
     [node] = root.children[0]
     assert node.heading == "Heading"
     assert node.get_property("PROPER-TEA") is None
+
+
+@pytest.mark.parametrize('dataname', get_datanames())
+def test_columnar_same_as_default(dataname):
+    oname = data_path(dataname, "org")
+    root = load(oname)
+    columnar = load(oname, env=OrgEnv(filename=str(oname), columnar=True))
+    assert columnar.env.store is not None
+    assert root.env.todo_keys == columnar.env.todo_keys
+    assert root.env.done_keys == columnar.env.done_keys
+    assert len(root.env.nodes) == len(columnar.env.nodes)
+    for n1, n2 in zip(root[:], columnar[:]):
+        for attr in [
+            'heading',
+            'level',
+            'linenumber',
+            'todo',
+            'priority',
+            'tags',
+            'properties',
+            'body',
+            'datelist',
+            'rangelist',
+            'scheduled',
+            'deadline',
+            'closed',
+            'clock',
+            'repeated_tasks',
+        ]:
+            if n1.is_root() and attr in {'todo', 'priority', 'scheduled', 'deadline', 'closed', 'clock', 'repeated_tasks'}:
+                continue
+            assert getattr(n1, attr) == getattr(n2, attr), (attr, n1)
+        assert [c.linenumber for c in n1.children] == [c.linenumber for c in n2.children]
+        assert (n1.parent and n1.parent.linenumber) == (n2.parent and n2.parent.linenumber)
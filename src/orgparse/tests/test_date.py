@@ -1,11 +1,19 @@
 import datetime
+import re
 
+import pytest
+
+from orgparse import date, node
 from orgparse.date import (
+    PLANNING_RE,
+    TIMESTAMP_RE,
     OrgDate,
     OrgDateClock,
     OrgDateClosed,
     OrgDateDeadline,
     OrgDateScheduled,
+    compile_sdc_re,
+    parse_sdc,
 )
 
 
@@ -46,3 +54,31 @@ def test_date_as_datetime() -> None:
 
     assert OrgDate._as_datetime(datetime.date(*testdate)) == datetime.datetime(*testdate, 0, 0, 0)
     assert OrgDate._as_datetime(datetime.datetime(*testdatetime)) == datetime.datetime(*testdatetime)
+
+
+def test_parse_sdc() -> None:
+    (s, d, c) = parse_sdc('  DEADLINE: <2021-09-05 Sun 10:00-11:30 +1w> CLOSED: [2021-09-03 Fri 16:19]')
+    assert not s
+    assert d == OrgDateDeadline((2021, 9, 5, 10, 0), (2021, 9, 5, 11, 30))
+    assert d._repeater == ('+', 1, 'w')
+    assert c == OrgDateClosed((2021, 9, 3, 16, 19))
+
+    # brackets have to match the keyword
+    (s, d, c) = parse_sdc('SCHEDULED: [2021-09-03 Fri] CLOSED: <2021-09-03 Fri>')
+    assert not s
+    assert not d
+    assert not c
+
+
+def test_lazy_patterns() -> None:
+    assert TIMESTAMP_RE.search('x <2021-09-03 Fri>') is not None
+    assert PLANNING_RE.search('CLOSED: [2021-09-03 Fri]') is not None
+    assert compile_sdc_re('DEADLINE').search('DEADLINE: <2021-09-03 Fri>') is not None
+    assert node.RE_ORG_DURATION_FULL.fullmatch('1d 2h') is not None
+    # compiled once, then stored on the class
+    assert OrgDateClock._re is OrgDateClock._re
+    assert isinstance(OrgDateClock.__dict__['_re'], re.Pattern)
+    assert OrgDateDeadline.from_str('DEADLINE: <2021-09-03 Fri>') == OrgDateDeadline((2021, 9, 3))
+    assert isinstance(OrgDateDeadline.__dict__['_re'], re.Pattern)
+    with pytest.raises(AttributeError):
+        date.NO_SUCH_RE  # noqa: B018
@@ -0,0 +1,125 @@
+from pathlib import Path
+from typing import Optional, cast
+
+import pytest
+
+from .. import LinkGraph, OrgCorpus, loads
+from ..links import Adjacency
+from ..node import _EMPTY_DICT, OrgRootNode
+
+A = '''\
+* Index
+  :PROPERTIES:
+  :ID: index
+  :END:
+  [[id:b-node][B]], [[file:b.org::*Second][second]], [[file:b.org]], [[file:missing.org]]
+* Local
+  [[Index]] [[*Missing]] [[mailto:someone@example.com]]
+'''
+
+B = '''\
+#+TITLE: b
+* First
+  :PROPERTIES:
+  :ID: b-node
+  :CUSTOM_ID: first
+  :END:
+  Back to [[id:index][index]] and [[id:nowhere]].
+* Second
+  [[file:a.org::#nope]] [[./a.org::Local]]
+'''
+
+
+def describe(graph: LinkGraph, corpus: OrgCorpus) -> list[tuple[str, str, Optional[str]]]:
+    res = []
+    for node in corpus:
+        for link, target in graph.links(node):
+            res.append((node.heading, link.target, None if target is None else target.heading))
+    return res
+
+
+def test_link_graph(tmp_path: Path) -> None:
+    (tmp_path / 'a.org').write_text(A)
+    (tmp_path / 'b.org').write_text(B)
+    corpus = OrgCorpus(tmp_path)
+    graph = LinkGraph.from_corpus(corpus)
+    assert describe(graph, corpus) == [
+        ('Index', 'id:b-node', 'First'),
+        ('Index', 'file:b.org::*Second', 'Second'),
+        ('Index', 'file:b.org', ''),
+        ('Index', 'file:missing.org', None),
+        ('Local', 'Index', 'Index'),
+        ('Local', '*Missing', None),
+        ('Local', 'mailto:someone@example.com', None),
+        ('First', 'id:index', 'Index'),
+        ('First', 'id:nowhere', None),
+        ('Second', 'file:a.org::#nope', None),
+        ('Second', './a.org::Local', 'Local'),
+    ]
+    [index, local] = corpus.roots[tmp_path / 'a.org'].children
+    assert [(s.heading, link.target) for s, link in graph.backlinks(index)] == [('Local', 'Index'), ('First', 'id:index')]
+    assert [s.heading for s, _ in graph.backlinks(local)] == ['Second']
+    # indexing doesn't allocate properties for the nodes which have none
+    assert [n.heading for n in corpus if n._properties is not _EMPTY_DICT] == ['Index', 'First']
+
+    def check_arrays() -> None:
+        nodes = list(corpus)
+        (forward, backward) = (graph.forward, graph.backward)
+        assert forward.nodes == backward.nodes == nodes
+        for i, node in enumerate(nodes):
+            targets = [nodes[j] for j in forward.targets[forward.offsets[i] : forward.offsets[i + 1]]]
+            assert targets == [t for _, t in graph.links(node) if t is not None]
+            sources = [nodes[j] for j in backward.targets[backward.offsets[i] : backward.offsets[i + 1]]]
+            assert sources == [s for s, _ in graph.backlinks(node)]
+
+    check_arrays()
+    assert isinstance(graph.forward, Adjacency)
+
+    # ID moves to another file, b.org is deleted
+    (tmp_path / 'b.org').unlink()
+    (tmp_path / 'c.org').write_text('* Third\n  :PROPERTIES:\n  :ID: b-node\n  :END:\n  [[id:index]]\n')
+    graph.update_from(corpus, corpus.refresh())
+    [third] = corpus.roots[tmp_path / 'c.org'].children
+    assert [(link.target, t) for link, t in graph.links(index)][:3] == [
+        ('id:b-node', third),
+        ('file:b.org::*Second', None),
+        ('file:b.org', None),
+    ]
+    assert [(s.heading, link.target) for s, link in graph.backlinks(index)] == [('Local', 'Index'), ('Third', 'id:index')]
+    assert graph.backlinks(local) == []
+    check_arrays()
+
+    # the same graph as built from scratch
+    fresh = LinkGraph.from_corpus(corpus)
+    assert describe(fresh, corpus) == describe(graph, corpus)
+
+
+def loads_root(text: str) -> OrgRootNode:
+    return cast(OrgRootNode, loads(text))
+
+
+def test_link_graph_in_memory() -> None:
+    text = '* Target\n* Source\n  [[Target]]\n'
+    (one, two) = (loads_root(text), loads_root(text))
+    graph = LinkGraph([one, two])
+    # documents loaded from strings don't collide, even though they have the same filename
+    for root in (one, two):
+        (target, source) = root.children
+        assert [t for _, t in graph.links(source)] == [target]
+        assert [s for s, _ in graph.backlinks(target)] == [source]
+
+    with pytest.raises(ValueError, match='Duplicate document'):
+        LinkGraph([one, one])
+
+    # named documents are replaced by new versions
+    graph.update(loads_root('* Target'), name='notes')
+    new = loads_root(text.replace('[[Target]]', '[[*Target]]'))
+    graph.update(new, name='notes')
+    assert [link.target for link, _ in graph.links(new.children[1])] == ['*Target']
+    assert len(graph.forward.nodes) == 3 * len(one)
+
+    graph.remove(one)
+    graph.remove('notes')
+    assert graph.forward.nodes == list(two)
+    with pytest.raises(KeyError):
+        graph.links(one.children[1])
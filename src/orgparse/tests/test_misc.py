@@ -1,11 +1,17 @@
 import io
+import pickle
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
 
 import pytest
 
-from orgparse.date import OrgDate
+from orgparse.date import OrgDate, OrgDateClock, OrgDateRepeatedTask
 
-from .. import load, loads
-from ..node import OrgEnv
+from .. import load, load_many, loadb, loadi, loads
+from ..inline import InlineText, to_plain_text
+from ..node import _EMPTY_DICT, OrgEnv
+from ..profiler import Profiler
 
 
 def test_empty_heading() -> None:
@@ -302,3 +308,446 @@ def test_date_with_cookies() -> None:
         output = root[1].scheduled
         assert str(output) == expected_str
         assert repr(output) == expected_repr
+
+
+def test_logbook_drawer() -> None:
+    content = '''
+* TODO heading <2020-01-01 Wed>
+  :LOGBOOK:
+  - State "DONE"       from "TODO"       [2020-01-03 Fri 10:00]
+  CLOCK: [2020-01-02 Thu 10:00]--[2020-01-02 Thu 11:00] =>  1:00
+  - Note taken on [2020-01-02 Thu 12:00] \\\\
+    some note
+  CLOCK: [2020-01-02 Thu 09:00]
+  :END:
+  :NOTES:
+  <2020-02-02 Sun>
+  :END:
+  body <2020-03-03 Tue>
+  :notadrawer:
+  <2020-04-04 Sat>
+    '''
+    [node] = loads(content).children
+    assert node.clock == [
+        OrgDateClock((2020, 1, 2, 10, 0), (2020, 1, 2, 11, 0), 60),
+        OrgDateClock((2020, 1, 2, 9, 0)),
+    ]
+    assert node.repeated_tasks == [OrgDateRepeatedTask((2020, 1, 3, 10, 0), 'TODO', 'DONE')]
+    # drawer contents are not reported unless asked
+    assert node.datelist == [OrgDate((2020, 1, 1)), OrgDate((2020, 3, 3)), OrgDate((2020, 4, 4))]
+    # entries are removed from the body, but the rest of the drawer stays
+    assert node.body.splitlines()[:4] == [
+        '  :LOGBOOK:',
+        '  - Note taken on [2020-01-02 Thu 12:00] \\\\',
+        '    some note',
+        '  :END:',
+    ]
+
+    env = OrgEnv(filename='<string>', timestamps_in_drawers=True)
+    [node] = loads(content, env=env).children
+    assert node.datelist == [
+        OrgDate((2020, 1, 1)),
+        OrgDate((2020, 1, 2, 12, 0), active=False),
+        OrgDate((2020, 2, 2)),
+        OrgDate((2020, 3, 3)),
+        OrgDate((2020, 4, 4)),
+    ]
+
+
+def test_timestamps_assigned_to_nodes() -> None:
+    # lots of timestamps on a single line used to hit recursion limit
+    many = ' '.join(['<2020-01-01 Wed>'] * 5000)
+    root = loads(f'''
+root <2019-12-31 Tue>
+* h1 [2020-01-01 Wed]
+* h2
+  {many}
+  :PROPERTIES:
+  :CREATED: <2020-01-02 Thu>
+  :END:
+* h3
+** h4 <2020-01-03 Fri>--<2020-01-04 Sat>
+  <2020-01-05 Sun
+  10:00>
+''')
+    (h1, h2, h3, h4) = root[1:]
+    assert root.datelist == [OrgDate((2019, 12, 31))]
+    assert h1.datelist == [OrgDate((2020, 1, 1), active=False)]
+    assert len(h2.datelist) == 5000
+    assert h3.datelist == []
+    assert h4.rangelist == [OrgDate((2020, 1, 3), (2020, 1, 4))]
+    # timestamps don't span lines
+    assert h4.datelist == []
+
+
+@pytest.mark.parametrize('text', [
+    '',
+    '\n',
+    '* h',
+    'root\n* h1\n\n** h2\nbody\n\n',
+    '* h1\r\n** h2\r\nbody\r\n',
+    'root\rmore\n* h',
+    '\n\n* h1 * not a heading\n*not a heading\n',
+])  # fmt: skip
+def test_text_parsing_same_as_lines(text: str) -> None:
+    def dump(root):
+        return [(n.linenumber, n.level, n._lines, n._body_lines, n._timestamps) for n in root]
+
+    assert dump(loads(text)) == dump(loadi(text.splitlines()))
+    assert dump(load(io.StringIO(text))) == dump(loadi(l.rstrip('\n') for l in io.StringIO(text)))
+
+
+def test_profiler() -> None:
+    text = '''
+#+TODO: TODO | DONE CANCELLED
+* TODO heading <2020-01-01 Wed>
+  SCHEDULED: <2020-01-02 Thu>
+  - State "TODO"       from "DONE"       [2020-01-02 Thu 09:00]
+  :LOGBOOK:
+  CLOCK: [2020-01-01 Wed 10:00]--[2020-01-01 Wed 11:00] =>  1:00
+  - State "DONE"       from "TODO"       [2020-01-01 Wed 11:00]
+  :END:
+  body [2020-01-03 Fri]
+** CANCELLED child
+'''
+    profiler = Profiler()
+    root = loads(text, profiler=profiler)
+    plain = loads(text)
+    assert sys.getprofile() is None
+    assert root.env.parse_stats is profiler.stages
+    # instrumentation doesn't change the results, e.g. order of state changes from different stages
+    def summary(node):
+        return (node.todo, node.scheduled, node.clock, node.repeated_tasks, node.datelist, node.properties, node.body)
+
+    assert [summary(n) for n in root[1:]] == [summary(n) for n in plain[1:]]
+    assert [t.after for t in root[1].repeated_tasks] == ['TODO', 'DONE']
+
+    stats = profiler.stages
+    assert stats['heading'].calls == 2
+    assert stats['chunking'].lines == len(text.splitlines())
+    assert stats['total'].time >= stats['heading'].time
+    assert stats['timestamp_search'].regex_calls > 0
+
+    # statistics are cumulative
+    loadi(text.splitlines(), profiler=profiler)
+    assert profiler.stages['heading'].calls == 4
+    assert profiler.as_dict()['heading']['calls'] == 4
+
+    noregex = Profiler(count_regex=False)
+    loads(text, profiler=noregex)
+    assert noregex.stages['total'].regex_calls == 0
+
+
+def test_memory_usage() -> None:
+    root = loads('''
+* TODO heading
+  :PROPERTIES:
+  :Effort: 1:00
+  :END:
+  CLOCK: [2020-01-01 Wed 10:00]--[2020-01-01 Wed 11:00] =>  1:00
+** child
+* other
+''')
+    by_field = root.memory_usage()
+    by_level = root.memory_usage(by='level')
+    by_node = root.memory_usage(by='node')
+    # same objects counted once regardless of grouping
+    assert sum(by_field.values()) == sum(by_level.values()) == sum(by_node.values())
+    assert sorted(by_node) == [0, 1, 2, 3]
+    assert by_field['_properties'] > 0
+    assert by_field['_clocklist'] > 0
+
+    shallow = root.memory_usage(deep=False)
+    assert shallow['_lines'] < by_field['_lines']
+
+    # non-root nodes only account for their subtree
+    [h1, h2] = root.children
+    assert sorted(h1.memory_usage(by='node')) == [1, 2]
+    assert sorted(h2.memory_usage(by='node')) == [3]
+
+    with pytest.raises(ValueError, match='by should be'):
+        root.memory_usage(by='whatever')
+
+
+def test_compact_nodes() -> None:
+    root = loads('''
+* empty
+* full :tag:
+  :PROPERTIES:
+  :Effort: 1:00
+  :END:
+  CLOCK: [2020-01-01 Wed 10:00]--[2020-01-01 Wed 11:00] =>  1:00
+''')
+    [empty, full] = root.children
+    for x in [root, empty, empty.scheduled, full.clock[0]]:
+        assert not hasattr(x, '__dict__')
+
+    # empty values still have the usual types
+    assert empty.clock == []
+    assert empty.repeated_tasks == []
+    assert empty.tags == set()
+    assert empty.get_property('Effort') is None
+    props = empty.properties
+    assert props == {}
+    assert type(props) is dict
+    # reading properties doesn't allocate them for the node
+    assert empty._properties is _EMPTY_DICT
+
+    [restored, _, restored_full] = list(pickle.loads(pickle.dumps(root)))
+    assert restored_full.clock == full.clock
+    assert restored_full.properties == {'Effort': 60}
+    assert restored.properties == {}
+    restored.set_property('x', 'y')
+    assert restored.get_property('x') == 'y'
+
+
+@pytest.mark.parametrize('protocol', range(pickle.HIGHEST_PROTOCOL + 1))
+def test_pickle_protocols(protocol: int) -> None:
+    root = loads('''
+* TODO heading :tag:
+  SCHEDULED: <2020-01-01 Wed +1w> DEADLINE: <2020-01-02 Thu>
+  :PROPERTIES:
+  :Effort: 1:00
+  :END:
+  - State "DONE" from "TODO" [2019-12-25 Wed 10:00]
+  CLOCK: [2020-01-01 Wed 10:00]--[2020-01-01 Wed 11:00] =>  1:00
+** child <2020-01-03 Fri>
+''')
+    restored = pickle.loads(pickle.dumps(root, protocol=protocol))
+    assert str(restored) == str(root)
+    assert type(restored) is type(root)
+    for node, rnode in zip(root[1:], restored[1:]):
+        assert type(rnode) is type(node)
+        assert rnode.heading == node.heading
+        assert rnode.properties == node.properties
+        assert rnode.scheduled == node.scheduled
+        assert rnode.deadline == node.deadline
+        assert rnode.clock == node.clock
+        assert rnode.repeated_tasks == node.repeated_tasks
+        assert rnode.datelist == node.datelist
+    assert restored[1].children == [restored[2]]
+
+
+def test_columnar_store_is_lazy() -> None:
+    text = '\n'.join(f'* heading {i}\n** child {i}\n  SCHEDULED: <2020-01-01 Wed>' for i in range(100))
+    root = loads(text, env=OrgEnv(filename='<string>', columnar=True))
+    store = root.env.store
+    assert store is not None
+    assert len(store) == 201
+    assert sum(1 for n in store._cache if n is not None) == 1  # just the root
+
+    top = root.children
+    assert len(top) == 100
+    assert sum(1 for n in store._cache if n is not None) == 101
+
+    [child] = top[42].children
+    assert child.heading == 'child 42'
+    assert child.parent is top[42]
+    assert child.scheduled.start.year == 2020
+    assert list(store.find(level=2))[:2] == [2, 4]
+    assert list(store.find(todo='NOSUCHTODO')) == []
+
+
+def test_columnar_store_limits() -> None:
+    # deep headings and lots of TODO keywords
+    todos = [f'T{i}' for i in range(300)]
+    text = f'#+TODO: {" ".join(todos)} | DONE\n' + '\n'.join(f'{"*" * (i + 1)} {todos[i]} [#B] heading {i}' for i in range(300))
+    columnar = loads(text, env=OrgEnv(filename='<string>', columnar=True))
+    default = loads(text)
+    store = columnar.env.store
+    assert store is not None
+    assert [(store.todo(i), store.priority(i)) for i in range(1, len(store))] == [(t, 'B') for t in todos]
+    assert list(store.find(todo='T299')) == [300]
+    for c, d in zip(columnar[1:], default[1:]):
+        assert (c.level, c.todo, c.parent.heading, [n.heading for n in c.children]) == (
+            d.level,
+            d.todo,
+            d.parent.heading,
+            [n.heading for n in d.children],
+        )
+
+
+@pytest.mark.parametrize('text', [
+    '',
+    '* h',
+    '#+TODO: WAIT | DONE\n* WAIT Hëading :tâg:\n  Bödy <2020-01-01 Wed>\n** DONE Ünder\n* Last',
+    'röot\r\n* h1\r\n** h2\r\nbody\rmore\n',
+])  # fmt: skip
+def test_loadb_same_as_load(text: str, tmp_path) -> None:
+    def dump(root):
+        return [(n.linenumber, n.level, n.heading, n.tags, n.body, n._timestamps, n.todo if n.level > 0 else None) for n in root]
+
+    path = tmp_path / 'doc.org'
+    path.write_bytes(text.encode('utf8'))
+    expected = dump(load(path))
+    data = path.read_bytes()
+    for root in [
+        loadb(data),
+        loadb(memoryview(bytearray(data))),
+        loadb(data, env=OrgEnv(filename='<bytes>')),
+        load(path, env=OrgEnv(filename=str(path), columnar=True)),
+    ]:
+        assert dump(root) == expected
+
+
+def test_loadb_decodes_lazily() -> None:
+    data = b'#+TODO: T | D\n* T first\n  \xff invalid\n* second\n  body'
+    root = loadb(data)
+    store = root.env.store
+    assert store is not None
+    assert isinstance(store.text, bytes)
+    assert [store.heading(i) for i in range(1, len(store))] == ['first', 'second']
+    assert store.todo(1) == 'T'
+    assert store[2].body == '  body'
+    with pytest.raises(UnicodeDecodeError):
+        store.node(1)
+    with pytest.raises(UnicodeDecodeError):
+        loadb(b'* \xff')
+
+
+def test_load_many(tmp_path) -> None:
+    paths = []
+    for i in range(20):
+        p = tmp_path / f'{i}.org'
+        p.write_text(f'#+TODO: T{i} | D{i}\n* T{i} heading {i}\n| a | b |\n|---+---|\n| 1 | 2 |\n')
+        paths.append(p)
+    roots = load_many(paths, max_workers=4)
+    for i, root in enumerate(roots):
+        [h] = root.children
+        assert (h.todo, h.heading) == (f'T{i}', f'heading {i}')
+        assert root.env.todo_keys == [f'T{i}']
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        assert [r.env.filename for r in load_many(paths, executor=executor)] == [str(p) for p in paths]
+
+
+def test_columnar_store_threads() -> None:
+    text = '\n'.join(f'* heading {i}' for i in range(200))
+    root = loads(text, env=OrgEnv(filename='<string>', columnar=True))
+    store = root.env.store
+    assert store is not None
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(lambda _: [store[i] for i in range(len(store))], range(8)))
+    # all threads get the same node objects
+    for nodes in results:
+        assert all(a is b for a, b in zip(nodes, results[0]))
+
+
+def test_columnar_store_pickle() -> None:
+    root = loadb(b'#+TODO: T | D\n* T heading :tag:\n  body\n** child\n* other')
+    assert root.children[0].heading == 'heading'  # some of the nodes are created already
+    restored = pickle.loads(pickle.dumps(root))
+    store = restored.env.store
+    assert store is not None
+    assert [(n.heading, n.todo, n.body) for n in restored[1:]] == [(n.heading, n.todo, n.body) for n in root[1:]]
+    assert restored.children[0].children[0].parent is restored.children[0]
+    # the lock is recreated
+    assert store.node(3) is store.node(3)
+
+
+def test_interning() -> None:
+    text = '''
+#+TODO: TODO WAITING | DONE
+* WAITING heading 1 :work:home:
+  :PROPERTIES:
+  :CATEGORY: cat
+  :END:
+* WAITING heading 2 :work:home:
+  :PROPERTIES:
+  :CATEGORY: cat
+  :END:
+'''
+    [n1, n2] = loads(text).children
+    [m1, _] = loads(text).children
+    # shared between nodes and documents
+    assert n1._tags is n2._tags is m1._tags
+    assert n1.todo is n2.todo is m1.todo
+    [k1] = n1.properties.keys()
+    [k2] = m1.properties.keys()
+    assert k1 is k2
+    # public API still returns mutable sets
+    tags = n1.tags
+    assert tags == {'work', 'home'}
+    tags.add('extra')
+    assert n1.tags == {'work', 'home'}
+
+
+def test_cached_text() -> None:
+    root = loads('''
+* [[https://example.com][link]] heading
+  body with [[https://example.com][a link]]
+* plain heading
+  plain body
+''')
+    [n1, n2] = root.children
+    assert n1.heading == 'link heading'
+    assert n1.get_heading(format='raw') == '[[https://example.com][link]] heading'
+    assert n1.body == '  body with a link'
+    # memoised
+    assert n1.body is n1.body
+    assert n1.heading is n1.heading
+    # no links: plain text is the same object as raw
+    assert n2.body is n2.get_body(format='raw')
+
+    # rich text isn't cached, since it's an iterator
+    assert len(list(n1.body_rich)) == len(list(n1.body_rich)) > 0
+
+    n1._heading = 'changed'
+    n1._invalidate_text()
+    assert n1.heading == 'changed'
+
+    with pytest.raises(ValueError, match='not supported'):
+        n1.get_body(format='whatever')
+
+
+def test_inline_markup() -> None:
+    node = loads('''
+* TODO *Important* [[id:123][meeting]] <2020-01-01 Wed 10:00>
+  Notes with =code [[not a link]]=, a footnote[fn:1] and /italic [[https://example.com][link]]/.
+  Also [2020-01-02 Thu]--[2020-01-03 Fri].
+''').children[0]
+    body = node.body_inline
+    assert body is node.body_inline  # cached
+    assert ''.join(t.raw for t in body.tokens) == node.get_body(format='raw')
+    assert [link.target for link in body.links] == ['https://example.com']  # verbatim contents aren't markup
+    assert [(e.kind, e.contents) for e in body.emphasis] == [
+        ('verbatim', 'code [[not a link]]'),
+        ('italic', 'italic [[https://example.com][link]]'),
+    ]
+    assert [f.label for f in body.footnotes] == ['1']
+    [ts] = body.timestamps
+    assert [d.has_end() for d in ts.dates] == [True]
+    # plain text is derived from the same scan
+    assert node.body == '  Notes with =code not a link=, a footnote[fn:1] and /italic link/.\n  Also [2020-01-02 Thu]--[2020-01-03 Fri].'
+    assert node._text_cache is not None
+    assert node._text_cache[('body', 'inline')] is body
+
+    heading = node.heading_inline
+    assert [link.description for link in heading.links] == ['meeting']
+    assert node.heading == '*Important* meeting <2020-01-01 Wed 10:00>'
+
+
+def test_inline_markup_unclosed() -> None:
+    # unclosed emphasis doesn't hide emphasis on the next line, or after a [[ which isn't a link
+    text = '*a *b [[c]] *d\n*e* [[f *g*'
+    assert [e.raw for e in InlineText(text).emphasis] == ['*e*', '*g*']
+
+    # lots of unclosed emphasis markers on a single line used to take quadratic time
+    text = ' *a' * 100_000 + ' [[x][y]] /z/'
+    start = time.perf_counter()
+    assert to_plain_text(text) == ' *a' * 100_000 + ' y /z/'
+    assert [e.raw for e in InlineText(text).emphasis] == ['/z/']
+    assert time.perf_counter() - start < 5
+
+
+def test_inline_links_unclosed() -> None:
+    # [[ which isn't a link doesn't hide links/emphasis after it, links can span lines
+    text = '[[a [[b]] [[c] *d [[e]]* [[f\ng]]'
+    assert [(link.target, link.description) for link in InlineText(text).links] == [('a [[b', None), ('e', None), ('f\ng', None)]
+    assert [e.raw for e in InlineText(text).emphasis] == ['*d [[e]]*']
+
+    # lots of unclosed links used to take quadratic time, also in emphasis
+    for text in ['[[' * 100_000 + ']', '*a [[ ' * 100_000 + ']']:
+        start = time.perf_counter()
+        assert to_plain_text(text + ' [[x][y]] /z/') == text + ' y /z/'
+        assert [e.raw for e in InlineText(text + ' /z/').emphasis] == ['/z/']
+        assert time.perf_counter() - start < 5
@@ -2,10 +2,13 @@
 Tests for rich formatting: tables etc.
 '''
 
+import importlib.util
+from datetime import date
+
 import pytest
 
 from .. import loads
-from ..extra import Table
+from ..extra import Table, infer_column
 
 
 def test_table() -> None:
@@ -85,5 +88,84 @@ return fname
     assert ilen(t.as_dicts) == 3
 
 
+def test_table_pathological_lines() -> None:
+    # used to backtrack exponentially on a long line starting with a pipe
+    line = '|' + 'x' * 10_000
+    root = loads(f'''
+* item
+{line}
+| a | b |
+|-------+---|
+| c | d |
+''')
+    [_, t] = root.children[0].body_rich
+    assert list(t.rows) == [['a', 'b'], ['c', 'd']]
+
+
+def test_table_parsed_once() -> None:
+    t = Table(['| a | b |', '|---+---|', '| 1 | 2 |'])
+    rows = list(t.rows)
+    assert next(t.rows) is rows[0]
+    assert ilen(t.blocks) == 2
+    assert list(t.as_dicts) == [{'a': '1', 'b': '2'}]
+    assert t._pre_rows() is t._pre_rows()
+
+
+TABLE_COLUMNS = [
+    '| item | qty | price | effort | done             | note |',
+    '|------+-----+-------+--------+------------------+------|',
+    '| a    |   1 |   0.5 |   1:00 | [2020-11-05 Thu] | x    |',
+    '| b    |     |     2 |   3h   |                  |   42 |',
+    '| c    |   3 |       |        | [2020-11-07 Sat] |      |',
+]
+
+
+def test_table_to_columns() -> None:
+    t = Table(TABLE_COLUMNS)
+    cols = t.to_columns(numpy=False)
+    assert list(cols) == ['item', 'qty', 'price', 'effort', 'done', 'note']
+    assert cols['item'] == ['a', 'b', 'c']
+    assert cols['qty'] == [1, None, 3]
+    assert cols['price'] == [0.5, 2.0, None]
+    assert cols['effort'] == [60, 180, None]
+    assert [d and d.start for d in cols['done']] == [date(2020, 11, 5), None, date(2020, 11, 7)]
+    assert cols['note'] == ['x', '42', '']
+
+    raw = t.to_columns(infer_types=False, numpy=False)
+    assert raw['qty'] == ['1', '', '3']
+    assert [dict(zip(raw, vals)) for vals in zip(*raw.values())] == list(t.as_dicts)
+
+    ragged = Table(['| a | b |', '|---+---|', '| 1 |', '| 2 | 3 | 4 |'])
+    assert ragged.to_columns(numpy=False) == {'a': [1, 2], 'b': [None, 3]}
+
+
+@pytest.mark.parametrize('value', ['1_000', '1_000.5', 'nan', 'Inf', '-inf', 'infinity', '1e', '.', '1.2.3'])
+def test_infer_column_not_numbers(value: str) -> None:
+    # these are accepted by int()/float(), or look like numbers, but they aren't org numbers
+    assert infer_column(['1', value]) == (None, ['1', value])
+
+
+def test_infer_column_floats() -> None:
+    assert infer_column(['1', '-2.5', '.5', '5.', '+1.5E-3']) == ('float', [1.0, -2.5, 0.5, 5.0, 0.0015])
+
+
+def test_table_to_columns_numpy() -> None:
+    np = pytest.importorskip('numpy')
+    cols = Table(TABLE_COLUMNS).to_columns()
+    assert cols['qty'].dtype == np.float64
+    assert np.isnan(cols['qty'][1])
+    assert cols['done'].dtype.kind == 'M'
+    assert cols['item'].tolist() == ['a', 'b', 'c']
+
+
+def test_table_to_columns_no_numpy() -> None:
+    if importlib.util.find_spec('numpy') is not None:
+        pytest.skip('numpy is installed')
+    t = Table(TABLE_COLUMNS)
+    assert isinstance(t.to_columns()['item'], list)
+    with pytest.raises(ImportError):
+        t.to_columns(numpy=True)
+
+
 def ilen(x) -> int:
     return len(list(x))
@@ -0,0 +1,123 @@
+import os
+import sqlite3
+from pathlib import Path
+from typing import Union
+
+import pytest
+
+from ..sqlite import SyncStats, connect, sync
+
+DOC = '''\
+#+FILETAGS: :file:
+* TODO [#A] Task :work:
+  SCHEDULED: <2024-03-01 Fri> DEADLINE: <2024-03-05 Tue>
+  :PROPERTIES:
+  :Effort: 1:30
+  :ID: task
+  :END:
+  :LOGBOOK:
+  CLOCK: [2024-02-28 Wed 10:00]--[2024-02-28 Wed 11:15] =>  1:15
+  CLOCK: [2024-02-29 Thu 09:00]
+  :END:
+  Meeting <2024-03-02 Sat 14:00>--<2024-03-02 Sat 15:00>
+** Subtask :deep:
+'''
+
+
+def query(db: Path, sql: str) -> list[tuple]:
+    with sqlite3.connect(db) as conn:
+        return conn.execute(sql).fetchall()
+
+
+def touch(path: Path) -> None:
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+
+
+def test_sync(tmp_path: Path) -> None:
+    db = tmp_path / 'org.db'
+    (a, b) = (tmp_path / 'a.org', tmp_path / 'b.org')
+    a.write_text(DOC)
+    b.write_text('* Other\n')
+    assert sync(db, [a, str(b)], batch_rows=3) == SyncStats(added=2, updated=0, unchanged=0, removed=0)
+    assert query(db, 'PRAGMA journal_mode') == [('wal',)]
+
+    assert query(db, 'SELECT path FROM files ORDER BY id') == [(str(a),), (str(b),)]
+    nodes = query(db, 'SELECT id, parent_id, position, level, linenumber, heading, todo, priority FROM nodes ORDER BY id')
+    [(root_id, *_), (task_id, *_), (sub_id, *_), (other_id, *_)] = nodes[:2] + nodes[2:3] + nodes[4:]
+    assert [n[1:] for n in nodes] == [
+        (None, 0, 0, 1, '', None, None),
+        (root_id, 1, 1, 2, 'Task', 'TODO', 'A'),
+        (task_id, 2, 2, 13, 'Subtask', None, None),
+        (None, 0, 0, 1, '', None, None),
+        (nodes[3][0], 1, 1, 1, 'Other', None, None),
+    ]
+    assert query(db, 'SELECT node_id, tag, inherited FROM tags ORDER BY node_id, tag') == [
+        (task_id, 'file', 1),
+        (task_id, 'work', 0),
+        (sub_id, 'deep', 0),
+        (sub_id, 'file', 1),
+        (sub_id, 'work', 1),
+    ]
+    assert query(db, 'SELECT node_id, key, value FROM properties') == [(task_id, 'Effort', 90), (task_id, 'ID', 'task')]
+    assert query(db, 'SELECT node_id, kind, start, end, active FROM timestamps ORDER BY start') == [
+        (task_id, 'scheduled', '2024-03-01', None, 1),
+        (task_id, 'body', '2024-03-02 14:00:00', '2024-03-02 15:00:00', 1),
+        (task_id, 'deadline', '2024-03-05', None, 1),
+    ]
+    assert query(db, 'SELECT node_id, start, end, minutes FROM clocks ORDER BY start') == [
+        (task_id, '2024-02-28 10:00:00', '2024-02-28 11:15:00', 75),
+        (task_id, '2024-02-29 09:00:00', None, None),
+    ]
+
+    # touched but not changed, and not touched at all
+    touch(a)
+    assert sync(db, [a, b]) == SyncStats(added=0, updated=0, unchanged=2, removed=0)
+    assert query(db, 'SELECT id, heading FROM nodes WHERE id = %d' % other_id) == [(other_id, 'Other')]  # noqa: UP031
+
+    # only the changed file is replaced
+    a.write_text(DOC.replace('** Subtask :deep:\n', ''))
+    touch(a)
+    assert sync(db, [a, b]) == SyncStats(added=0, updated=1, unchanged=1, removed=0)
+    assert query(db, 'SELECT heading FROM nodes ORDER BY file_id, position') == [('',), ('Task',), ('',), ('Other',)]
+    assert query(db, 'SELECT count(*) FROM tags') == [(2,)]
+    assert query(db, "SELECT id FROM nodes WHERE heading = 'Other'") == [(other_id,)]
+
+    assert sync(db, [b], prune=True) == SyncStats(added=0, updated=0, unchanged=1, removed=1)
+    for table in ['tags', 'properties', 'timestamps', 'clocks']:
+        assert query(db, f'SELECT count(*) FROM {table}') == [(0,)]
+    assert query(db, 'SELECT path FROM files') == [(str(b),)]
+
+
+def test_sync_duplicates(tmp_path: Path) -> None:
+    db = tmp_path / 'org.db'
+    a = tmp_path / 'a.org'
+    a.write_text(DOC)
+    (tmp_path / 'link.org').symlink_to(a)
+    (tmp_path / 'sub').mkdir()
+    # the same file several times, via different paths
+    same: list[Union[str, Path]] = [a, str(a), tmp_path / 'sub' / '..' / 'a.org', tmp_path / 'link.org']
+    assert sync(db, same) == SyncStats(added=1, updated=0, unchanged=0, removed=0)
+    a.write_text(DOC.replace('Task', 'Changed'))
+    touch(a)
+    assert sync(db, same[::-1]) == SyncStats(added=0, updated=1, unchanged=0, removed=0)
+    assert query(db, 'SELECT path FROM files') == [(str(a.resolve()),)]
+    assert query(db, 'SELECT count(*) FROM nodes') == [(3,)]
+
+
+def test_sync_atomic(tmp_path: Path) -> None:
+    db = tmp_path / 'org.db'
+    (a, b) = (tmp_path / 'a.org', tmp_path / 'b.org')
+    a.write_text(DOC)
+    sync(db, [a])
+    a.write_text('* Changed\n')
+    b.write_bytes(b'* invalid \xff utf8\n')
+    with pytest.raises(UnicodeDecodeError):
+        sync(db, [a, b])
+    # nothing was changed
+    assert query(db, "SELECT heading FROM nodes WHERE heading != ''") == [('Task',), ('Subtask',)]
+
+    with sqlite3.connect(db) as conn:
+        conn.execute('PRAGMA user_version=100')
+    with pytest.raises(ValueError, match='schema version'):
+        connect(db)
@@ -0,0 +1,99 @@
+from pathlib import Path
+
+import pytest
+
+from .. import iter_node_records, iter_tables, load
+from ..extra import Table
+from ..node import OrgNode
+
+DOC = '''
+| root | table |
+|------+-------|
+| a    | b     |
+
+* TODO [#A] Top :tag:
+  some text
+  | x | y |
+** Child
+  :PROPERTIES:
+  :ID: child
+  :END:
+  | one |
+  | two |
+  text in between
+  | three |
+** WAIT Another
+*** Deep
+| deep |
+* Second
+  |not a table
+  ||
+#+TODO: WAIT | DONE
+'''
+
+
+def tables_from_tree(path: Path) -> list[tuple[tuple[str, ...], list]]:
+    res = []
+    for node in load(path)[:]:
+        headings = []
+        n = node
+        while not n.is_root():
+            headings.append(n.heading)
+            n = n.parent
+        for r in node.body_rich:
+            if isinstance(r, Table):
+                res.append((tuple(reversed(headings)), list(r.rows)))
+    return res
+
+
+def test_iter_tables(tmp_path: Path) -> None:
+    path = tmp_path / 'doc.org'
+    path.write_text(DOC)
+    found = list(iter_tables([str(path), path]))
+    assert len(found) == 2 * 5
+    assert {f.file for f in found} == {path}
+    first = found[:5]
+    assert [(f.heading_path, list(f.table.rows)) for f in first] == tables_from_tree(path)
+    assert [f.linenumber for f in first] == [2, 8, 13, 16, 19]
+    lines = DOC.splitlines()
+    assert all(lines[f.linenumber - 1].strip().startswith('|') for f in first)
+
+
+def test_iter_tables_pathological(tmp_path: Path) -> None:
+    path = tmp_path / 'long.org'
+    path.write_text('* heading\n|' + 'x' * 100_000 + '\n')
+    assert list(iter_tables([path])) == []
+
+
+def records_from_tree(path: Path) -> list[tuple]:
+    res = []
+    for node in load(path)[:]:
+        row: tuple = (node.level, node.linenumber, node.heading, sorted(node.tags), node.properties)
+        if isinstance(node, OrgNode):
+            dates = [str(d) if d else None for d in (node.scheduled, node.deadline, node.closed)]
+            row += (node.todo, node.priority, dates, [c.start.isoformat() for c in node.clock])
+        else:
+            row += (None, None, [None, None, None], [])
+        res.append(row)
+    return res
+
+
+@pytest.mark.parametrize('path', sorted((Path(__file__).parent / 'data').glob('*.org')), ids=lambda p: p.name)
+def test_iter_node_records(path: Path, tmp_path: Path) -> None:
+    if path.name.startswith('00'):
+        # also check the TODO keys defined after the headings, and a file without a trailing newline
+        path = tmp_path / 'doc.org'
+        path.write_text(DOC.strip())
+    records = list(iter_node_records([path]))
+    assert {r['path'] for r in records} == {str(path)}
+    from_tree = records_from_tree(path)
+    rows = []
+    for r in records:
+        dates = [r[k] and r[k]['start'] for k in ('scheduled', 'deadline', 'closed')]
+        rows.append((r['level'], r['linenumber'], r['heading'], r['tags'], r['properties'], r['todo'], r['priority'], dates, [c['start'] for c in r['clocks']]))
+    for row, expected in zip(rows, from_tree):
+        # dates: compare the start, which is what differs between the formats
+        assert row[:7] == expected[:7]
+        assert [d is None for d in row[7]] == [d is None for d in expected[7]]
+        assert row[8] == expected[8]
+    assert len(rows) == len(from_tree)
@@ -0,0 +1,255 @@
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import cast
+
+import pytest
+
+from .. import load, loads
+from ..node import OrgEnv, OrgRootNode
+
+DOC = '''\
+#+TODO: TODO WAITING | DONE
+* TODO Task 1 :work:
+  SCHEDULED: <2012-02-26 Sun>
+  :PROPERTIES:
+  :Effort:   1:00
+  :END:
+  :LOGBOOK:
+  CLOCK: [2012-02-26 Sun 21:10]--[2012-02-26 Sun 21:15] =>  0:05
+  :END:
+  body 1
+** WAITING Task 2
+   body 2
+* Task 3
+'''
+
+
+def load_root(path) -> OrgRootNode:
+    return cast(OrgRootNode, load(path))
+
+
+def loads_root(text: str, env=None) -> OrgRootNode:
+    return cast(OrgRootNode, loads(text, env=env))
+
+
+def test_save_unchanged(tmp_path: Path) -> None:
+    for text in [DOC, DOC.replace('\n', '\r\n'), DOC.rstrip('\n'), '', '* just a heading']:
+        path = tmp_path / 'doc.org'
+        path.write_bytes(text.encode('utf8'))
+        root = load_root(path)
+        out = tmp_path / 'out.org'
+        root.save(out)
+        assert out.read_bytes() == text.encode('utf8')
+
+
+def test_save_modified(tmp_path: Path) -> None:
+    path = tmp_path / 'doc.org'
+    path.write_bytes(DOC.replace('\n', '\r\n').encode('utf8'))
+    root = load_root(path)
+    [t1, t2, t3] = root[1:]
+
+    t1.set_todo('DONE')
+    t1.set_property('Effort', '2:00')
+    t1.set_property('ID', 'task-1')
+    t1.add_clock(datetime(2012, 2, 27, 10, 0), datetime(2012, 2, 27, 11, 30))
+    t3.set_property('CATEGORY', 'misc')
+    t3.add_clock(datetime(2012, 2, 28, 9, 0))
+    assert root.env._dirty.keys() == {t1, t3}
+    assert (t1.todo, t1.get_property('Effort'), t1.get_property('ID')) == ('DONE', 120, 'task-1')
+    assert len(t1.clock) == 2
+    root.save()
+
+    expected = DOC.replace('* TODO Task 1', '* DONE Task 1')
+    expected = expected.replace(':Effort:   1:00', ':Effort: 2:00\n  :ID: task-1')
+    expected = expected.replace('  :LOGBOOK:\n', '  :LOGBOOK:\n  CLOCK: [2012-02-27 Mon 10:00]--[2012-02-27 Mon 11:30] =>  1:30\n')
+    expected = expected.replace('* Task 3\n', '* Task 3\n:PROPERTIES:\n:CATEGORY: misc\n:END:\n:LOGBOOK:\nCLOCK: [2012-02-28 Tue 09:00]\n:END:\n')
+    assert path.read_bytes() == expected.replace('\n', '\r\n').encode('utf8')
+
+    # tree refers to the saved file now
+    assert root.env._dirty == {}
+    assert [n.linenumber for n in root[1:]] == [2, 13, 15]
+    t2.set_todo(None)
+    root.save()
+    assert path.read_text() == expected.replace('** WAITING Task 2', '** Task 2')
+
+    reloaded = load(path)
+    [r1, r2, r3] = reloaded[1:]
+    assert (r1.todo, r1.tags, r1.properties) == ('DONE', {'work'}, {'Effort': 120, 'ID': 'task-1'})
+    assert [c.duration.seconds // 60 for c in r1.clock] == [90, 5]
+    assert (r2.todo, r2.heading) == (None, 'Task 2')
+    assert r3.properties == {'CATEGORY': 'misc'}
+    assert r3.clock[0].start == datetime(2012, 2, 28, 9, 0)
+
+
+def test_modified_node_is_reparsed() -> None:
+    root = loads_root(DOC)
+    [t1, t2, t3] = root[1:]
+    t3.add_clock(datetime(2012, 2, 28, 9, 0), datetime(2012, 2, 28, 10, 0))
+    t3.set_property('Effort', '0:30')
+    t2.set_property('Note', 'see <2012-03-01 Thu>')
+    t1.set_todo('DONE')
+    for node, reparsed in zip(root[1:], loads_root(str(root.env.nodes[0]) + '\n' + '\n'.join(str(n) for n in root[1:]))[1:]):
+        assert (node.todo, node.body, node.properties, node.clock, node.datelist) == (
+            reparsed.todo,
+            reparsed.body,
+            reparsed.properties,
+            reparsed.clock,
+            reparsed.datelist,
+        )
+    assert t3.body == ':LOGBOOK:\n:END:'
+
+
+def test_save_fallbacks(tmp_path: Path, monkeypatch) -> None:
+    # document not loaded from a file
+    root = loads_root(DOC)
+    with pytest.raises(ValueError, match='path is required'):
+        root.save()
+    root.children[1].set_todo('TODO')
+    out = tmp_path / 'out.org'
+    root.save(out)
+    assert out.read_text() == DOC.replace('* Task 3', '* TODO Task 3')
+
+    # source changed since loading: still writes the tree
+    path = tmp_path / 'doc.org'
+    path.write_text(DOC)
+    root = load_root(path)
+    path.write_text('* something else entirely\n')
+    root.children[0].set_property('Effort', '0:30')
+    root.save()
+    assert load(path).children[0].get_property('Effort') == 30
+    assert load(path).children[1].heading == 'Task 3'
+
+    # source edited in place, with the same number of lines
+    for edited in [DOC.replace('body 1', 'body one'), DOC.replace('body 1', 'body X')]:
+        path.write_text(DOC)
+        root = load_root(path)
+        with path.open('r+') as f:
+            f.write(edited)
+        stat = path.stat()
+        # the second edit keeps the size, so it's only detected by the modification time
+        # (moved forward explicitly, as the edit could be within the filesystem's timestamp granularity)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        root.children[1].set_todo('DONE')
+        root.save()
+        assert path.read_text() == DOC.replace('* Task 3', '* DONE Task 3')
+
+    # no sendfile support
+    def sendfile(*_args):
+        raise OSError('not supported')
+
+    monkeypatch.setattr(os, 'sendfile', sendfile, raising=False)
+    path.write_text(DOC)
+    root = load_root(path)
+    root.children[1].set_todo('DONE')
+    root.save()
+    assert path.read_text() == DOC.replace('* Task 3', '* DONE Task 3')
+
+
+def test_modification_errors(tmp_path: Path) -> None:
+    node = loads(DOC).children[0]
+    with pytest.raises(ValueError, match='Unknown TODO keyword'):
+        node.set_todo('NOSUCHSTATE')
+    with pytest.raises(ValueError, match='Invalid property name'):
+        node.set_property('with space', 'x')
+    with pytest.raises(ValueError, match='single line'):
+        node.set_property('Key', 'multi\nline')
+    with pytest.raises(ValueError, match='ends before'):
+        node.add_clock(datetime(2020, 1, 2), datetime(2020, 1, 1))
+    with pytest.raises(ValueError, match='Invalid duration'):
+        node.set_property('Effort', 'bogus')
+    # nothing is changed by the failed modifications
+    assert node.env._dirty == {}
+    assert (str(node), node.get_property('Effort')) == (str(loads(DOC).children[0]), 60)
+
+    columnar = loads_root(DOC, env=OrgEnv(filename='<string>', columnar=True))
+    with pytest.raises(TypeError, match='read-only'):
+        columnar.children[0].set_todo('DONE')
+    with pytest.raises(TypeError, match='read-only'):
+        columnar.save(tmp_path / 'out.org')
+    with pytest.raises(TypeError, match='read-only'), columnar.env.batch():
+        pass
+    assert str(columnar.children[0]) == str(loads(DOC).children[0])
+
+
+def check_structure(root: OrgRootNode) -> None:
+    # indices, levels and line numbers are the same as if the document was parsed again
+    text = '\n'.join(str(n) for n in root)
+    reparsed = loads_root(text)
+    nodes = root.env.nodes
+    assert [str(n) for n in nodes] == [str(n) for n in reparsed.env.nodes]
+    assert [n.linenumber for n in nodes] == [n.linenumber for n in reparsed.env.nodes]
+    assert [n._index for n in nodes] == list(range(len(nodes)))
+    assert list(root.env._levels) == [n.level for n in reparsed.env.nodes]
+    for n, r in zip(nodes, reparsed.env.nodes):
+        assert [c.heading for c in n.children] == [c.heading for c in r.children]
+
+
+def test_structural_changes(tmp_path: Path) -> None:
+    path = tmp_path / 'doc.org'
+    path.write_bytes(DOC.rstrip('\n').replace('\n', '\r\n').encode('utf8'))
+    root = load_root(path)
+    [t1, t2, t3] = root[1:]
+    with root.env.batch():
+        t2.move_to(root, position=0)
+        t4 = t3.insert_child('* TODO Task 4 <2020-01-01 Wed>\n** Task 5\n   body 5')
+        t1.move_to(t3, position=0)
+        with root.env.batch():
+            t6 = root.insert_child('* Task 6', position=-1)
+        # navigation sees the pending changes
+        assert [c.heading for c in root.children] == ['Task 2', 'Task 6', 'Task 3']
+        t6.remove()
+    check_structure(root)
+    assert [c.heading for c in root.children] == ['Task 2', 'Task 3']
+    assert [c.heading for c in t3.children] == ['Task 1', 'Task 4 <2020-01-01 Wed>']
+    assert (t4.todo, t4.level, t4.children[0].level, t4.datelist[0].start.year) == ('TODO', 2, 3, 2020)
+    assert (t1.level, t1.linenumber, t1.parent) == (2, 5, t3)
+    assert t1.env._origin is not None
+    root.save()
+
+    expected = '\n'.join([
+        '#+TODO: TODO WAITING | DONE',
+        '* WAITING Task 2',
+        '   body 2',
+        '* Task 3',
+        *(line.replace('* ', '** ', 1) for line in DOC.splitlines()[1:10]),
+        '** TODO Task 4 <2020-01-01 Wed>',
+        '*** Task 5',
+        '   body 5',
+    ])
+    assert path.read_bytes() == expected.replace('\n', '\r\n').encode('utf8')
+    assert [n.linenumber for n in root[1:]] == [n.linenumber for n in load(path)[1:]]
+    assert root.env._origin is None
+
+    # moving without changing the level copies the nodes from the source
+    root = load_root(path)
+    (t2, t3) = root.children
+    t3.move_to(root, position=0)
+    assert root.env._dirty == {}
+    root.save()
+    lines = expected.split('\n')
+    assert path.read_bytes() == '\r\n'.join([lines[0], *lines[3:], *lines[1:3]]).encode('utf8')
+
+
+def test_structural_change_errors() -> None:
+    root = loads_root(DOC)
+    [t1, t2, t3] = root[1:]
+    with pytest.raises(ValueError, match='own subtree'):
+        t1.move_to(t2)
+    with pytest.raises(ValueError, match='start with a heading'):
+        t1.insert_child('body\n* heading')
+    with pytest.raises(ValueError, match='single subtree'):
+        t1.insert_child('* one\n* two')
+    with pytest.raises(ValueError, match='another document'):
+        t3.move_to(loads_root(DOC))
+    t1.remove()
+    with pytest.raises(ValueError, match='removed'):
+        t1.remove()
+    with pytest.raises(ValueError, match='removed'):
+        t3.move_to(t2)
+    assert [n.heading for n in root[1:]] == ['Task 3']
+    check_structure(root)
+
+    columnar = loads_root(DOC, env=OrgEnv(filename='<string>', columnar=True))
+    with pytest.raises(TypeError, match='read-only'):
+        columnar.children[0].remove()
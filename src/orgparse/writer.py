@@ -0,0 +1,207 @@
+"""
+Writing documents back: unchanged parts of the source file are copied as is, only modified nodes are serialized.
+
+See :meth:`orgparse.node.OrgRootNode.save`.
+"""
+
+from __future__ import annotations
+
+import os
+import shutil
+import tempfile
+from collections.abc import Iterable, Sequence
+from pathlib import Path
+from typing import BinaryIO, Optional, Union
+
+from .node import _file_stat
+
+_BLOCK_SIZE = 1 << 20
+
+
+class _SourceLayout:
+    """
+    Byte offsets of the requested lines of a file, found by a single pass over it.
+    """
+
+    def __init__(self, f: BinaryIO, wanted: Iterable[int]) -> None:
+        self.offsets: dict[int, int] = {}
+        """Line number (1-indexed) -> byte offset of its start."""
+        self.num_lines = 0
+        self.size = 0
+        self.newline = b'\n'
+        self.ends_with_newline = False
+
+        todo = sorted(set(wanted), reverse=True)
+        newlines = 0  # number of newlines before the current block
+        pos = 0
+        first_newline = True
+        prev_last = b''
+        while True:
+            block = f.read(_BLOCK_SIZE)
+            if not block:
+                break
+            count = block.count(b'\n')
+            if first_newline and count > 0:
+                i = block.index(b'\n')
+                before = block[i - 1 : i] if i > 0 else prev_last
+                self.newline = b'\r\n' if before == b'\r' else b'\n'
+                first_newline = False
+            # line k starts right after the (k - 1)-th newline
+            seen = newlines  # newlines up to (and including) block[i]
+            i = -1
+            while len(todo) > 0 and todo[-1] - 1 <= newlines + count:
+                line = todo.pop()
+                while seen < line - 1:
+                    i = block.index(b'\n', i + 1)
+                    seen += 1
+                self.offsets[line] = pos + i + 1
+            newlines += count
+            pos += len(block)
+            prev_last = block[-1:]
+        self.size = pos
+        self.ends_with_newline = prev_last == b'\n'
+        self.num_lines = newlines + (1 if pos > 0 and not self.ends_with_newline else 0)
+        # lines past the end of file (e.g. right after the last line)
+        for line in todo:
+            self.offsets[line] = pos
+
+
+def write_document(
+    target: Path,
+    chunks: Sequence[Sequence[str]],
+    *,
+    source: Optional[Path] = None,
+    spans: Sequence[Optional[tuple[int, int]]] = (),
+    source_lines: int = 0,
+    source_stat: Optional[tuple[int, int, int]] = None,
+) -> None:
+    """
+    Write lines of the document nodes to ``target``, atomically replacing it.
+
+    :arg chunks: lines of each node (without line terminators), in document order.
+    :arg source:
+        File the document was loaded from, it must still be the same as when it was loaded.
+        Chunks with a span are copied from it byte for byte.
+        If it's not given, or was changed since (or doesn't match the document), all chunks are serialized.
+    :arg spans:
+        ``(first line, number of lines)`` of each chunk in ``source`` (1-indexed),
+        or ``None`` for modified and new chunks.
+    :arg source_lines: expected number of lines in ``source``.
+    :arg source_stat: identity of ``source`` when the document was loaded from it, see ``orgparse.node._file_stat``.
+    """
+    (tmp_fd, tmp_name) = tempfile.mkstemp(dir=target.parent, prefix=f'.{target.name}.', suffix='.tmp')
+    tmp = Path(tmp_name)
+    try:
+        with os.fdopen(tmp_fd, 'wb', buffering=0) as out:
+            copied = False
+            if source is not None and source_stat is not None and source.is_file():
+                copied = _write_patched(
+                    out,
+                    chunks,
+                    source=source,
+                    spans=spans,
+                    source_lines=source_lines,
+                    source_stat=source_stat,
+                )
+            if not copied:
+                out.truncate(0)
+                out.seek(0)
+                for chunk in chunks:
+                    _write_lines(out, chunk, b'\n', last=False)
+        if target.exists():
+            shutil.copymode(target, tmp)
+        tmp.replace(target)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+
+def _write_patched(
+    out: BinaryIO,
+    chunks: Sequence[Sequence[str]],
+    *,
+    source: Path,
+    spans: Sequence[Optional[tuple[int, int]]],
+    source_lines: int,
+    source_stat: tuple[int, int, int],
+) -> bool:
+    """
+    Returns ``False`` if the source doesn't match the document (and nothing useful was written).
+    """
+    if len(spans) != len(chunks):
+        return False
+    # line ranges of source to copy, merged if adjacent; or indices of chunks to serialize
+    ops: list[Union[tuple[int, int], int]] = []
+    for i, span in enumerate(spans):
+        if span is None:
+            ops.append(i)
+            continue
+        (start, count) = span
+        if count == 0:
+            continue
+        prev = ops[-1] if len(ops) > 0 else None
+        if isinstance(prev, tuple) and prev[1] == start:
+            ops[-1] = (prev[0], start + count)
+        else:
+            ops.append((start, start + count))
+    wanted = [line for op in ops if isinstance(op, tuple) for line in op]
+    with source.open('rb') as src:
+        # NOTE: checked on the open file, so it can't be replaced after the check
+        if _file_stat(src) != source_stat:
+            return False
+        layout = _SourceLayout(src, wanted)
+        if layout.num_lines != source_lines:
+            return False
+        offsets = layout.offsets
+        for k, op in enumerate(ops):
+            last = k == len(ops) - 1
+            if isinstance(op, int):
+                # NOTE: keep the original (lack of) trailing newline at the end of file
+                _write_lines(out, chunks[op], layout.newline, last=last and not layout.ends_with_newline)
+                continue
+            (start, end) = op
+            count = offsets[end] - offsets[start]
+            at_eof = end > source_lines
+            if last and not at_eof and not layout.ends_with_newline:
+                # the last line of the source was moved, but the file still shouldn't end with a newline
+                count -= len(layout.newline)
+            _copy_range(src, out, offsets[start], count)
+            if at_eof and not last and not layout.ends_with_newline:
+                # the last line of the source is followed by other lines now
+                out.write(layout.newline)
+    return True
+
+
+def _write_lines(out: BinaryIO, lines: Sequence[str], newline: bytes, *, last: bool) -> None:
+    if len(lines) == 0:
+        return
+    data = newline.join(line.encode('utf8') for line in lines)
+    out.write(data if last else data + newline)
+
+
+def _copy_range(src: BinaryIO, out: BinaryIO, offset: int, count: int) -> None:
+    """
+    Copy ``count`` bytes of ``src`` starting at ``offset`` to the current position of ``out`` (unbuffered).
+    """
+    sendfile = getattr(os, 'sendfile', None)
+    if sendfile is not None:
+        try:
+            while count > 0:
+                sent = sendfile(out.fileno(), src.fileno(), offset, count)
+                if sent == 0:
+                    break
+                offset += sent
+                count -= sent
+        except OSError:
+            # not supported for these files, e.g. on older kernels or some filesystems
+            pass
+        else:
+            if count == 0:
+                return
+    src.seek(offset)
+    while count > 0:
+        block = src.read(min(count, _BLOCK_SIZE))
+        if not block:
+            break
+        out.write(block)
+        count -= len(block)